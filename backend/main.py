@@ -1,32 +1,49 @@
 from __future__ import annotations
 
+import asyncio
 import io
 import csv
+import copy
 import json
 import logging
+import multiprocessing
 import os
+import pickle
+import queue
 import re
 import html
 import smtplib
 import sqlite3
+import string
 import threading
 import time
 import hashlib
 import hmac
 import base64
+import bisect
 import secrets
+import http.client
 import urllib.request
 import urllib.error
 import urllib.parse
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from email.message import EmailMessage
-from typing import Any
+from functools import lru_cache, partial
+from itertools import chain
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, AsyncIterator, BinaryIO, Iterable, Iterator
 
 import PyPDF2
 from dotenv import load_dotenv
 from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from openai import OpenAI
 from pydantic import BaseModel
 from reportlab.lib import colors
@@ -42,11 +59,22 @@ except Exception:  # pragma: no cover - optional dependency at runtime
 
 try:
     import psycopg2  # type: ignore
+    import psycopg2.pool  # type: ignore
     from psycopg2.extras import RealDictCursor  # type: ignore
 except Exception:  # pragma: no cover - optional dependency at runtime
     psycopg2 = None
     RealDictCursor = None
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency at runtime
+    orjson = None
+
+try:
+    import ahocorasick  # type: ignore
+except Exception:  # pragma: no cover - optional dependency at runtime
+    ahocorasick = None
+
 load_dotenv()
 
 TRUTHY_ENV_VALUES = {"1", "true", "yes", "on"}
@@ -60,6 +88,26 @@ def env_flag(name: str, default: bool = False) -> bool:
     return value.strip().lower() in TRUTHY_ENV_VALUES
 
 
+def env_int(name: str, default: int, minimum: int | None = None, maximum: int | None = None) -> int:
+    try:
+        value = int((os.getenv(name) or str(default)).strip())
+    except ValueError:
+        value = default
+    if minimum is not None:
+        value = max(minimum, value)
+    if maximum is not None:
+        value = min(maximum, value)
+    return value
+
+
+def env_float(name: str, default: float, minimum: float, maximum: float) -> float:
+    try:
+        value = float((os.getenv(name) or str(default)).strip())
+    except ValueError:
+        value = default
+    return max(minimum, min(maximum, value))
+
+
 DEFAULT_CORS_ORIGINS = [
     "https://hirescore.in",
     "https://www.hirescore.in",
@@ -76,7 +124,39 @@ def parse_cors_origins(value: str | None) -> list[str]:
     return origins or DEFAULT_CORS_ORIGINS
 
 
-app = FastAPI()
+def json_response_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return json.dumps(
+                content,
+                ensure_ascii=False,
+                allow_nan=False,
+                separators=(",", ":"),
+                default=json_response_default,
+            ).encode("utf-8")
+        return orjson.dumps(content, default=json_response_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    await run_in_threadpool(init_auth_db)
+    await asyncio.gather(run_in_threadpool(warm_auth_db_pool), run_in_threadpool(prime_pdf_render_caches))
+    try:
+        yield
+    finally:
+        await run_in_threadpool(flush_analytics_events)
+        await run_in_threadpool(close_auth_db_pools)
+
+
+app = FastAPI(default_response_class=FastJSONResponse, lifespan=lifespan)
 cors_allow_origins = parse_cors_origins(os.getenv("CORS_ALLOW_ORIGINS"))
 cors_allow_origin_regex = os.getenv("CORS_ALLOW_ORIGIN_REGEX")
 BYPASS_PLAN_LIMITS = env_flag("BYPASS_PLAN_LIMITS", False)
@@ -97,26 +177,24 @@ ANALYZE_MODE = (os.getenv("ANALYZE_MODE") or "hybrid").strip().lower()
 if ANALYZE_MODE not in {"rules", "hybrid", "llm"}:
     ANALYZE_MODE = "hybrid"
 ANALYZE_LLM_MODEL = (os.getenv("ANALYZE_LLM_MODEL") or OPENAI_MODEL).strip() or OPENAI_MODEL
-try:
-    ANALYZE_LLM_BLEND = float((os.getenv("ANALYZE_LLM_BLEND") or "0.28").strip())
-except Exception:
-    ANALYZE_LLM_BLEND = 0.28
-ANALYZE_LLM_BLEND = max(0.08, min(0.6, ANALYZE_LLM_BLEND))
+ANALYZE_LLM_BLEND = env_float("ANALYZE_LLM_BLEND", 0.28, 0.08, 0.6)
 ANALYZE_CACHE_ENABLED = env_flag("ANALYZE_CACHE_ENABLED", True)
 ANALYZE_SMART_ROUTING_ENABLED = env_flag("ANALYZE_SMART_ROUTING_ENABLED", True)
 ANALYZE_SELF_LEARNING_ENABLED = env_flag("ANALYZE_SELF_LEARNING_ENABLED", True)
 ANALYZE_MEMORY_ROUTE_ENABLED = env_flag("ANALYZE_MEMORY_ROUTE_ENABLED", True)
-try:
-    ANALYZE_CACHE_TTL_HOURS = float((os.getenv("ANALYZE_CACHE_TTL_HOURS") or "240").strip())
-except Exception:
-    ANALYZE_CACHE_TTL_HOURS = 240.0
-ANALYZE_CACHE_TTL_HOURS = max(1.0, min(24.0 * 60.0, ANALYZE_CACHE_TTL_HOURS))
-ANALYZE_MEMORY_MIN_FEEDBACK = max(1, min(80, int((os.getenv("ANALYZE_MEMORY_MIN_FEEDBACK") or "6").strip())))
+ANALYZE_CACHE_TTL_HOURS = env_float("ANALYZE_CACHE_TTL_HOURS", 240.0, 1.0, 24.0 * 60.0)
+ANALYZE_MEMORY_MIN_FEEDBACK = env_int("ANALYZE_MEMORY_MIN_FEEDBACK", 6, 1, 80)
 configured_fallback_models = [model.strip() for model in (os.getenv("OPENAI_FALLBACK_MODELS") or "").split(",") if model.strip()]
 if configured_fallback_models:
     OPENAI_FALLBACK_MODELS = configured_fallback_models
 else:
     OPENAI_FALLBACK_MODELS = [model for model in ["gpt-4.1-mini", "gpt-4o-mini"] if model != OPENAI_MODEL]
+OPENAI_HEDGE_DELAY_SECONDS = env_float("OPENAI_HEDGE_DELAY_SECONDS", 0.0, 0.0, 60.0)
+OPENAI_REQUEST_TIMEOUT_SECONDS = env_float("OPENAI_REQUEST_TIMEOUT_SECONDS", 60.0, 5.0, 600.0)
+LLM_RESPONSE_CACHE_SIZE = env_int("LLM_RESPONSE_CACHE_SIZE", 256, 0, 4096)
+ANALYZE_PROFILE_CACHE_SIZE = env_int("ANALYZE_PROFILE_CACHE_SIZE", 1024, 0, 16384)
+PDF_RENDER_PROCESSES = env_int("PDF_RENDER_PROCESSES", 0, 0, 16)
+RESUME_UPLOAD_MAX_BYTES = env_int("RESUME_UPLOAD_MAX_MB", 10, 1, 50) * 1024 * 1024
 ANALYZE_LLM_LOW_MODEL = (os.getenv("ANALYZE_LLM_LOW_MODEL") or ANALYZE_LLM_MODEL).strip() or ANALYZE_LLM_MODEL
 default_high_model = OPENAI_FALLBACK_MODELS[0] if OPENAI_FALLBACK_MODELS else ANALYZE_LLM_MODEL
 ANALYZE_LLM_HIGH_MODEL = (os.getenv("ANALYZE_LLM_HIGH_MODEL") or default_high_model).strip() or ANALYZE_LLM_MODEL
@@ -128,7 +206,8 @@ APP_BUILD_SHA = (
     or (os.getenv("GITHUB_SHA") or "")
 ).strip()[:40]
 APP_STARTED_AT = datetime.now(timezone.utc).isoformat()
-client = OpenAI(api_key=openai_api_key) if openai_api_key else None
+client = OpenAI(api_key=openai_api_key, timeout=OPENAI_REQUEST_TIMEOUT_SECONDS) if openai_api_key else None
+LLM_HEDGE_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-hedge") if OPENAI_HEDGE_DELAY_SECONDS > 0 else None
 
 if client is None:
     logger.warning("OPENAI_API_KEY is missing. AI generation requests will not reach OpenAI.")
@@ -154,8 +233,10 @@ def normalize_database_url(value: str | None) -> str:
 DATABASE_URL = normalize_database_url(os.getenv("DATABASE_URL") or os.getenv("RENDER_POSTGRESQL_URL"))
 AUTH_DB_BACKEND = "postgres" if DATABASE_URL.startswith("postgresql://") else "sqlite"
 AUTH_DB_PATH = resolve_auth_db_path()
+AUTH_DB_POOL_SIZE = env_int("AUTH_DB_POOL_SIZE", 8, 1, 64)
 AUTH_TOKEN_SECRET = (os.getenv("AUTH_TOKEN_SECRET") or "replace-this-in-production").strip()
-AUTH_TOKEN_TTL_HOURS = int((os.getenv("AUTH_TOKEN_TTL_HOURS") or "720").strip())
+AUTH_TOKEN_SECRET_BYTES = AUTH_TOKEN_SECRET.encode("utf-8")
+AUTH_TOKEN_TTL_HOURS = env_int("AUTH_TOKEN_TTL_HOURS", 720)
 # Testing helper endpoint (/auth/topup) should be disabled by default in production.
 ALLOW_UNVERIFIED_TOPUP = env_flag("ALLOW_UNVERIFIED_TOPUP", False)
 EMAIL_OTP_REQUIRED = env_flag("EMAIL_OTP_REQUIRED", True)
@@ -167,7 +248,8 @@ ADMIN_API_KEYS = {
 ADMIN_LOGIN_ID = (os.getenv("ADMIN_LOGIN_ID") or "").strip()
 ADMIN_PASSWORD = (os.getenv("ADMIN_PASSWORD") or "").strip()
 ADMIN_AUTH_SECRET = ((os.getenv("ADMIN_AUTH_SECRET") or "").strip()) or AUTH_TOKEN_SECRET
-ADMIN_TOKEN_TTL_HOURS = max(1, int((os.getenv("ADMIN_TOKEN_TTL_HOURS") or "72").strip()))
+ADMIN_AUTH_SECRET_BYTES = ADMIN_AUTH_SECRET.encode("utf-8")
+ADMIN_TOKEN_TTL_HOURS = env_int("ADMIN_TOKEN_TTL_HOURS", 72, 1)
 if AUTH_TOKEN_SECRET == "replace-this-in-production":
     logger.warning("AUTH_TOKEN_SECRET is using a default value. Set AUTH_TOKEN_SECRET in production.")
 if not ADMIN_API_KEYS and not (ADMIN_LOGIN_ID and ADMIN_PASSWORD):
@@ -202,11 +284,18 @@ PAYMENT_CANCEL_URL = (os.getenv("PAYMENT_CANCEL_URL") or "").strip() or "https:/
 STRIPE_SECRET_KEY = (os.getenv("STRIPE_SECRET_KEY") or "").strip()
 STRIPE_WEBHOOK_SECRET = (os.getenv("STRIPE_WEBHOOK_SECRET") or "").strip()
 STRIPE_ENABLED = bool(stripe and STRIPE_SECRET_KEY)
+STRIPE_SEEN_SESSIONS_MAX = 4096
+STRIPE_SEEN_SESSION_TTL_SECONDS = 24 * 3600
 if STRIPE_ENABLED and stripe is not None:
     stripe.api_key = STRIPE_SECRET_KEY
 RAZORPAY_KEY_ID = (os.getenv("RAZORPAY_KEY_ID") or "").strip()
 RAZORPAY_KEY_SECRET = (os.getenv("RAZORPAY_KEY_SECRET") or "").strip()
+RAZORPAY_KEY_SECRET_BYTES = RAZORPAY_KEY_SECRET.encode("utf-8")
 RAZORPAY_ENABLED = bool(RAZORPAY_KEY_ID and RAZORPAY_KEY_SECRET)
+RAZORPAY_REQUEST_HEADERS = {
+    "Authorization": "Basic " + base64.b64encode(f"{RAZORPAY_KEY_ID}:{RAZORPAY_KEY_SECRET}".encode("utf-8")).decode("utf-8"),
+    "Content-Type": "application/json",
+}
 PAYMENT_GATEWAY = (os.getenv("PAYMENT_GATEWAY") or "auto").strip().lower()
 if PAYMENT_GATEWAY == "razorpay" and RAZORPAY_ENABLED:
     PAYMENT_GATEWAY_ACTIVE = "razorpay"
@@ -224,32 +313,42 @@ else:
     PAYMENT_GATEWAY_ACTIVE = "none"
 
 EMAIL_SMTP_HOST = (os.getenv("EMAIL_SMTP_HOST") or "").strip()
-EMAIL_SMTP_PORT = int((os.getenv("EMAIL_SMTP_PORT") or "587").strip())
+EMAIL_SMTP_PORT = env_int("EMAIL_SMTP_PORT", 587)
 EMAIL_SMTP_USERNAME = (os.getenv("EMAIL_SMTP_USERNAME") or "").strip()
 EMAIL_SMTP_PASSWORD = (os.getenv("EMAIL_SMTP_PASSWORD") or "").strip()
 EMAIL_SMTP_FROM = (os.getenv("EMAIL_SMTP_FROM") or EMAIL_SMTP_USERNAME).strip()
 EMAIL_SMTP_FROM_NAME = (os.getenv("EMAIL_SMTP_FROM_NAME") or "HireScore").strip()
 EMAIL_SMTP_USE_TLS = env_flag("EMAIL_SMTP_USE_TLS", True)
 EMAIL_SMTP_USE_SSL = env_flag("EMAIL_SMTP_USE_SSL", False)
-EMAIL_SMTP_TIMEOUT_SECONDS = max(5, min(30, int((os.getenv("EMAIL_SMTP_TIMEOUT_SECONDS") or "12").strip())))
+EMAIL_SMTP_TIMEOUT_SECONDS = env_int("EMAIL_SMTP_TIMEOUT_SECONDS", 12, 5, 30)
 SMTP_EMAIL_SENDING_ENABLED = bool(EMAIL_SMTP_HOST and EMAIL_SMTP_PORT and EMAIL_SMTP_USERNAME and EMAIL_SMTP_PASSWORD and EMAIL_SMTP_FROM)
 RESEND_API_KEY = (os.getenv("RESEND_API_KEY") or "").strip()
 RESEND_FROM = (os.getenv("RESEND_FROM") or EMAIL_SMTP_FROM).strip()
 RESEND_EMAIL_SENDING_ENABLED = bool(RESEND_API_KEY and RESEND_FROM)
 EMAIL_PROVIDER = (os.getenv("EMAIL_PROVIDER") or "auto").strip().lower()
-EMAIL_HTTP_TIMEOUT_SECONDS = max(5, min(30, int((os.getenv("EMAIL_HTTP_TIMEOUT_SECONDS") or "12").strip())))
+EMAIL_HTTP_TIMEOUT_SECONDS = env_int("EMAIL_HTTP_TIMEOUT_SECONDS", 12, 5, 30)
 OTP_SIGNING_SECRET = (os.getenv("OTP_SIGNING_SECRET") or AUTH_TOKEN_SECRET).strip()
-OTP_EXPIRY_MINUTES = max(2, min(30, int((os.getenv("OTP_EXPIRY_MINUTES") or "10").strip())))
-OTP_RESEND_COOLDOWN_SECONDS = max(10, min(180, int((os.getenv("OTP_RESEND_COOLDOWN_SECONDS") or "45").strip())))
-OTP_MAX_ATTEMPTS = max(3, min(12, int((os.getenv("OTP_MAX_ATTEMPTS") or "6").strip())))
+OTP_EXPIRY_MINUTES = env_int("OTP_EXPIRY_MINUTES", 10, 2, 30)
+OTP_RESEND_COOLDOWN_SECONDS = env_int("OTP_RESEND_COOLDOWN_SECONDS", 45, 10, 180)
+OTP_MAX_ATTEMPTS = env_int("OTP_MAX_ATTEMPTS", 6, 3, 12)
+NON_DIGIT_RE = re.compile(r"[^0-9]")
 GOOGLE_CLIENT_IDS = {
     client_id.strip()
     for client_id in (os.getenv("GOOGLE_CLIENT_IDS") or os.getenv("GOOGLE_CLIENT_ID") or "").split(",")
     if client_id.strip()
 }
-GOOGLE_TOKENINFO_TIMEOUT_SECONDS = max(4, min(20, int((os.getenv("GOOGLE_TOKENINFO_TIMEOUT_SECONDS") or "8").strip())))
+GOOGLE_TOKENINFO_TIMEOUT_SECONDS = env_int("GOOGLE_TOKENINFO_TIMEOUT_SECONDS", 8, 4, 20)
 
-AUTH_DB_LOCK = threading.Lock()
+AUTH_DB_BEGIN_RETRY_DELAYS_SECONDS = (0.025, 0.05, 0.1)
+USER_ROW_COLUMNS = (
+    "id, full_name, email, password_hash, password_salt, plan_tier, credits, created_at, email_verified, "
+    "analyze_count, feedback_count"
+)
+USER_BY_ID_SQL = f"SELECT {USER_ROW_COLUMNS} FROM users WHERE id = ?"
+USER_BY_EMAIL_SQL = f"SELECT {USER_ROW_COLUMNS} FROM users WHERE email = ?"
+# sqlite writers already hold the database write lock from BEGIN IMMEDIATE; Postgres needs an explicit row lock.
+SQL_FOR_UPDATE = " FOR UPDATE" if AUTH_DB_BACKEND == "postgres" else ""
+USER_BY_ID_FOR_UPDATE_SQL = USER_BY_ID_SQL + SQL_FOR_UPDATE
 
 
 class AuthRequest(BaseModel):
@@ -424,6 +523,13 @@ PLAN_RULES: dict[str, dict[str, Any]] = {
         "can_ai_enhance": True,
     },
 }
+PLAN_TIER_CANONICAL: dict[str, str] = {
+    **{tier: tier for tier in PLAN_RULES},
+    "starter_50": "starter",
+    "pro_100": "pro",
+    "elite_200": "elite",
+    "basic": "free",
+}
 
 BYPASS_PLAN_AS = BYPASS_PLAN_AS if BYPASS_PLAN_AS in PLAN_RULES else "elite"
 
@@ -1160,6 +1266,7 @@ SPECIFICITY_KEYWORDS = {
     "penetration testing",
     "vulnerability assessment",
 }
+SPECIFICITY_KEYWORD_LIST = tuple(SPECIFICITY_KEYWORDS)
 
 SENIORITY_KEYWORDS = {
     "junior": ["intern", "entry", "junior", "fresher", "associate", "trainee"],
@@ -1554,6 +1661,39 @@ def now_utc_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def parse_meta_json(meta_json: Any) -> dict[str, Any]:
+    if not meta_json:
+        return {}
+    try:
+        if orjson is not None:
+            return orjson.loads(meta_json)
+        return json.loads(meta_json)
+    except Exception:
+        return {}
+
+
+# Not byte-compatible with the old json.dumps defaults for non-ASCII text (raw UTF-8 instead of \uXXXX escapes);
+# hashed callers such as build_semantic_cache_key must only feed it ASCII-normalised values.
+def canonical_json_bytes(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def meta_json_text(value: Any) -> str:
+    return canonical_json_bytes(value).decode("utf-8")
+
+
+def stored_json_text(value: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+ADMIN_UPDATE_CREDIT_META_JSON = meta_json_text({"reason": "admin_update"})
+RAZORPAY_FRONTEND_VERIFY_META_JSON = meta_json_text({"verified_by": "frontend_callback"})
+
+
 def b64url_encode(value: bytes) -> str:
     return base64.urlsafe_b64encode(value).decode("utf-8").rstrip("=")
 
@@ -1568,10 +1708,18 @@ if psycopg2 is not None:
     DB_INTEGRITY_ERRORS = DB_INTEGRITY_ERRORS + (psycopg2.IntegrityError,)
 
 
+AUTH_DB_SUPPORTS_RETURNING = AUTH_DB_BACKEND == "postgres" or sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+@lru_cache(maxsize=512)
+def postgres_placeholder_query(query: str) -> str:
+    return query.replace("?", "%s")
+
+
 def adapt_query_for_backend(query: str, params: Any = None) -> tuple[str, Any]:
     if AUTH_DB_BACKEND != "postgres" or params is None:
         return query, params
-    converted_query = query.replace("?", "%s")
+    converted_query = postgres_placeholder_query(query)
     if isinstance(params, list):
         return converted_query, tuple(params)
     return converted_query, params
@@ -1590,7 +1738,7 @@ class AuthDBCursor:
         return self
 
     def executemany(self, query: str, seq_of_params: list[Any]) -> "AuthDBCursor":
-        converted_query = query if AUTH_DB_BACKEND != "postgres" else query.replace("?", "%s")
+        converted_query = query if AUTH_DB_BACKEND != "postgres" else postgres_placeholder_query(query)
         converted_params = seq_of_params
         if AUTH_DB_BACKEND == "postgres":
             converted_params = [tuple(item) if isinstance(item, list) else item for item in seq_of_params]
@@ -1603,6 +1751,9 @@ class AuthDBCursor:
     def fetchall(self) -> list[Any]:
         return self._raw_cursor.fetchall()
 
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._raw_cursor)
+
     def close(self) -> None:
         self._raw_cursor.close()
 
@@ -1615,9 +1766,37 @@ class AuthDBCursor:
         return getattr(self._raw_cursor, "lastrowid", None)
 
 
+AUTH_DB_IDLE_POOL: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=AUTH_DB_POOL_SIZE)
+AUTH_DB_POOL_SLOTS = threading.BoundedSemaphore(AUTH_DB_POOL_SIZE)
+AUTH_DB_POOL_MIN_SIZE = min(AUTH_DB_POOL_SIZE, 4)
+AUTH_DB_POOL_WAIT_SECONDS = 10.0
+AUTH_PG_POOL: Any = None
+AUTH_PG_POOL_LOCK = threading.Lock()
+AUTH_DB_CACHED_STATEMENTS = 256
+AUTH_DB_STREAM_FETCH_SIZE = 1000
+AUTH_DB_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16384",
+    "PRAGMA mmap_size=268435456",
+)
+USER_OWNED_TABLES = (
+    "payment_orders",
+    "credit_transactions",
+    "user_feedback",
+    "analytics_events",
+    "user_chat_messages",
+    "analysis_reports",
+    "password_reset_otps",
+)
+CREDIT_TX_EXTERNAL_REF_META_KEYS = {"stripe_credit_pack": "stripe_session_id", "razorpay_credit_pack": "payment_id"}
+
+
 class AuthDBConnection:
-    def __init__(self, raw_connection: Any):
+    def __init__(self, raw_connection: Any, reusable: bool = False):
         self._raw_connection = raw_connection
+        self._reusable = reusable
+        self._closed = False
 
     def cursor(self) -> AuthDBCursor:
         if AUTH_DB_BACKEND == "postgres":
@@ -1631,6 +1810,17 @@ class AuthDBConnection:
         cursor.execute(query, params)
         return cursor
 
+    def stream(self, query: str, params: Any = None) -> AuthDBCursor:
+        if AUTH_DB_BACKEND == "postgres":
+            if RealDictCursor is None:
+                raise RuntimeError("RealDictCursor unavailable while DATABASE_URL is configured.")
+            raw_cursor = self._raw_connection.cursor(name=f"stream_{secrets.token_hex(6)}", cursor_factory=RealDictCursor)
+            raw_cursor.itersize = AUTH_DB_STREAM_FETCH_SIZE
+        else:
+            raw_cursor = self._raw_connection.cursor()
+            raw_cursor.arraysize = AUTH_DB_STREAM_FETCH_SIZE
+        return AuthDBCursor(raw_cursor).execute(query, params)
+
     def commit(self) -> None:
         self._raw_connection.commit()
 
@@ -1638,7 +1828,35 @@ class AuthDBConnection:
         self._raw_connection.rollback()
 
     def close(self) -> None:
-        self._raw_connection.close()
+        if self._closed:
+            return
+        self._closed = True
+        if not self._reusable:
+            self._raw_connection.close()
+            return
+        try:
+            self.return_to_pool()
+        finally:
+            AUTH_DB_POOL_SLOTS.release()
+
+    def return_to_pool(self) -> None:
+        if AUTH_DB_BACKEND == "postgres":
+            broken = False
+            try:
+                self._raw_connection.rollback()
+            except Exception:
+                broken = True
+            auth_pg_pool().putconn(self._raw_connection, close=broken)
+            return
+        try:
+            self._raw_connection.rollback()
+        except Exception:
+            self._raw_connection.close()
+            return
+        try:
+            AUTH_DB_IDLE_POOL.put_nowait(self._raw_connection)
+        except queue.Full:
+            self._raw_connection.close()
 
     def __enter__(self) -> "AuthDBConnection":
         return self
@@ -1648,23 +1866,113 @@ class AuthDBConnection:
 
 
 def auth_db_connection() -> AuthDBConnection:
+    if AUTH_DB_BACKEND == "postgres" and psycopg2 is None:
+        raise RuntimeError("DATABASE_URL is configured but psycopg2 is not installed.")
+    if not AUTH_DB_POOL_SLOTS.acquire(timeout=AUTH_DB_POOL_WAIT_SECONDS):
+        logger.warning("Auth DB pool exhausted for %.0fs; opening an unpooled connection.", AUTH_DB_POOL_WAIT_SECONDS)
+        if AUTH_DB_BACKEND == "postgres":
+            return AuthDBConnection(open_postgres_auth_connection())
+        return AuthDBConnection(open_sqlite_auth_connection())
+    try:
+        return AuthDBConnection(checkout_pooled_connection(), reusable=True)
+    except Exception:
+        AUTH_DB_POOL_SLOTS.release()
+        raise
+
+
+def checkout_pooled_connection() -> Any:
     if AUTH_DB_BACKEND == "postgres":
-        if psycopg2 is None:
-            raise RuntimeError("DATABASE_URL is configured but psycopg2 is not installed.")
-        raw_connection = psycopg2.connect(DATABASE_URL, connect_timeout=10)
-        return AuthDBConnection(raw_connection)
+        pool = auth_pg_pool()
+        raw_connection = pool.getconn()
+        if raw_connection.closed or raw_connection.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            pool.putconn(raw_connection, close=True)
+            raw_connection = pool.getconn()
+        return raw_connection
+    try:
+        return AUTH_DB_IDLE_POOL.get_nowait()
+    except queue.Empty:
+        return open_sqlite_auth_connection()
+
+
+def open_postgres_auth_connection() -> Any:
+    return psycopg2.connect(DATABASE_URL, connect_timeout=10)
+
+
+def auth_pg_pool() -> Any:
+    global AUTH_PG_POOL
+    if AUTH_PG_POOL is None:
+        with AUTH_PG_POOL_LOCK:
+            if AUTH_PG_POOL is None:
+                AUTH_PG_POOL = psycopg2.pool.ThreadedConnectionPool(
+                    AUTH_DB_POOL_MIN_SIZE,
+                    AUTH_DB_POOL_SIZE,
+                    DATABASE_URL,
+                    connect_timeout=10,
+                )
+    return AUTH_PG_POOL
+
+
+def open_sqlite_auth_connection() -> sqlite3.Connection:
     db_dir = os.path.dirname(AUTH_DB_PATH)
     if db_dir:
         os.makedirs(db_dir, exist_ok=True)
-    raw_connection = sqlite3.connect(AUTH_DB_PATH, timeout=15, check_same_thread=False)
+    raw_connection = sqlite3.connect(
+        AUTH_DB_PATH,
+        timeout=15,
+        check_same_thread=False,
+        cached_statements=AUTH_DB_CACHED_STATEMENTS,
+    )
     raw_connection.row_factory = sqlite3.Row
-    return AuthDBConnection(raw_connection)
+    for pragma in AUTH_DB_CONNECTION_PRAGMAS:
+        raw_connection.execute(pragma)
+    return raw_connection
+
+
+def warm_auth_db_pool() -> None:
+    if AUTH_DB_BACKEND == "postgres":
+        if psycopg2 is not None:
+            auth_pg_pool()
+        return
+    while AUTH_DB_IDLE_POOL.qsize() < AUTH_DB_POOL_MIN_SIZE:
+        try:
+            AUTH_DB_IDLE_POOL.put_nowait(open_sqlite_auth_connection())
+        except queue.Full:
+            break
+
+
+def close_auth_db_pools() -> None:
+    while True:
+        try:
+            AUTH_DB_IDLE_POOL.get_nowait().close()
+        except queue.Empty:
+            break
+    if AUTH_PG_POOL is not None:
+        AUTH_PG_POOL.closeall()
+
+
+def update_user_returning(cursor: AuthDBCursor, assignments_sql: str, values: tuple[Any, ...], user_id: int) -> Any:
+    if AUTH_DB_SUPPORTS_RETURNING:
+        rows = cursor.execute(
+            f"UPDATE users SET {assignments_sql} WHERE id = ? RETURNING {USER_ROW_COLUMNS}",
+            (*values, user_id),
+        ).fetchall()
+        return rows[0] if rows else None
+    cursor.execute(f"UPDATE users SET {assignments_sql} WHERE id = ?", (*values, user_id))
+    return cursor.execute(USER_BY_ID_SQL, (user_id,)).fetchone()
 
 
 def begin_write_transaction(cursor: AuthDBCursor) -> None:
     if AUTH_DB_BACKEND == "postgres":
         cursor.execute("BEGIN")
         return
+    for delay in AUTH_DB_BEGIN_RETRY_DELAYS_SECONDS:
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            return
+        except sqlite3.OperationalError as error:
+            if "locked" not in str(error).lower():
+                raise
+        time.sleep(delay)
     cursor.execute("BEGIN IMMEDIATE")
 
 
@@ -1681,380 +1989,451 @@ def inserted_row_id(connection: AuthDBConnection, cursor: AuthDBCursor) -> int:
     raise RuntimeError("Unable to determine inserted row id for the current transaction.")
 
 
+def table_has_column(cursor: AuthDBCursor, table: str, column: str) -> bool:
+    if AUTH_DB_BACKEND == "postgres":
+        row = cursor.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = ? AND column_name = ?",
+            (table, column),
+        ).fetchone()
+        return bool(row)
+    return any(row["name"] == column for row in cursor.execute(f"PRAGMA table_info({table})").fetchall())
+
+
+def backfill_credit_transaction_external_refs(cursor: AuthDBCursor) -> None:
+    rows = cursor.execute(
+        """
+        SELECT id, action, meta_json FROM credit_transactions
+        WHERE action IN ('stripe_credit_pack', 'razorpay_credit_pack')
+        ORDER BY id
+        """
+    ).fetchall()
+    seen: set[tuple[str, str]] = set()
+    updates: list[tuple[str, int]] = []
+    for row in rows:
+        action = safe_text(row["action"])
+        meta = parse_meta_json(row["meta_json"])
+        external_ref = safe_text(str(meta.get(CREDIT_TX_EXTERNAL_REF_META_KEYS[action]) or ""))
+        if not external_ref or (action, external_ref) in seen:
+            continue
+        seen.add((action, external_ref))
+        updates.append((external_ref, int(row["id"])))
+    if updates:
+        cursor.executemany("UPDATE credit_transactions SET external_ref = ? WHERE id = ?", updates)
+
+
 def init_auth_db() -> None:
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            if AUTH_DB_BACKEND == "postgres":
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS users (
-                        id BIGSERIAL PRIMARY KEY,
-                        full_name TEXT NOT NULL DEFAULT '',
-                        email TEXT NOT NULL UNIQUE,
-                        password_hash TEXT NOT NULL,
-                        password_salt TEXT NOT NULL,
-                        plan_tier TEXT NOT NULL DEFAULT 'free',
-                        credits INTEGER NOT NULL DEFAULT 0,
-                        created_at TEXT NOT NULL,
-                        email_verified INTEGER NOT NULL DEFAULT 1
-                    )
-                    """
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        if AUTH_DB_BACKEND == "postgres":
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS users (
+                    id BIGSERIAL PRIMARY KEY,
+                    full_name TEXT NOT NULL DEFAULT '',
+                    email TEXT NOT NULL UNIQUE,
+                    password_hash TEXT NOT NULL,
+                    password_salt TEXT NOT NULL,
+                    plan_tier TEXT NOT NULL DEFAULT 'free',
+                    credits INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    email_verified INTEGER NOT NULL DEFAULT 1
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS credit_transactions (
-                        id BIGSERIAL PRIMARY KEY,
-                        user_id BIGINT NOT NULL REFERENCES users (id),
-                        action TEXT NOT NULL,
-                        delta INTEGER NOT NULL,
-                        balance_after INTEGER NOT NULL,
-                        meta_json TEXT,
-                        created_at TEXT NOT NULL
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS credit_transactions (
+                    id BIGSERIAL PRIMARY KEY,
+                    user_id BIGINT NOT NULL REFERENCES users (id),
+                    action TEXT NOT NULL,
+                    delta INTEGER NOT NULL,
+                    balance_after INTEGER NOT NULL,
+                    meta_json TEXT,
+                    created_at TEXT NOT NULL
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS user_feedback (
-                        id BIGSERIAL PRIMARY KEY,
-                        user_id BIGINT NOT NULL REFERENCES users (id),
-                        rating INTEGER NOT NULL,
-                        comment TEXT NOT NULL,
-                        source TEXT,
-                        created_at TEXT NOT NULL
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS user_feedback (
+                    id BIGSERIAL PRIMARY KEY,
+                    user_id BIGINT NOT NULL REFERENCES users (id),
+                    rating INTEGER NOT NULL,
+                    comment TEXT NOT NULL,
+                    source TEXT,
+                    created_at TEXT NOT NULL
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS analytics_events (
-                        id BIGSERIAL PRIMARY KEY,
-                        user_id BIGINT REFERENCES users (id),
-                        event_type TEXT NOT NULL,
-                        event_name TEXT NOT NULL,
-                        meta_json TEXT,
-                        created_at TEXT NOT NULL
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analytics_events (
+                    id BIGSERIAL PRIMARY KEY,
+                    user_id BIGINT REFERENCES users (id),
+                    event_type TEXT NOT NULL,
+                    event_name TEXT NOT NULL,
+                    meta_json TEXT,
+                    created_at TEXT NOT NULL
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS payment_orders (
-                        id BIGSERIAL PRIMARY KEY,
-                        gateway TEXT NOT NULL,
-                        order_id TEXT NOT NULL UNIQUE,
-                        user_id BIGINT NOT NULL REFERENCES users (id),
-                        package_id TEXT NOT NULL,
-                        credits INTEGER NOT NULL,
-                        amount_inr INTEGER NOT NULL,
-                        currency TEXT NOT NULL,
-                        status TEXT NOT NULL,
-                        payment_id TEXT,
-                        signature TEXT,
-                        created_at TEXT NOT NULL,
-                        verified_at TEXT,
-                        meta_json TEXT
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS payment_orders (
+                    id BIGSERIAL PRIMARY KEY,
+                    gateway TEXT NOT NULL,
+                    order_id TEXT NOT NULL UNIQUE,
+                    user_id BIGINT NOT NULL REFERENCES users (id),
+                    package_id TEXT NOT NULL,
+                    credits INTEGER NOT NULL,
+                    amount_inr INTEGER NOT NULL,
+                    currency TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payment_id TEXT,
+                    signature TEXT,
+                    created_at TEXT NOT NULL,
+                    verified_at TEXT,
+                    meta_json TEXT
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS signup_otps (
-                        id BIGSERIAL PRIMARY KEY,
-                        email TEXT NOT NULL,
-                        password_hash TEXT NOT NULL,
-                        password_salt TEXT NOT NULL,
-                        otp_hash TEXT NOT NULL,
-                        expires_at TEXT NOT NULL,
-                        attempts INTEGER NOT NULL DEFAULT 0,
-                        consumed_at TEXT,
-                        created_at TEXT NOT NULL
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS signup_otps (
+                    id BIGSERIAL PRIMARY KEY,
+                    email TEXT NOT NULL,
+                    password_hash TEXT NOT NULL,
+                    password_salt TEXT NOT NULL,
+                    otp_hash TEXT NOT NULL,
+                    expires_at TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    consumed_at TEXT,
+                    created_at TEXT NOT NULL
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS password_reset_otps (
-                        id BIGSERIAL PRIMARY KEY,
-                        user_id BIGINT NOT NULL REFERENCES users (id),
-                        email TEXT NOT NULL,
-                        otp_hash TEXT NOT NULL,
-                        expires_at TEXT NOT NULL,
-                        attempts INTEGER NOT NULL DEFAULT 0,
-                        consumed_at TEXT,
-                        created_at TEXT NOT NULL
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS password_reset_otps (
+                    id BIGSERIAL PRIMARY KEY,
+                    user_id BIGINT NOT NULL REFERENCES users (id),
+                    email TEXT NOT NULL,
+                    otp_hash TEXT NOT NULL,
+                    expires_at TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    consumed_at TEXT,
+                    created_at TEXT NOT NULL
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS user_chat_messages (
-                        id BIGSERIAL PRIMARY KEY,
-                        user_id BIGINT NOT NULL REFERENCES users (id),
-                        sender_role TEXT NOT NULL,
-                        message TEXT NOT NULL,
-                        read_by_user INTEGER NOT NULL DEFAULT 0,
-                        read_by_admin INTEGER NOT NULL DEFAULT 0,
-                        created_at TEXT NOT NULL
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS user_chat_messages (
+                    id BIGSERIAL PRIMARY KEY,
+                    user_id BIGINT NOT NULL REFERENCES users (id),
+                    sender_role TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    read_by_user INTEGER NOT NULL DEFAULT 0,
+                    read_by_admin INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS analysis_reports (
-                        id BIGSERIAL PRIMARY KEY,
-                        user_id BIGINT NOT NULL REFERENCES users (id),
-                        source TEXT NOT NULL,
-                        industry TEXT,
-                        role TEXT,
-                        overall_score INTEGER,
-                        shortlist_prediction TEXT,
-                        report_json TEXT NOT NULL,
-                        created_at TEXT NOT NULL
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis_reports (
+                    id BIGSERIAL PRIMARY KEY,
+                    user_id BIGINT NOT NULL REFERENCES users (id),
+                    source TEXT NOT NULL,
+                    industry TEXT,
+                    role TEXT,
+                    overall_score INTEGER,
+                    shortlist_prediction TEXT,
+                    report_json TEXT NOT NULL,
+                    created_at TEXT NOT NULL
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS analysis_semantic_cache (
-                        id BIGSERIAL PRIMARY KEY,
-                        cache_key TEXT NOT NULL UNIQUE,
-                        industry TEXT,
-                        role TEXT,
-                        role_track TEXT,
-                        payload_json TEXT NOT NULL,
-                        model TEXT,
-                        usage_count INTEGER NOT NULL DEFAULT 0,
-                        created_at TEXT NOT NULL,
-                        updated_at TEXT NOT NULL,
-                        last_used_at TEXT
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis_semantic_cache (
+                    id BIGSERIAL PRIMARY KEY,
+                    cache_key TEXT NOT NULL UNIQUE,
+                    industry TEXT,
+                    role TEXT,
+                    role_track TEXT,
+                    payload_json TEXT NOT NULL,
+                    model TEXT,
+                    usage_count INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    last_used_at TEXT
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS analysis_learning_memory (
-                        bucket_key TEXT PRIMARY KEY,
-                        industry TEXT,
-                        role TEXT,
-                        role_track TEXT,
-                        sample_count INTEGER NOT NULL DEFAULT 0,
-                        feedback_count INTEGER NOT NULL DEFAULT 0,
-                        avg_feedback_rating REAL NOT NULL DEFAULT 0,
-                        avg_overall_score REAL NOT NULL DEFAULT 0,
-                        avg_confidence REAL NOT NULL DEFAULT 0,
-                        positive_feedback_count INTEGER NOT NULL DEFAULT 0,
-                        negative_feedback_count INTEGER NOT NULL DEFAULT 0,
-                        quick_win_counts_json TEXT NOT NULL DEFAULT '{}',
-                        missing_skill_counts_json TEXT NOT NULL DEFAULT '{}',
-                        model_success_json TEXT NOT NULL DEFAULT '{}',
-                        updated_at TEXT NOT NULL
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis_learning_memory (
+                    bucket_key TEXT PRIMARY KEY,
+                    industry TEXT,
+                    role TEXT,
+                    role_track TEXT,
+                    sample_count INTEGER NOT NULL DEFAULT 0,
+                    feedback_count INTEGER NOT NULL DEFAULT 0,
+                    avg_feedback_rating REAL NOT NULL DEFAULT 0,
+                    avg_overall_score REAL NOT NULL DEFAULT 0,
+                    avg_confidence REAL NOT NULL DEFAULT 0,
+                    positive_feedback_count INTEGER NOT NULL DEFAULT 0,
+                    negative_feedback_count INTEGER NOT NULL DEFAULT 0,
+                    quick_win_counts_json TEXT NOT NULL DEFAULT '{}',
+                    missing_skill_counts_json TEXT NOT NULL DEFAULT '{}',
+                    model_success_json TEXT NOT NULL DEFAULT '{}',
+                    updated_at TEXT NOT NULL
                 )
-                cursor.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS full_name TEXT NOT NULL DEFAULT ''")
-                cursor.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS plan_tier TEXT NOT NULL DEFAULT 'free'")
-                cursor.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS email_verified INTEGER NOT NULL DEFAULT 1")
-            else:
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS users (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        full_name TEXT NOT NULL DEFAULT '',
-                        email TEXT NOT NULL UNIQUE,
-                        password_hash TEXT NOT NULL,
-                        password_salt TEXT NOT NULL,
-                        plan_tier TEXT NOT NULL DEFAULT 'free',
-                        credits INTEGER NOT NULL DEFAULT 0,
-                        created_at TEXT NOT NULL
-                    )
-                    """
+                """
+            )
+            cursor.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS full_name TEXT NOT NULL DEFAULT ''")
+            cursor.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS plan_tier TEXT NOT NULL DEFAULT 'free'")
+            cursor.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS email_verified INTEGER NOT NULL DEFAULT 1")
+        else:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    full_name TEXT NOT NULL DEFAULT '',
+                    email TEXT NOT NULL UNIQUE,
+                    password_hash TEXT NOT NULL,
+                    password_salt TEXT NOT NULL,
+                    plan_tier TEXT NOT NULL DEFAULT 'free',
+                    credits INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS credit_transactions (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER NOT NULL,
-                        action TEXT NOT NULL,
-                        delta INTEGER NOT NULL,
-                        balance_after INTEGER NOT NULL,
-                        meta_json TEXT,
-                        created_at TEXT NOT NULL,
-                        FOREIGN KEY (user_id) REFERENCES users (id)
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS credit_transactions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    action TEXT NOT NULL,
+                    delta INTEGER NOT NULL,
+                    balance_after INTEGER NOT NULL,
+                    meta_json TEXT,
+                    created_at TEXT NOT NULL,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS user_feedback (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER NOT NULL,
-                        rating INTEGER NOT NULL,
-                        comment TEXT NOT NULL,
-                        source TEXT,
-                        created_at TEXT NOT NULL,
-                        FOREIGN KEY (user_id) REFERENCES users (id)
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS user_feedback (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    rating INTEGER NOT NULL,
+                    comment TEXT NOT NULL,
+                    source TEXT,
+                    created_at TEXT NOT NULL,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS analytics_events (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER,
-                        event_type TEXT NOT NULL,
-                        event_name TEXT NOT NULL,
-                        meta_json TEXT,
-                        created_at TEXT NOT NULL,
-                        FOREIGN KEY (user_id) REFERENCES users (id)
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analytics_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    event_type TEXT NOT NULL,
+                    event_name TEXT NOT NULL,
+                    meta_json TEXT,
+                    created_at TEXT NOT NULL,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS payment_orders (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        gateway TEXT NOT NULL,
-                        order_id TEXT NOT NULL UNIQUE,
-                        user_id INTEGER NOT NULL,
-                        package_id TEXT NOT NULL,
-                        credits INTEGER NOT NULL,
-                        amount_inr INTEGER NOT NULL,
-                        currency TEXT NOT NULL,
-                        status TEXT NOT NULL,
-                        payment_id TEXT,
-                        signature TEXT,
-                        created_at TEXT NOT NULL,
-                        verified_at TEXT,
-                        meta_json TEXT,
-                        FOREIGN KEY (user_id) REFERENCES users (id)
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS payment_orders (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    gateway TEXT NOT NULL,
+                    order_id TEXT NOT NULL UNIQUE,
+                    user_id INTEGER NOT NULL,
+                    package_id TEXT NOT NULL,
+                    credits INTEGER NOT NULL,
+                    amount_inr INTEGER NOT NULL,
+                    currency TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payment_id TEXT,
+                    signature TEXT,
+                    created_at TEXT NOT NULL,
+                    verified_at TEXT,
+                    meta_json TEXT,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS signup_otps (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        email TEXT NOT NULL,
-                        password_hash TEXT NOT NULL,
-                        password_salt TEXT NOT NULL,
-                        otp_hash TEXT NOT NULL,
-                        expires_at TEXT NOT NULL,
-                        attempts INTEGER NOT NULL DEFAULT 0,
-                        consumed_at TEXT,
-                        created_at TEXT NOT NULL
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS signup_otps (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    email TEXT NOT NULL,
+                    password_hash TEXT NOT NULL,
+                    password_salt TEXT NOT NULL,
+                    otp_hash TEXT NOT NULL,
+                    expires_at TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    consumed_at TEXT,
+                    created_at TEXT NOT NULL
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS password_reset_otps (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER NOT NULL,
-                        email TEXT NOT NULL,
-                        otp_hash TEXT NOT NULL,
-                        expires_at TEXT NOT NULL,
-                        attempts INTEGER NOT NULL DEFAULT 0,
-                        consumed_at TEXT,
-                        created_at TEXT NOT NULL,
-                        FOREIGN KEY (user_id) REFERENCES users (id)
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS password_reset_otps (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    email TEXT NOT NULL,
+                    otp_hash TEXT NOT NULL,
+                    expires_at TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    consumed_at TEXT,
+                    created_at TEXT NOT NULL,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS user_chat_messages (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER NOT NULL,
-                        sender_role TEXT NOT NULL,
-                        message TEXT NOT NULL,
-                        read_by_user INTEGER NOT NULL DEFAULT 0,
-                        read_by_admin INTEGER NOT NULL DEFAULT 0,
-                        created_at TEXT NOT NULL,
-                        FOREIGN KEY (user_id) REFERENCES users (id)
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS user_chat_messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    sender_role TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    read_by_user INTEGER NOT NULL DEFAULT 0,
+                    read_by_admin INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS analysis_reports (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER NOT NULL,
-                        source TEXT NOT NULL,
-                        industry TEXT,
-                        role TEXT,
-                        overall_score INTEGER,
-                        shortlist_prediction TEXT,
-                        report_json TEXT NOT NULL,
-                        created_at TEXT NOT NULL,
-                        FOREIGN KEY (user_id) REFERENCES users (id)
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis_reports (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    source TEXT NOT NULL,
+                    industry TEXT,
+                    role TEXT,
+                    overall_score INTEGER,
+                    shortlist_prediction TEXT,
+                    report_json TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS analysis_semantic_cache (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        cache_key TEXT NOT NULL UNIQUE,
-                        industry TEXT,
-                        role TEXT,
-                        role_track TEXT,
-                        payload_json TEXT NOT NULL,
-                        model TEXT,
-                        usage_count INTEGER NOT NULL DEFAULT 0,
-                        created_at TEXT NOT NULL,
-                        updated_at TEXT NOT NULL,
-                        last_used_at TEXT
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis_semantic_cache (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    cache_key TEXT NOT NULL UNIQUE,
+                    industry TEXT,
+                    role TEXT,
+                    role_track TEXT,
+                    payload_json TEXT NOT NULL,
+                    model TEXT,
+                    usage_count INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    last_used_at TEXT
                 )
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS analysis_learning_memory (
-                        bucket_key TEXT PRIMARY KEY,
-                        industry TEXT,
-                        role TEXT,
-                        role_track TEXT,
-                        sample_count INTEGER NOT NULL DEFAULT 0,
-                        feedback_count INTEGER NOT NULL DEFAULT 0,
-                        avg_feedback_rating REAL NOT NULL DEFAULT 0,
-                        avg_overall_score REAL NOT NULL DEFAULT 0,
-                        avg_confidence REAL NOT NULL DEFAULT 0,
-                        positive_feedback_count INTEGER NOT NULL DEFAULT 0,
-                        negative_feedback_count INTEGER NOT NULL DEFAULT 0,
-                        quick_win_counts_json TEXT NOT NULL DEFAULT '{}',
-                        missing_skill_counts_json TEXT NOT NULL DEFAULT '{}',
-                        model_success_json TEXT NOT NULL DEFAULT '{}',
-                        updated_at TEXT NOT NULL
-                    )
-                    """
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis_learning_memory (
+                    bucket_key TEXT PRIMARY KEY,
+                    industry TEXT,
+                    role TEXT,
+                    role_track TEXT,
+                    sample_count INTEGER NOT NULL DEFAULT 0,
+                    feedback_count INTEGER NOT NULL DEFAULT 0,
+                    avg_feedback_rating REAL NOT NULL DEFAULT 0,
+                    avg_overall_score REAL NOT NULL DEFAULT 0,
+                    avg_confidence REAL NOT NULL DEFAULT 0,
+                    positive_feedback_count INTEGER NOT NULL DEFAULT 0,
+                    negative_feedback_count INTEGER NOT NULL DEFAULT 0,
+                    quick_win_counts_json TEXT NOT NULL DEFAULT '{}',
+                    missing_skill_counts_json TEXT NOT NULL DEFAULT '{}',
+                    model_success_json TEXT NOT NULL DEFAULT '{}',
+                    updated_at TEXT NOT NULL
                 )
-                user_columns = [row["name"] for row in cursor.execute("PRAGMA table_info(users)").fetchall()]
-                if "full_name" not in user_columns:
-                    cursor.execute("ALTER TABLE users ADD COLUMN full_name TEXT NOT NULL DEFAULT ''")
-                if "plan_tier" not in user_columns:
-                    cursor.execute("ALTER TABLE users ADD COLUMN plan_tier TEXT NOT NULL DEFAULT 'free'")
-                if "email_verified" not in user_columns:
-                    cursor.execute("ALTER TABLE users ADD COLUMN email_verified INTEGER NOT NULL DEFAULT 1")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_credit_tx_user_time ON credit_transactions (user_id, created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_feedback_user_time ON user_feedback (user_id, created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_user_time ON analytics_events (user_id, created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_time ON analytics_events (created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_payment_orders_user_time ON payment_orders (user_id, created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_payment_orders_status ON payment_orders (status, created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_signup_otps_email_time ON signup_otps (email, created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_reset_otps_email_time ON password_reset_otps (email, created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_user_time ON user_chat_messages (user_id, created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_admin_unread ON user_chat_messages (read_by_admin, created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_user_unread ON user_chat_messages (user_id, read_by_user, created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_analysis_reports_user_time ON analysis_reports (user_id, created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_semantic_cache_updated ON analysis_semantic_cache (updated_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_learning_memory_track_time ON analysis_learning_memory (role_track, updated_at)")
-            connection.commit()
-        finally:
-            connection.close()
+                """
+            )
+            user_columns = [row["name"] for row in cursor.execute("PRAGMA table_info(users)").fetchall()]
+            if "full_name" not in user_columns:
+                cursor.execute("ALTER TABLE users ADD COLUMN full_name TEXT NOT NULL DEFAULT ''")
+            if "plan_tier" not in user_columns:
+                cursor.execute("ALTER TABLE users ADD COLUMN plan_tier TEXT NOT NULL DEFAULT 'free'")
+            if "email_verified" not in user_columns:
+                cursor.execute("ALTER TABLE users ADD COLUMN email_verified INTEGER NOT NULL DEFAULT 1")
+        if not table_has_column(cursor, "credit_transactions", "external_ref"):
+            cursor.execute("ALTER TABLE credit_transactions ADD COLUMN external_ref TEXT")
+            backfill_credit_transaction_external_refs(cursor)
+        if not table_has_column(cursor, "users", "analyze_count"):
+            cursor.execute("ALTER TABLE users ADD COLUMN analyze_count INTEGER NOT NULL DEFAULT 0")
+            cursor.execute(
+                """
+                UPDATE users SET analyze_count = (
+                    SELECT COUNT(*) FROM credit_transactions
+                    WHERE credit_transactions.user_id = users.id AND credit_transactions.action = 'analyze'
+                )
+                """
+            )
+        if not table_has_column(cursor, "users", "feedback_count"):
+            cursor.execute("ALTER TABLE users ADD COLUMN feedback_count INTEGER NOT NULL DEFAULT 0")
+            cursor.execute(
+                """
+                UPDATE users SET feedback_count = (
+                    SELECT COUNT(*) FROM user_feedback WHERE user_feedback.user_id = users.id
+                )
+                """
+            )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_credit_tx_user_time ON credit_transactions (user_id, created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_credit_tx_action ON credit_transactions (action, delta)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_credit_tx_user_action ON credit_transactions (user_id, action)")
+        cursor.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_credit_tx_external_ref
+            ON credit_transactions (action, external_ref)
+            WHERE external_ref IS NOT NULL
+            """
+        )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_feedback_user_time ON user_feedback (user_id, created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_user_time ON analytics_events (user_id, created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_time ON analytics_events (created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_type_name ON analytics_events (event_type, event_name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_payment_orders_user_time ON payment_orders (user_id, created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_payment_orders_status ON payment_orders (status, created_at)")
+        cursor.execute("DROP INDEX IF EXISTS idx_payment_orders_payment")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_payment_orders_gateway_payment ON payment_orders (gateway, payment_id, status)"
+        )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_signup_otps_email_time ON signup_otps (email, created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reset_otps_email_time ON password_reset_otps (email, created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reset_otps_user ON password_reset_otps (user_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_user_time ON user_chat_messages (user_id, created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_admin_unread ON user_chat_messages (read_by_admin, created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_user_unread ON user_chat_messages (user_id, read_by_user, created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_analysis_reports_user_time ON analysis_reports (user_id, created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_semantic_cache_updated ON analysis_semantic_cache (updated_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_learning_memory_track_time ON analysis_learning_memory (role_track, updated_at)")
+        if AUTH_DB_BACKEND == "sqlite":
+            cursor.execute("PRAGMA optimize")
+        connection.commit()
+    finally:
+        connection.close()
 
 
 def normalize_email(value: str) -> str:
@@ -2062,16 +2441,7 @@ def normalize_email(value: str) -> str:
 
 
 def normalize_plan_tier(value: str | None) -> str:
-    normalized = safe_text(value).lower()
-    if normalized in PLAN_RULES:
-        return normalized
-    aliases = {
-        "starter_50": "starter",
-        "pro_100": "pro",
-        "elite_200": "elite",
-        "basic": "free",
-    }
-    return aliases.get(normalized, "free")
+    return PLAN_TIER_CANONICAL.get(safe_text(value).lower(), "free")
 
 
 def user_plan_from_package_id(package_id: str) -> str:
@@ -2085,13 +2455,15 @@ def user_plan_from_package_id(package_id: str) -> str:
     return "free"
 
 
+EMAIL_LOCAL_SEPARATOR_RE = re.compile(r"[^a-z0-9]+")
+
+
 def display_name_from_email(email: str) -> str:
     normalized = normalize_email(email)
     local = normalized.split("@", 1)[0]
     if not local:
         return "User"
-    cleaned = re.sub(r"[^a-z0-9]+", " ", local).strip()
-    cleaned = re.sub(r"\s+", " ", cleaned)
+    cleaned = EMAIL_LOCAL_SEPARATOR_RE.sub(" ", local).strip()
     if not cleaned:
         return "User"
     return " ".join(part.capitalize() for part in cleaned.split(" ")[:3])
@@ -2371,27 +2743,26 @@ def verify_google_id_token(credential: str) -> dict[str, str]:
 
 def sync_user_after_google_login(user_id: int, full_name: str | None = None) -> None:
     cleaned_name = safe_text(full_name)
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            if cleaned_name:
-                connection.execute(
-                    """
-                    UPDATE users
-                    SET email_verified = 1,
-                        full_name = CASE WHEN TRIM(full_name) = '' THEN ? ELSE full_name END
-                    WHERE id = ?
-                    """,
-                    (cleaned_name[:120], user_id),
-                )
-            else:
-                connection.execute(
-                    "UPDATE users SET email_verified = 1 WHERE id = ?",
-                    (user_id,),
-                )
-            connection.commit()
-        finally:
-            connection.close()
+    connection = auth_db_connection()
+    try:
+        if cleaned_name:
+            connection.execute(
+                """
+                UPDATE users
+                SET email_verified = 1,
+                    full_name = CASE WHEN TRIM(full_name) = '' THEN ? ELSE full_name END
+                WHERE id = ?
+                """,
+                (cleaned_name[:120], user_id),
+            )
+        else:
+            connection.execute(
+                "UPDATE users SET email_verified = 1 WHERE id = ?",
+                (user_id,),
+            )
+        connection.commit()
+    finally:
+        connection.close()
 
 
 def create_user_with_welcome_credits(email: str, password: str, source: str = "signup") -> sqlite3.Row:
@@ -2399,38 +2770,37 @@ def create_user_with_welcome_credits(email: str, password: str, source: str = "s
     password_hash = hash_password(password, salt)
     full_name = display_name_from_email(email)
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
         try:
-            cursor = connection.cursor()
-            try:
-                cursor.execute(
-                    """
-                    INSERT INTO users (full_name, email, password_hash, password_salt, plan_tier, credits, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (full_name, email, password_hash, salt, "free", WELCOME_FREE_CREDITS, now_utc_iso()),
-                )
-                user_id = inserted_row_id(connection, cursor)
-                cursor.execute(
-                    """
-                    INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        user_id,
-                        "welcome_credits",
-                        WELCOME_FREE_CREDITS,
-                        WELCOME_FREE_CREDITS,
-                        json.dumps({"source": source}, separators=(",", ":"), sort_keys=True),
-                        now_utc_iso(),
-                    ),
-                )
-                connection.commit()
-            except DB_INTEGRITY_ERRORS:
-                connection.rollback()
-        finally:
-            connection.close()
+            cursor.execute(
+                """
+                INSERT INTO users (full_name, email, password_hash, password_salt, plan_tier, credits, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (full_name, email, password_hash, salt, "free", WELCOME_FREE_CREDITS, now_utc_iso()),
+            )
+            user_id = inserted_row_id(connection, cursor)
+            cursor.execute(
+                """
+                INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    user_id,
+                    "welcome_credits",
+                    WELCOME_FREE_CREDITS,
+                    WELCOME_FREE_CREDITS,
+                    meta_json_text({"source": source}),
+                    now_utc_iso(),
+                ),
+            )
+            connection.commit()
+        except DB_INTEGRITY_ERRORS:
+            connection.rollback()
+    finally:
+        connection.close()
 
     user = fetch_user_by_email(email)
     if not user:
@@ -2445,7 +2815,7 @@ def create_auth_token(user_id: int, email: str) -> str:
         "exp": int(time.time()) + max(1, AUTH_TOKEN_TTL_HOURS) * 3600,
     }
     payload_b64 = b64url_encode(json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8"))
-    signature = hmac.new(AUTH_TOKEN_SECRET.encode("utf-8"), payload_b64.encode("utf-8"), hashlib.sha256).digest()
+    signature = hmac.digest(AUTH_TOKEN_SECRET_BYTES, payload_b64.encode("utf-8"), "sha256")
     return f"{payload_b64}.{b64url_encode(signature)}"
 
 
@@ -2455,7 +2825,7 @@ def decode_auth_token(token: str) -> dict[str, Any]:
         raise HTTPException(status_code=401, detail="Invalid authentication token.")
 
     payload_b64, signature_b64 = parts
-    expected = hmac.new(AUTH_TOKEN_SECRET.encode("utf-8"), payload_b64.encode("utf-8"), hashlib.sha256).digest()
+    expected = hmac.digest(AUTH_TOKEN_SECRET_BYTES, payload_b64.encode("utf-8"), "sha256")
     provided = b64url_decode(signature_b64)
 
     if not hmac.compare_digest(expected, provided):
@@ -2479,7 +2849,7 @@ def create_admin_token(login_id: str) -> str:
         "exp": int(time.time()) + ADMIN_TOKEN_TTL_HOURS * 3600,
     }
     payload_b64 = b64url_encode(json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8"))
-    signature = hmac.new(ADMIN_AUTH_SECRET.encode("utf-8"), payload_b64.encode("utf-8"), hashlib.sha256).digest()
+    signature = hmac.digest(ADMIN_AUTH_SECRET_BYTES, payload_b64.encode("utf-8"), "sha256")
     return f"{payload_b64}.{b64url_encode(signature)}"
 
 
@@ -2488,7 +2858,7 @@ def decode_admin_token(token: str) -> dict[str, Any]:
     if len(parts) != 2:
         raise HTTPException(status_code=401, detail="Invalid admin session token.")
     payload_b64, signature_b64 = parts
-    expected = hmac.new(ADMIN_AUTH_SECRET.encode("utf-8"), payload_b64.encode("utf-8"), hashlib.sha256).digest()
+    expected = hmac.digest(ADMIN_AUTH_SECRET_BYTES, payload_b64.encode("utf-8"), "sha256")
     provided = b64url_decode(signature_b64)
     if not hmac.compare_digest(expected, provided):
         raise HTTPException(status_code=401, detail="Invalid admin session token.")
@@ -2508,7 +2878,7 @@ def fetch_user_by_email(email: str) -> sqlite3.Row | None:
     connection = auth_db_connection()
     try:
         cursor = connection.execute(
-            "SELECT id, full_name, email, password_hash, password_salt, plan_tier, credits, created_at, email_verified FROM users WHERE email = ?",
+            USER_BY_EMAIL_SQL,
             (normalized,),
         )
         return cursor.fetchone()
@@ -2533,10 +2903,7 @@ def is_google_sso_user(user_id: int) -> bool:
         connection.close()
     if not row:
         return False
-    try:
-        payload = json.loads(safe_text(row["meta_json"]) or "{}")
-    except Exception:
-        return False
+    payload = parse_meta_json(row["meta_json"])
     source = safe_text(str(payload.get("source") or "")).lower()
     return source == "google_sso"
 
@@ -2545,7 +2912,7 @@ def fetch_user_by_id(user_id: int) -> sqlite3.Row | None:
     connection = auth_db_connection()
     try:
         cursor = connection.execute(
-            "SELECT id, full_name, email, password_hash, password_salt, plan_tier, credits, created_at, email_verified FROM users WHERE id = ?",
+            USER_BY_ID_SQL,
             (user_id,),
         )
         return cursor.fetchone()
@@ -2565,16 +2932,15 @@ def is_email_verified(user_row: sqlite3.Row | None) -> bool:
 def set_user_password(user_id: int, new_password: str) -> None:
     new_salt = secrets.token_hex(16)
     new_hash = hash_password(new_password, new_salt)
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            connection.execute(
-                "UPDATE users SET password_hash = ?, password_salt = ? WHERE id = ?",
-                (new_hash, new_salt, user_id),
-            )
-            connection.commit()
-        finally:
-            connection.close()
+    connection = auth_db_connection()
+    try:
+        connection.execute(
+            "UPDATE users SET password_hash = ?, password_salt = ? WHERE id = ?",
+            (new_hash, new_salt, user_id),
+        )
+        connection.commit()
+    finally:
+        connection.close()
 
 
 def enforce_otp_resend_cooldown(email: str, table_name: str) -> None:
@@ -2601,26 +2967,25 @@ def create_signup_otp(email: str, password: str) -> None:
     salt = secrets.token_hex(16)
     password_hash = hash_password(password, salt)
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            connection.execute(
-                """
-                INSERT INTO signup_otps (email, password_hash, password_salt, otp_hash, expires_at, attempts, consumed_at, created_at)
-                VALUES (?, ?, ?, ?, ?, 0, NULL, ?)
-                """,
-                (
-                    normalized_email,
-                    password_hash,
-                    salt,
-                    otp_hash(normalized_email, "signup", otp),
-                    expires_at,
-                    now_utc_iso(),
-                ),
-            )
-            connection.commit()
-        finally:
-            connection.close()
+    connection = auth_db_connection()
+    try:
+        connection.execute(
+            """
+            INSERT INTO signup_otps (email, password_hash, password_salt, otp_hash, expires_at, attempts, consumed_at, created_at)
+            VALUES (?, ?, ?, ?, ?, 0, NULL, ?)
+            """,
+            (
+                normalized_email,
+                password_hash,
+                salt,
+                otp_hash(normalized_email, "signup", otp),
+                expires_at,
+                now_utc_iso(),
+            ),
+        )
+        connection.commit()
+    finally:
+        connection.close()
 
     otp_send_error = send_signup_otp_email(normalized_email, otp)
     if otp_send_error:
@@ -2630,79 +2995,79 @@ def create_signup_otp(email: str, password: str) -> None:
 def verify_signup_otp_and_create_user(email: str, otp: str) -> sqlite3.Row:
     normalized_email = normalize_email(email)
     now = datetime.now(timezone.utc)
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            row = cursor.execute(
-                """
-                SELECT id, email, password_hash, password_salt, otp_hash, expires_at, attempts, consumed_at
-                FROM signup_otps
-                WHERE email = ?
-                ORDER BY id DESC
-                LIMIT 1
-                """,
-                (normalized_email,),
-            ).fetchone()
-            if not row:
-                connection.rollback()
-                raise HTTPException(status_code=400, detail="OTP not found. Please request signup OTP again.")
-            if safe_text(row["consumed_at"]):
-                connection.rollback()
-                raise HTTPException(status_code=400, detail="OTP already used. Request a new OTP.")
-            if parse_iso_datetime(str(row["expires_at"])) < now:
-                connection.rollback()
-                raise HTTPException(status_code=400, detail="OTP expired. Request a new OTP.")
-            attempts = int(row["attempts"] or 0)
-            if attempts >= OTP_MAX_ATTEMPTS:
-                connection.rollback()
-                raise HTTPException(status_code=429, detail="Too many invalid OTP attempts. Request a new OTP.")
-            if otp_hash(normalized_email, "signup", otp) != safe_text(row["otp_hash"]):
-                cursor.execute("UPDATE signup_otps SET attempts = ? WHERE id = ?", (attempts + 1, int(row["id"])))
-                connection.commit()
-                raise HTTPException(status_code=400, detail="Invalid OTP.")
-            existing = cursor.execute(
-                "SELECT id FROM users WHERE email = ? LIMIT 1",
-                (normalized_email,),
-            ).fetchone()
-            if existing:
-                connection.rollback()
-                raise HTTPException(status_code=409, detail="Account already exists. Please log in.")
-            cursor.execute(
-                """
-                INSERT INTO users (full_name, email, password_hash, password_salt, plan_tier, credits, created_at, email_verified)
-                VALUES (?, ?, ?, ?, ?, ?, ?, 1)
-                """,
-                (
-                    display_name_from_email(normalized_email),
-                    normalized_email,
-                    safe_text(row["password_hash"]),
-                    safe_text(row["password_salt"]),
-                    "free",
-                    WELCOME_FREE_CREDITS,
-                    now_utc_iso(),
-                ),
-            )
-            user_id = inserted_row_id(connection, cursor)
-            cursor.execute(
-                """
-                INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    user_id,
-                    "welcome_credits",
-                    WELCOME_FREE_CREDITS,
-                    WELCOME_FREE_CREDITS,
-                    json.dumps({"source": "signup_otp"}, separators=(",", ":"), sort_keys=True),
-                    now_utc_iso(),
-                ),
-            )
-            cursor.execute("UPDATE signup_otps SET consumed_at = ? WHERE id = ?", (now_utc_iso(), int(row["id"])))
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        row = cursor.execute(
+            """
+            SELECT id, email, password_hash, password_salt, otp_hash, expires_at, attempts, consumed_at
+            FROM signup_otps
+            WHERE email = ?
+            ORDER BY id DESC
+            LIMIT 1
+            """
+            + SQL_FOR_UPDATE,
+            (normalized_email,),
+        ).fetchone()
+        if not row:
+            connection.rollback()
+            raise HTTPException(status_code=400, detail="OTP not found. Please request signup OTP again.")
+        if safe_text(row["consumed_at"]):
+            connection.rollback()
+            raise HTTPException(status_code=400, detail="OTP already used. Request a new OTP.")
+        if parse_iso_datetime(str(row["expires_at"])) < now:
+            connection.rollback()
+            raise HTTPException(status_code=400, detail="OTP expired. Request a new OTP.")
+        attempts = int(row["attempts"] or 0)
+        if attempts >= OTP_MAX_ATTEMPTS:
+            connection.rollback()
+            raise HTTPException(status_code=429, detail="Too many invalid OTP attempts. Request a new OTP.")
+        if otp_hash(normalized_email, "signup", otp) != safe_text(row["otp_hash"]):
+            cursor.execute("UPDATE signup_otps SET attempts = attempts + 1 WHERE id = ?", (int(row["id"]),))
             connection.commit()
-        finally:
-            connection.close()
+            raise HTTPException(status_code=400, detail="Invalid OTP.")
+        existing = cursor.execute(
+            "SELECT id FROM users WHERE email = ? LIMIT 1",
+            (normalized_email,),
+        ).fetchone()
+        if existing:
+            connection.rollback()
+            raise HTTPException(status_code=409, detail="Account already exists. Please log in.")
+        cursor.execute(
+            """
+            INSERT INTO users (full_name, email, password_hash, password_salt, plan_tier, credits, created_at, email_verified)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+            """,
+            (
+                display_name_from_email(normalized_email),
+                normalized_email,
+                safe_text(row["password_hash"]),
+                safe_text(row["password_salt"]),
+                "free",
+                WELCOME_FREE_CREDITS,
+                now_utc_iso(),
+            ),
+        )
+        user_id = inserted_row_id(connection, cursor)
+        cursor.execute(
+            """
+            INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                user_id,
+                "welcome_credits",
+                WELCOME_FREE_CREDITS,
+                WELCOME_FREE_CREDITS,
+                meta_json_text({"source": "signup_otp"}),
+                now_utc_iso(),
+            ),
+        )
+        cursor.execute("UPDATE signup_otps SET consumed_at = ? WHERE id = ?", (now_utc_iso(), int(row["id"])))
+        connection.commit()
+    finally:
+        connection.close()
 
     user = fetch_user_by_email(normalized_email)
     if not user:
@@ -2720,25 +3085,24 @@ def create_password_reset_otp(email: str) -> None:
     otp = generate_numeric_otp()
     expires_at = (datetime.now(timezone.utc) + timedelta(minutes=OTP_EXPIRY_MINUTES)).isoformat()
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            connection.execute(
-                """
-                INSERT INTO password_reset_otps (user_id, email, otp_hash, expires_at, attempts, consumed_at, created_at)
-                VALUES (?, ?, ?, ?, 0, NULL, ?)
-                """,
-                (
-                    int(user["id"]),
-                    normalized_email,
-                    otp_hash(normalized_email, "password_reset", otp),
-                    expires_at,
-                    now_utc_iso(),
-                ),
-            )
-            connection.commit()
-        finally:
-            connection.close()
+    connection = auth_db_connection()
+    try:
+        connection.execute(
+            """
+            INSERT INTO password_reset_otps (user_id, email, otp_hash, expires_at, attempts, consumed_at, created_at)
+            VALUES (?, ?, ?, ?, 0, NULL, ?)
+            """,
+            (
+                int(user["id"]),
+                normalized_email,
+                otp_hash(normalized_email, "password_reset", otp),
+                expires_at,
+                now_utc_iso(),
+            ),
+        )
+        connection.commit()
+    finally:
+        connection.close()
 
     reset_send_error = send_password_reset_otp_email(normalized_email, otp)
     if reset_send_error:
@@ -2748,46 +3112,46 @@ def create_password_reset_otp(email: str) -> None:
 def verify_password_reset_otp(email: str, otp: str, new_password: str) -> sqlite3.Row:
     normalized_email = normalize_email(email)
     now = datetime.now(timezone.utc)
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            row = cursor.execute(
-                """
-                SELECT id, user_id, otp_hash, expires_at, attempts, consumed_at
-                FROM password_reset_otps
-                WHERE email = ?
-                ORDER BY id DESC
-                LIMIT 1
-                """,
-                (normalized_email,),
-            ).fetchone()
-            if not row:
-                connection.rollback()
-                raise HTTPException(status_code=400, detail="Reset OTP not found. Request a new OTP.")
-            if safe_text(row["consumed_at"]):
-                connection.rollback()
-                raise HTTPException(status_code=400, detail="Reset OTP already used. Request a new OTP.")
-            if parse_iso_datetime(str(row["expires_at"])) < now:
-                connection.rollback()
-                raise HTTPException(status_code=400, detail="Reset OTP expired. Request a new OTP.")
-            attempts = int(row["attempts"] or 0)
-            if attempts >= OTP_MAX_ATTEMPTS:
-                connection.rollback()
-                raise HTTPException(status_code=429, detail="Too many invalid OTP attempts. Request a new OTP.")
-            if otp_hash(normalized_email, "password_reset", otp) != safe_text(row["otp_hash"]):
-                cursor.execute("UPDATE password_reset_otps SET attempts = ? WHERE id = ?", (attempts + 1, int(row["id"])))
-                connection.commit()
-                raise HTTPException(status_code=400, detail="Invalid reset OTP.")
-            user_id = int(row["user_id"])
-            new_salt = secrets.token_hex(16)
-            new_hash = hash_password(new_password, new_salt)
-            cursor.execute("UPDATE users SET password_hash = ?, password_salt = ? WHERE id = ?", (new_hash, new_salt, user_id))
-            cursor.execute("UPDATE password_reset_otps SET consumed_at = ? WHERE id = ?", (now_utc_iso(), int(row["id"])))
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        row = cursor.execute(
+            """
+            SELECT id, user_id, otp_hash, expires_at, attempts, consumed_at
+            FROM password_reset_otps
+            WHERE email = ?
+            ORDER BY id DESC
+            LIMIT 1
+            """
+            + SQL_FOR_UPDATE,
+            (normalized_email,),
+        ).fetchone()
+        if not row:
+            connection.rollback()
+            raise HTTPException(status_code=400, detail="Reset OTP not found. Request a new OTP.")
+        if safe_text(row["consumed_at"]):
+            connection.rollback()
+            raise HTTPException(status_code=400, detail="Reset OTP already used. Request a new OTP.")
+        if parse_iso_datetime(str(row["expires_at"])) < now:
+            connection.rollback()
+            raise HTTPException(status_code=400, detail="Reset OTP expired. Request a new OTP.")
+        attempts = int(row["attempts"] or 0)
+        if attempts >= OTP_MAX_ATTEMPTS:
+            connection.rollback()
+            raise HTTPException(status_code=429, detail="Too many invalid OTP attempts. Request a new OTP.")
+        if otp_hash(normalized_email, "password_reset", otp) != safe_text(row["otp_hash"]):
+            cursor.execute("UPDATE password_reset_otps SET attempts = attempts + 1 WHERE id = ?", (int(row["id"]),))
             connection.commit()
-        finally:
-            connection.close()
+            raise HTTPException(status_code=400, detail="Invalid reset OTP.")
+        user_id = int(row["user_id"])
+        new_salt = secrets.token_hex(16)
+        new_hash = hash_password(new_password, new_salt)
+        cursor.execute("UPDATE users SET password_hash = ?, password_salt = ? WHERE id = ?", (new_hash, new_salt, user_id))
+        cursor.execute("UPDATE password_reset_otps SET consumed_at = ? WHERE id = ?", (now_utc_iso(), int(row["id"])))
+        connection.commit()
+    finally:
+        connection.close()
 
     user = fetch_user_by_id(user_id)
     if not user:
@@ -2795,65 +3159,135 @@ def verify_password_reset_otp(email: str, otp: str, new_password: str) -> sqlite
     return user
 
 
+ANALYTICS_EVENT_QUEUE: queue.Queue[tuple[Any, ...]] = queue.Queue(maxsize=10000)
+ANALYTICS_EVENT_BATCH_SIZE = 500
+ANALYTICS_EVENT_FLUSH_SECONDS = 0.1
+ANALYTICS_WRITER_LOCK = threading.Lock()
+ANALYTICS_WRITER_THREAD: threading.Thread | None = None
+ANALYTICS_EVENT_INSERT_SQL = """
+INSERT INTO analytics_events (user_id, event_type, event_name, meta_json, created_at)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def insert_analytics_events(rows: list[tuple[Any, ...]]) -> None:
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        cursor.executemany(ANALYTICS_EVENT_INSERT_SQL, rows)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def write_analytics_events(rows: list[tuple[Any, ...]]) -> None:
+    try:
+        insert_analytics_events(rows)
+        return
+    except Exception:
+        if len(rows) == 1:
+            logger.warning("Dropped 1 analytics event after a write failure.", exc_info=True)
+            return
+    # Retry row by row so one bad event (e.g. for a user deleted meanwhile) does not lose the whole batch.
+    dropped = 0
+    for row in rows:
+        try:
+            insert_analytics_events([row])
+        except Exception:
+            dropped += 1
+            logger.debug("Dropped analytics event %s.", row[2], exc_info=True)
+    if dropped:
+        logger.warning("Dropped %s of %s analytics events after write failures.", dropped, len(rows))
+
+
+def drain_analytics_events() -> None:
+    while True:
+        batch = [ANALYTICS_EVENT_QUEUE.get()]
+        flush_at = time.monotonic() + ANALYTICS_EVENT_FLUSH_SECONDS
+        while len(batch) < ANALYTICS_EVENT_BATCH_SIZE:
+            remaining = flush_at - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(ANALYTICS_EVENT_QUEUE.get(timeout=remaining))
+            except queue.Empty:
+                break
+        try:
+            write_analytics_events(batch)
+        finally:
+            for _ in batch:
+                ANALYTICS_EVENT_QUEUE.task_done()
+
+
+def ensure_analytics_writer() -> None:
+    global ANALYTICS_WRITER_THREAD
+    if ANALYTICS_WRITER_THREAD is not None:
+        return
+    with ANALYTICS_WRITER_LOCK:
+        if ANALYTICS_WRITER_THREAD is None:
+            ANALYTICS_WRITER_THREAD = threading.Thread(target=drain_analytics_events, name="analytics-writer", daemon=True)
+            ANALYTICS_WRITER_THREAD.start()
+
+
+def analytics_event_row(
+    event_type: str,
+    event_name: str,
+    user_id: int | None = None,
+    meta: dict[str, Any] | None = None,
+) -> tuple[Any, ...]:
+    return (
+        user_id,
+        safe_text(event_type) or "system",
+        safe_text(event_name) or "event",
+        meta_json_text(meta or {}),
+        now_utc_iso(),
+    )
+
+
+def enqueue_analytics_event_row(row: tuple[Any, ...]) -> None:
+    ensure_analytics_writer()
+    try:
+        ANALYTICS_EVENT_QUEUE.put_nowait(row)
+    except queue.Full:
+        write_analytics_events([row])
+
+
 def log_analytics_event(
     event_type: str,
     event_name: str,
     user_id: int | None = None,
     meta: dict[str, Any] | None = None,
 ) -> None:
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            connection.execute(
-                """
-                INSERT INTO analytics_events (user_id, event_type, event_name, meta_json, created_at)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    user_id,
-                    safe_text(event_type) or "system",
-                    safe_text(event_name) or "event",
-                    json.dumps(meta or {}, separators=(",", ":"), sort_keys=True),
-                    now_utc_iso(),
-                ),
-            )
-            connection.commit()
-        except Exception:
-            connection.rollback()
-        finally:
-            connection.close()
+    enqueue_analytics_event_row(analytics_event_row(event_type, event_name, user_id=user_id, meta=meta))
 
 
-def get_analyze_count(user_id: int) -> int:
-    connection = auth_db_connection()
-    try:
-        row = connection.execute(
-            "SELECT COUNT(*) AS count FROM credit_transactions WHERE user_id = ? AND action = 'analyze'",
-            (user_id,),
-        ).fetchone()
-        return int(row["count"] if row else 0)
-    finally:
-        connection.close()
+def flush_analytics_events() -> None:
+    if ANALYTICS_WRITER_THREAD is not None:
+        ANALYTICS_EVENT_QUEUE.join()
 
 
-def has_feedback_submission(user_id: int) -> bool:
-    connection = auth_db_connection()
-    try:
-        row = connection.execute(
-            "SELECT id FROM user_feedback WHERE user_id = ? ORDER BY id ASC LIMIT 1",
-            (user_id,),
-        ).fetchone()
-        return bool(row)
-    finally:
-        connection.close()
+def feedback_required_from_counts(analyze_count: Any, feedback_count: Any) -> bool:
+    return int(analyze_count or 0) >= 1 and int(feedback_count or 0) == 0
 
 
-def feedback_required_for_user(user_id: int) -> bool:
-    return get_analyze_count(user_id) >= 1 and not has_feedback_submission(user_id)
+def feedback_required_for_user(user_id: int, user_row: Any = None) -> bool:
+    if user_row is None:
+        with auth_db_connection() as connection:
+            user_row = connection.execute(
+                "SELECT analyze_count, feedback_count FROM users WHERE id = ?",
+                (user_id,),
+            ).fetchone()
+        if not user_row:
+            return False
+    return feedback_required_from_counts(user_row["analyze_count"], user_row["feedback_count"])
 
 
-def require_feedback_completion(user_id: int) -> None:
-    if feedback_required_for_user(user_id):
+def require_feedback_completion(user_row: Any) -> None:
+    if feedback_required_for_user(int(user_row["id"]), user_row):
         raise HTTPException(
             status_code=403,
             detail={
@@ -2906,7 +3340,7 @@ def auth_response_payload(user_row: sqlite3.Row, token: str | None = None) -> di
             "created_at": str(user_row["created_at"]),
         },
         "wallet": wallet_payload(int(user_row["credits"])),
-        "feedback_required": feedback_required_for_user(user_id),
+        "feedback_required": feedback_required_for_user(user_id, user_row),
         "email_verified": email_verified,
     }
     if token:
@@ -2950,95 +3384,104 @@ def credit_error(user_row: sqlite3.Row, message: str, status_code: int = 402) ->
 
 
 def debit_credits(user_id: int, action: str, amount: int, meta: dict[str, Any] | None = None) -> dict[str, Any]:
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            user = cursor.execute(
-                "SELECT id, full_name, email, password_hash, password_salt, plan_tier, credits, created_at FROM users WHERE id = ?",
-                (user_id,),
-            ).fetchone()
-            if not user:
-                connection.rollback()
-                raise HTTPException(status_code=401, detail="Account not found.")
-
-            current_credits = int(user["credits"])
-            if current_credits < amount:
-                connection.rollback()
-                raise credit_error(
-                    user,
-                    f"Insufficient credits for {action.replace('_', ' ')}. You need {amount} credits.",
-                    402,
-                )
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        user = cursor.execute(
+            USER_BY_ID_FOR_UPDATE_SQL,
+            (user_id,),
+        ).fetchone()
+        if not user:
+            connection.rollback()
+            raise HTTPException(status_code=401, detail="Account not found.")
 
-            updated_credits = current_credits - amount
-            cursor.execute("UPDATE users SET credits = ? WHERE id = ?", (updated_credits, user_id))
-            cursor.execute(
-                """
-                INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    user_id,
-                    action,
-                    -amount,
-                    updated_credits,
-                    json.dumps(meta or {}, separators=(",", ":"), sort_keys=True),
-                    now_utc_iso(),
-                ),
+        current_credits = int(user["credits"])
+        if current_credits < amount:
+            connection.rollback()
+            raise credit_error(
+                user,
+                f"Insufficient credits for {action.replace('_', ' ')}. You need {amount} credits.",
+                402,
             )
-            transaction_id = inserted_row_id(connection, cursor)
-            connection.commit()
-            return {
-                "transaction_id": transaction_id,
-                "wallet": wallet_payload(updated_credits),
-            }
-        finally:
-            connection.close()
-
 
-def credit_credits(user_id: int, action: str, amount: int, meta: dict[str, Any] | None = None) -> dict[str, Any]:
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            user = cursor.execute(
-                "SELECT id, email, password_hash, password_salt, credits, created_at FROM users WHERE id = ?",
-                (user_id,),
-            ).fetchone()
-            if not user:
-                connection.rollback()
-                raise HTTPException(status_code=401, detail="Account not found.")
+        updated_credits = current_credits - amount
+        analyze_increment = 1 if action == "analyze" else 0
+        cursor.execute(
+            "UPDATE users SET credits = credits - ?, analyze_count = analyze_count + ? WHERE id = ?",
+            (amount, analyze_increment, user_id),
+        )
+        cursor.execute(
+            """
+            INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                user_id,
+                action,
+                -amount,
+                updated_credits,
+                meta_json_text(meta or {}),
+                now_utc_iso(),
+            ),
+        )
+        transaction_id = inserted_row_id(connection, cursor)
+        connection.commit()
+        return {
+            "transaction_id": transaction_id,
+            "wallet": wallet_payload(updated_credits),
+            "feedback_required": feedback_required_from_counts(
+                int(user["analyze_count"] or 0) + analyze_increment,
+                user["feedback_count"],
+            ),
+        }
+    finally:
+        connection.close()
 
-            updated_credits = int(user["credits"]) + int(amount)
-            cursor.execute("UPDATE users SET credits = ? WHERE id = ?", (updated_credits, user_id))
-            cursor.execute(
-                """
-                INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    user_id,
-                    action,
-                    amount,
-                    updated_credits,
-                    json.dumps(meta or {}, separators=(",", ":"), sort_keys=True),
-                    now_utc_iso(),
-                ),
-            )
-            transaction_id = inserted_row_id(connection, cursor)
-            connection.commit()
-            return {
-                "transaction_id": transaction_id,
-                "wallet": wallet_payload(updated_credits),
-            }
-        finally:
-            connection.close()
 
+def credit_credits(
+    user_id: int,
+    action: str,
+    amount: int,
+    meta: dict[str, Any] | None = None,
+    event: tuple[Any, ...] | None = None,
+) -> dict[str, Any]:
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        user = cursor.execute(USER_BY_ID_FOR_UPDATE_SQL, (user_id,)).fetchone()
+        if not user:
+            connection.rollback()
+            raise HTTPException(status_code=401, detail="Account not found.")
 
-init_auth_db()
+        updated_credits = int(user["credits"]) + int(amount)
+        cursor.execute("UPDATE users SET credits = credits + ? WHERE id = ?", (int(amount), user_id))
+        cursor.execute(
+            """
+            INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                user_id,
+                action,
+                amount,
+                updated_credits,
+                meta_json_text(meta or {}),
+                now_utc_iso(),
+            ),
+        )
+        transaction_id = inserted_row_id(connection, cursor)
+        connection.commit()
+        if event is not None:
+            enqueue_analytics_event_row(event)
+        return {
+            "transaction_id": transaction_id,
+            "wallet": wallet_payload(updated_credits),
+            "user": user,
+        }
+    finally:
+        connection.close()
 
 
 def normalize_experience_years(value: float | None) -> float | None:
@@ -3059,18 +3502,50 @@ def normalize_applications_count(value: int | None) -> int:
     return int(clamp_float(float(value), 1.0, 2500.0))
 
 
-def normalize_toggle_ids(values: list[str] | None) -> list[str]:
+WHITESPACE_RUN_RE = re.compile(r"\s+")
+SEARCH_TEXT_STRIP_RE = re.compile(r"[^a-z0-9+#./]+")
+SKILL_LIST_SPLIT_RE = re.compile(r"[,\n;/|]+")
+LIST_ITEM_SPLIT_RE = re.compile(r"[\n,;]+")
+KEYWORD_WORD_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9+#.-]{2,}")
+TOGGLE_ID_STRIP_RE = re.compile(r"[^a-z0-9_]+")
+JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL | re.IGNORECASE)
+
+
+def normalize_toggle_ids(values: list[str] | None) -> frozenset[str]:
     if not values:
-        return []
-    normalized: list[str] = []
+        return frozenset()
+    normalized: set[str] = set()
     for item in values:
-        token = re.sub(r"[^a-z0-9_]+", "_", safe_text(item).lower()).strip("_")
+        token = normalize_token(TOGGLE_ID_STRIP_RE.sub("_", safe_text(item).lower()).strip("_"))
         if token:
-            normalized.append(token)
-    return dedupe_preserve_order(normalized)
+            normalized.add(token)
+    return frozenset(normalized)
+
+
+def extract_pdf_text(source: bytes | BinaryIO) -> str:
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(source) if isinstance(source, bytes) else source)
+    return "\n".join(page.extract_text() or "" for page in pdf_reader.pages).strip()
+
+
+def ensure_upload_within_limit(upload: UploadFile) -> None:
+    upload.file.seek(0, os.SEEK_END)
+    size = upload.file.tell()
+    upload.file.seek(0)
+    if size > RESUME_UPLOAD_MAX_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Uploaded file is too large. Maximum size is {RESUME_UPLOAD_MAX_BYTES // (1024 * 1024)} MB.",
+        )
+
 
+def extract_uploaded_pdf_text(stream: BinaryIO) -> str:
+    stream.seek(0)
+    if PDF_RENDER_POOL is None:
+        return extract_pdf_text(stream)
+    return run_in_pdf_pool(extract_pdf_text, stream.read())
 
-def extract_resume_text_for_analysis(file_name: str, content_type: str | None, contents: bytes) -> str:
+
+def extract_resume_text_for_analysis(file_name: str, content_type: str | None, stream: BinaryIO) -> str:
     normalized_name = safe_text(file_name).lower()
     normalized_type = safe_text(content_type).lower()
 
@@ -3078,14 +3553,11 @@ def extract_resume_text_for_analysis(file_name: str, content_type: str | None, c
     is_txt = normalized_name.endswith(".txt") or normalized_type.startswith("text/")
 
     if is_pdf:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(contents))
-        extracted_pages: list[str] = []
-        for page in pdf_reader.pages:
-            extracted_pages.append(page.extract_text() or "")
-        return "\n".join(extracted_pages).strip()
+        return extract_uploaded_pdf_text(stream)
 
     if is_txt:
-        return contents.decode("utf-8", errors="ignore").strip()
+        stream.seek(0)
+        return stream.read().decode("utf-8", errors="ignore").strip()
 
     raise HTTPException(
         status_code=400,
@@ -3245,17 +3717,19 @@ def rollback_quota(plan: str, session_id: str, action: str) -> None:
 
 def normalize_token(value: str) -> str:
     token = value.strip().lower()
-    token = re.sub(r"\s+", " ", token)
+    token = WHITESPACE_RUN_RE.sub(" ", token)
     token = token.replace("_", " ")
     token = token.replace("-", " ")
     return SKILL_ALIASES.get(token, token)
 
 
+@lru_cache(maxsize=4096)
 def normalize_search_text(value: str) -> str:
-    normalized = re.sub(r"[^a-z0-9+#./]+", " ", safe_text(value).lower())
-    return re.sub(r"\s+", " ", normalized).strip()
+    normalized = SEARCH_TEXT_STRIP_RE.sub(" ", safe_text(value).lower())
+    return WHITESPACE_RUN_RE.sub(" ", normalized).strip()
 
 
+@lru_cache(maxsize=4096)
 def phrase_in_text(text: str, phrase: str) -> bool:
     normalized_text = normalize_search_text(text)
     normalized_phrase = normalize_search_text(phrase)
@@ -3264,7 +3738,7 @@ def phrase_in_text(text: str, phrase: str) -> bool:
     return f" {normalized_phrase} " in f" {normalized_text} "
 
 
-def dedupe_preserve_order(values: list[str]) -> list[str]:
+def dedupe_preserve_order(values: Iterable[str]) -> list[str]:
     seen: set[str] = set()
     ordered: list[str] = []
     for value in values:
@@ -3275,8 +3749,28 @@ def dedupe_preserve_order(values: list[str]) -> list[str]:
     return ordered
 
 
+@lru_cache(maxsize=1024)
+def blueprint_skill_catalog(critical: tuple[str, ...], core: tuple[str, ...], adjacent: tuple[str, ...]) -> tuple[str, ...]:
+    return tuple(dedupe_preserve_order(chain(critical, core, adjacent)))
+
+
+def dedupe_take(*iterables: Iterable[str], limit: int) -> list[str]:
+    seen: set[str] = set()
+    ordered: list[str] = []
+    if limit <= 0:
+        return ordered
+    for value in chain.from_iterable(iterables):
+        token = normalize_token(value)
+        if token and token not in seen:
+            seen.add(token)
+            ordered.append(token)
+            if len(ordered) >= limit:
+                break
+    return ordered
+
+
 def tokenize_keywords(text: str) -> set[str]:
-    words = re.findall(r"[a-zA-Z][a-zA-Z0-9+#.-]{2,}", text.lower())
+    words = KEYWORD_WORD_RE.findall(text.lower())
     return {word for word in words if word not in STOPWORDS}
 
 
@@ -3305,6 +3799,7 @@ def infer_role_track(role: str, industry: str = "") -> str:
     return track
 
 
+@lru_cache(maxsize=1024)
 def infer_seniority(role: str) -> str:
     role_lower = role.lower()
     seniority_score = {"junior": 0, "mid": 0, "senior": 0}
@@ -3337,7 +3832,7 @@ def build_track_skill_index() -> dict[str, set[str]]:
 TRACK_SKILL_INDEX = build_track_skill_index()
 
 
-def build_role_skill_catalog() -> set[str]:
+def build_role_skill_catalog() -> frozenset[str]:
     catalog: set[str] = set()
 
     for track in ROLE_BLUEPRINTS:
@@ -3347,7 +3842,7 @@ def build_role_skill_catalog() -> set[str]:
         catalog.update(normalize_token(skill) for skill in ROLE_CRITICAL_SKILLS.get(track, []))
         catalog.update(normalize_token(skill) for skill in ROLE_TRACK_KEYWORDS.get(track, []))
 
-    return {token for token in catalog if token and len(token) >= 3}
+    return frozenset(token for token in catalog if token and len(token) >= 3)
 
 
 ROLE_SKILL_CATALOG = build_role_skill_catalog()
@@ -3371,23 +3866,23 @@ def resolve_role_profile(role: str, industry: str, skills_list: list[str]) -> tu
     normalized_skills = dedupe_preserve_order(skills_list)
 
     dynamic_core = dedupe_preserve_order(
-        [
-            *normalized_skills[:10],
-            *ROLE_BLUEPRINTS["general"]["core"],
-        ]
+        chain(
+            normalized_skills[:10],
+            ROLE_BLUEPRINTS["general"]["core"],
+        )
     )[:10]
     dynamic_adjacent = dedupe_preserve_order(
-        [
-            *role_terms[2:10],
-            *normalized_skills[10:18],
-            *ROLE_BLUEPRINTS["general"]["adjacent"],
-        ]
+        chain(
+            role_terms[2:10],
+            normalized_skills[10:18],
+            ROLE_BLUEPRINTS["general"]["adjacent"],
+        )
     )[:8]
     dynamic_critical = dedupe_preserve_order(
-        [
-            *normalized_skills[:2],
-            *ROLE_CRITICAL_SKILLS["general"],
-        ]
+        chain(
+            normalized_skills[:2],
+            ROLE_CRITICAL_SKILLS["general"],
+        )
     )[:3]
 
     blueprint = {
@@ -3463,8 +3958,58 @@ def build_prediction_band(overall_score: int, confidence: int) -> dict[str, int]
     }
 
 
+@lru_cache(maxsize=2048)
+def skill_word_pattern(skill: str) -> re.Pattern[str]:
+    return re.compile(rf"\b{re.escape(skill)}\b")
+
+
+@lru_cache(maxsize=256)
+def skill_automaton(skills: tuple[str, ...]) -> Any:
+    automaton = ahocorasick.Automaton()
+    for skill in skills:
+        if skill:
+            automaton.add_word(skill, skill)
+    automaton.make_automaton()
+    return automaton
+
+
+def is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def is_word_boundary(text: str, index: int) -> bool:
+    before = index > 0 and is_word_char(text[index - 1])
+    after = index < len(text) and is_word_char(text[index])
+    return before != after
+
+
+def skill_hits(skills: tuple[str, ...], text: str) -> list[str]:
+    if ahocorasick is None or not skills:
+        return [skill for skill in skills if skill in text and skill_word_pattern(skill).search(text)]
+    found: set[str] = set()
+    for end_index, skill in skill_automaton(skills).iter(text):
+        if skill not in found and is_word_boundary(text, end_index - len(skill) + 1) and is_word_boundary(text, end_index + 1):
+            found.add(skill)
+    return [skill for skill in skills if skill in found]
+
+
+def spaced_phrase_hits(phrases: tuple[str, ...], text: str) -> set[str]:
+    if ahocorasick is None:
+        return {phrase for phrase in phrases if f" {phrase} " in text}
+    found: set[str] = set()
+    for end_index, phrase in skill_automaton(phrases).iter(text):
+        start_index = end_index - len(phrase) + 1
+        if start_index > 0 and text[start_index - 1] == " " and end_index + 1 < len(text) and text[end_index + 1] == " ":
+            found.add(phrase)
+    return found
+
+
+SKILL_ALIAS_KEYS = tuple(SKILL_ALIASES)
+ROLE_SKILL_CATALOG_PHRASES = tuple(sorted(ROLE_SKILL_CATALOG))
+
+
 def extract_skills_from_text(skills_text: str) -> list[str]:
-    raw_parts = [part.strip() for part in re.split(r"[,\n;/|]+", skills_text) if part.strip()]
+    raw_parts = [part.strip() for part in SKILL_LIST_SPLIT_RE.split(skills_text) if part.strip()]
     normalized: set[str] = set()
 
     for part in raw_parts:
@@ -3473,24 +4018,25 @@ def extract_skills_from_text(skills_text: str) -> list[str]:
             normalized.add(token)
 
     full_text = f" {skills_text.lower()} "
-    for alias, canonical in SKILL_ALIASES.items():
-        pattern = rf"\b{re.escape(alias)}\b"
-        if re.search(pattern, full_text):
-            normalized.add(canonical)
-
-    for skill in SPECIFICITY_KEYWORDS:
-        if re.search(rf"\b{re.escape(skill)}\b", full_text):
-            normalized.add(skill)
+    normalized.update(SKILL_ALIASES[alias] for alias in skill_hits(SKILL_ALIAS_KEYS, full_text))
+    normalized.update(skill_hits(SPECIFICITY_KEYWORD_LIST, full_text))
 
     # Capture recognizable role-skill phrases from free-text sentences.
-    search_text = " " + re.sub(r"[^a-z0-9+#./]+", " ", skills_text.lower()) + " "
-    for phrase in ROLE_SKILL_CATALOG:
-        if f" {phrase} " in search_text:
-            normalized.add(phrase)
+    search_text = " " + SEARCH_TEXT_STRIP_RE.sub(" ", skills_text.lower()) + " "
+    normalized.update(spaced_phrase_hits(ROLE_SKILL_CATALOG_PHRASES, search_text))
 
     return sorted(normalized)
 
 
+@lru_cache(maxsize=256)
+def role_industry_term_tokens(role: str, industry: str) -> frozenset[str]:
+    tokens: set[str] = set()
+    for term in tokenize_keywords(f"{role} {industry}"):
+        if term not in GENERIC_ROLE_WORDS and term not in STOPWORDS:
+            tokens.update(tokenize_keywords(term))
+    return frozenset(tokens)
+
+
 def score_keyword_overlap(
     role_track: str,
     role: str,
@@ -3502,29 +4048,24 @@ def score_keyword_overlap(
     if not skills_list:
         return 0, []
 
-    role_industry_terms = {
-        token
-        for token in tokenize_keywords(f"{role} {industry}")
-        if token not in GENERIC_ROLE_WORDS and token not in STOPWORDS
-    }
-
     target_phrases = dedupe_preserve_order(
-        [
-            *ROLE_TRACK_KEYWORDS.get(role_track, []),
-            *critical_skills,
-            *blueprint["core"],
-            *blueprint["adjacent"][:6],
-        ]
+        chain(
+            ROLE_TRACK_KEYWORDS.get(role_track, ()),
+            critical_skills,
+            blueprint["core"],
+            blueprint["adjacent"][:6],
+        )
     )
     target_phrase_set = set(target_phrases)
 
-    target_tokens = set()
-    for phrase in [*target_phrases, *role_industry_terms]:
+    target_tokens = set(role_industry_term_tokens(role, industry))
+    for phrase in target_phrases:
         target_tokens.update(tokenize_keywords(phrase))
 
-    skill_set = {normalize_token(skill) for skill in skills_list}
-    skill_tokens = set()
-    for skill in skills_list:
+    skill_set: set[str] = set()
+    skill_tokens: set[str] = set()
+    for skill in dict.fromkeys(skills_list):
+        skill_set.add(normalize_token(skill))
         skill_tokens.update(tokenize_keywords(skill))
 
     exact_matches = [phrase for phrase in target_phrases if phrase in skill_set]
@@ -3532,17 +4073,17 @@ def score_keyword_overlap(
 
     exact_ratio = len(exact_matches) / max(1, len(target_phrase_set))
     token_ratio = len(token_matches) / max(1, len(target_tokens))
-    score = clamp(exact_ratio * 72 + token_ratio * 28)
+    score = max(0, min(100, int(round(exact_ratio * 72 + token_ratio * 28))))
 
     if len(skills_list) >= 5:
         score = max(score, 32)
 
-    matched = dedupe_preserve_order([*exact_matches, *token_matches])
+    matched = dedupe_preserve_order(chain(exact_matches, token_matches))
     return score, matched[:12]
 
 
 def score_skill_profile_quality(skills_text: str, skills_list: list[str]) -> tuple[int, dict[str, Any]]:
-    raw_tokens = [token.strip() for token in re.split(r"[,\n;/|]+", skills_text) if token.strip()]
+    raw_tokens = [token.strip() for token in SKILL_LIST_SPLIT_RE.split(skills_text) if token.strip()]
     listed_count = len(raw_tokens)
     unique_count = len(skills_list)
     duplicate_count = max(0, listed_count - unique_count)
@@ -3578,27 +4119,34 @@ def score_blueprint_coverage(
 ) -> tuple[int, list[str], list[str], list[str], list[str]]:
     skill_set = set(skills_list)
 
-    core_hits = [skill for skill in blueprint["core"] if skill in skill_set]
-    core_missing = [skill for skill in blueprint["core"] if skill not in skill_set]
+    core_hits: list[str] = []
+    core_missing: list[str] = []
+    for skill in blueprint["core"]:
+        (core_hits if skill in skill_set else core_missing).append(skill)
 
-    adjacent_hits = [skill for skill in blueprint["adjacent"] if skill in skill_set]
-    adjacent_missing = [skill for skill in blueprint["adjacent"] if skill not in skill_set]
+    adjacent_hits: list[str] = []
+    adjacent_missing: list[str] = []
+    for skill in blueprint["adjacent"]:
+        (adjacent_hits if skill in skill_set else adjacent_missing).append(skill)
 
     core_ratio = len(core_hits) / max(1, len(blueprint["core"]))
     adjacent_ratio = len(adjacent_hits) / max(1, len(blueprint["adjacent"]))
 
-    score = clamp(core_ratio * 78 + adjacent_ratio * 22)
+    score = max(0, min(100, int(round(core_ratio * 78 + adjacent_ratio * 22))))
     return score, core_hits, core_missing, adjacent_hits, adjacent_missing
 
 
+SHORTLIST_PREDICTION_THRESHOLDS = (55, 70, 85)
+SHORTLIST_PREDICTION_LABELS = (
+    "Low shortlist probability",
+    "Moderate shortlist probability",
+    "Moderate to high shortlist probability",
+    "High shortlist probability",
+)
+
+
 def build_shortlist_prediction(score: int) -> str:
-    if score >= 85:
-        return "High shortlist probability"
-    if score >= 70:
-        return "Moderate to high shortlist probability"
-    if score >= 55:
-        return "Moderate shortlist probability"
-    return "Low shortlist probability"
+    return SHORTLIST_PREDICTION_LABELS[bisect.bisect_right(SHORTLIST_PREDICTION_THRESHOLDS, score)]
 
 
 def role_metric_signals(role_track: str) -> list[str]:
@@ -3666,25 +4214,62 @@ def human_insight_pack(role_track: str) -> dict[str, str]:
     )
 
 
+@dataclass(frozen=True)
+class ProfileContext:
+    role_track: str
+    role: str
+    industry: str
+    role_label: str
+    industry_label: str
+    seniority: str
+    experience_band: str
+    market_segment: str
+    metrics_text: str
+    execution_examples: tuple[str, ...]
+    insight_pack: MappingProxyType[str, str]
+    phase2_focus: tuple[str, ...]
+    phase2_outcome: str
+    focus_modules: tuple[str, ...]
+    deliverables: tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]]
+    # Shared by every request hitting the build_profile_context cache; copy before handing it out.
+    hiring_timing: dict[str, Any]
+
+
+@lru_cache(maxsize=1024)
+def build_profile_context(role_track: str, role: str, industry: str, seniority: str, experience_band: str) -> ProfileContext:
+    phase2_focus, phase2_outcome = learning_roadmap_phase2(role_track)
+    return ProfileContext(
+        role_track=role_track,
+        role=safe_text(role),
+        industry=safe_text(industry),
+        role_label=safe_text(role) or "your target role",
+        industry_label=safe_text(industry) or "your target industry",
+        seniority=seniority,
+        experience_band=experience_band,
+        market_segment=market_segment_for_track(role_track, industry),
+        metrics_text=", ".join(role_metric_signals(role_track)[:3]),
+        execution_examples=tuple(role_execution_examples(role_track, industry)),
+        insight_pack=MappingProxyType(dict(human_insight_pack(role_track))),
+        phase2_focus=phase2_focus,
+        phase2_outcome=phase2_outcome,
+        focus_modules=industry_focus_modules(role_track, industry),
+        deliverables=roadmap_deliverables(role_track, experience_band),
+        hiring_timing=build_hiring_timing_insights(role_track, industry),
+    )
+
+
 def build_quick_wins(
-    role_track: str,
-    role: str,
-    industry: str,
+    context: ProfileContext,
     critical_missing: list[str],
     core_missing: list[str],
     adjacent_missing: list[str],
-    experience_band: str,
 ) -> list[str]:
-    role_label = safe_text(role) or "your target role"
-    industry_label = safe_text(industry) or "your target industry"
-    metrics = ", ".join(role_metric_signals(role_track)[:3])
-    examples = role_execution_examples(role_track, industry)
-    insight_pack = human_insight_pack(role_track)
+    insight_pack = context.insight_pack
 
     wins: list[str] = [
-        f"For {role_label} hiring in {industry_label}, first show measurable outcomes ({metrics}) before listing tools/skills.",
+        f"For {context.role_label} hiring in {context.industry_label}, first show measurable outcomes ({context.metrics_text}) before listing tools/skills.",
         insight_pack["hiring_lens"],
-        f"Add one proof story this week: {examples[0]} with numbers, timeline, and your exact ownership.",
+        f"Add one proof story this week: {context.execution_examples[0]} with numbers, timeline, and your exact ownership.",
     ]
 
     if critical_missing:
@@ -3696,7 +4281,7 @@ def build_quick_wins(
     else:
         wins.append("Your core signals are in place. Focus on sharper role-tailored bullets and weekly application quality.")
 
-    if experience_band == "senior":
+    if context.experience_band == "senior":
         wins.append("As a senior profile, highlight team outcomes, forecasting quality, and business decisions you influenced.")
     else:
         wins.append(insight_pack["weekly_move"])
@@ -3704,10 +4289,11 @@ def build_quick_wins(
     return wins[:4]
 
 
+EXECUTION_CREDIBILITY_TRACKS = frozenset({"hr", "operations", "business", "finance"})
+
+
 def build_improvement_areas(
-    role_track: str,
-    role: str,
-    industry: str,
+    context: ProfileContext,
     critical_missing: list[str],
     core_missing: list[str],
     adjacent_missing: list[str],
@@ -3715,11 +4301,12 @@ def build_improvement_areas(
     consistency_score: int,
 ) -> list[dict[str, Any]]:
     areas: list[dict[str, Any]] = []
-    role_label = safe_text(role) or "your target role"
-    industry_label = safe_text(industry) or "your target industry"
-    metrics_text = ", ".join(role_metric_signals(role_track)[:3])
-    execution_examples = role_execution_examples(role_track, industry)
-    insight_pack = human_insight_pack(role_track)
+    role_track = context.role_track
+    role_label = context.role_label
+    industry_label = context.industry_label
+    metrics_text = context.metrics_text
+    execution_examples = context.execution_examples
+    insight_pack = context.insight_pack
 
     areas.append(
         {
@@ -3838,7 +4425,7 @@ def build_improvement_areas(
                 ],
             }
         )
-    elif role_track in {"hr", "operations", "business", "finance"}:
+    elif role_track in EXECUTION_CREDIBILITY_TRACKS:
         areas.append(
             {
                 "category": "Execution Credibility",
@@ -3886,8 +4473,8 @@ def build_suggestion_payload(
     if adjacent_missing:
         priority_actions.append(f"Add competitive adjacent skills: {', '.join(adjacent_missing[:4])}.")
 
-    suggested_skills = dedupe_preserve_order([*critical_missing[:5], *core_missing[:5], *adjacent_missing[:4]])
-    keyword_bank = dedupe_preserve_order([*blueprint["core"][:8], *blueprint["adjacent"][:6]])
+    suggested_skills = dedupe_preserve_order(chain(critical_missing[:5], core_missing[:5], adjacent_missing[:4]))
+    keyword_bank = dedupe_preserve_order(chain(blueprint["core"][:8], blueprint["adjacent"][:6]))
 
     return {
         "stage": "suggest",
@@ -3905,6 +4492,10 @@ def build_suggestion_payload(
     }
 
 
+EXPERIENCE_BAND_THRESHOLDS = (2.5, 8.0)
+EXPERIENCE_BANDS = ("entry", "mid", "senior")
+
+
 def infer_experience_band(experience_years: float | None, seniority: str) -> str:
     normalized = normalize_experience_years(experience_years)
     if normalized is None:
@@ -3913,11 +4504,7 @@ def infer_experience_band(experience_years: float | None, seniority: str) -> str
         if seniority == "junior":
             return "entry"
         return "mid"
-    if normalized < 2.5:
-        return "entry"
-    if normalized < 8:
-        return "mid"
-    return "senior"
+    return EXPERIENCE_BANDS[bisect.bisect_right(EXPERIENCE_BAND_THRESHOLDS, normalized)]
 
 
 def infer_career_stage(age_years: int | None) -> str:
@@ -4010,23 +4597,30 @@ def build_age_factor(
     return {
         "score_delta": int(clamp_float(float(score_delta), -4.0, 3.0)),
         "confidence_delta": int(clamp_float(float(confidence_delta), -6.0, 3.0)),
-        "opinions": dedupe_preserve_order(opinions)[:3],
+        "opinions": dedupe_take(opinions, limit=3),
         "career_stage": stage,
         "expected_experience_years": {"low": round(expected_low, 1), "high": round(expected_high, 1)},
     }
 
 
+MARKET_SEGMENT_INDUSTRY_PATTERNS = tuple(
+    (segment, re.compile(r"(?<![^ ])(?:" + "|".join(re.escape(token) for token in tokens) + r")(?![^ ])"))
+    for segment, tokens in (
+        ("technology", ("ai", "software", "technology", "saas", "it services")),
+        ("business", ("bank", "finance", "insurance", "consulting", "retail")),
+        ("service", ("healthcare", "hospital", "education", "edtech")),
+        ("creative", ("media", "content", "creative", "design", "advertising")),
+    )
+)
+
+
+@lru_cache(maxsize=1024)
 def market_segment_for_track(role_track: str, industry: str) -> str:
-    inferred = TRACK_TO_MARKET_SEGMENT.get(role_track, "general")
     industry_text = normalize_search_text(industry)
-    if any(phrase_in_text(industry_text, token) for token in ["ai", "software", "technology", "saas", "it services"]):
-        return "technology"
-    if any(phrase_in_text(industry_text, token) for token in ["bank", "finance", "insurance", "consulting", "retail"]):
-        return "business"
-    if any(phrase_in_text(industry_text, token) for token in ["healthcare", "hospital", "education", "edtech"]):
-        return "service"
-    if any(phrase_in_text(industry_text, token) for token in ["media", "content", "creative", "design", "advertising"]):
-        return "creative"
+    for segment, pattern in MARKET_SEGMENT_INDUSTRY_PATTERNS:
+        if pattern.search(industry_text):
+            return segment
+    inferred = TRACK_TO_MARKET_SEGMENT.get(role_track, "general")
     return inferred if inferred in INDIA_MARKET_SEGMENTS else "general"
 
 
@@ -4051,28 +4645,25 @@ def build_salary_boosters(market_segment: str) -> list[dict[str, Any]]:
 
 
 def build_salary_insight(
-    role_track: str,
-    role: str,
-    industry: str,
+    context: ProfileContext,
     overall_score: int,
     confidence: int,
-    seniority: str,
     experience_years: float | None,
     selected_toggle_ids: list[str] | None,
 ) -> dict[str, Any]:
-    market_segment = market_segment_for_track(role_track, industry)
+    market_segment = context.market_segment
     market_data = INDIA_MARKET_SEGMENTS.get(market_segment, INDIA_MARKET_SEGMENTS["general"])
-    experience_band = infer_experience_band(experience_years, seniority)
+    experience_band = context.experience_band
 
     band_low, band_high = market_data["salary_lpa"][experience_band]
-    score_factor = clamp_float(0.86 + (overall_score / 100.0) * 0.32, 0.82, 1.22)
-    confidence_factor = clamp_float(0.92 + (confidence / 100.0) * 0.14, 0.9, 1.08)
+    score_factor = max(0.82, min(1.22, 0.86 + (overall_score / 100.0) * 0.32))
+    confidence_factor = max(0.9, min(1.08, 0.92 + (confidence / 100.0) * 0.14))
 
     base_low = round(band_low * score_factor * confidence_factor, 1)
     base_high = round(band_high * score_factor * confidence_factor, 1)
 
     boosters = build_salary_boosters(market_segment)
-    selected = set(normalize_toggle_ids(selected_toggle_ids))
+    selected = normalize_toggle_ids(selected_toggle_ids)
     uplift = round(sum(item["uplift_lpa"] for item in boosters if item["id"] in selected), 1)
 
     projected_low = round(base_low + (uplift * 0.72), 1)
@@ -4081,8 +4672,8 @@ def build_salary_insight(
     return {
         "market_scope": "India",
         "market_segment": market_segment,
-        "target_role": safe_text(role),
-        "target_industry": safe_text(industry),
+        "target_role": context.role,
+        "target_industry": context.industry,
         "experience_band": experience_band,
         "experience_years_used": normalize_experience_years(experience_years),
         "currency": "INR LPA",
@@ -4105,21 +4696,18 @@ def build_salary_insight(
 
 def build_ninety_plus_plan(
     overall_score: int,
-    role_track: str,
-    role: str,
-    industry: str,
-    experience_band: str,
+    context: ProfileContext,
     critical_missing: list[str],
     core_missing: list[str],
     adjacent_missing: list[str],
 ) -> dict[str, Any]:
     gap_to_90 = max(0, 90 - overall_score)
     actions: list[dict[str, Any]] = []
-    role_label = safe_text(role) or "your target role"
-    industry_label = safe_text(industry) or "your target industry"
-    metrics = ", ".join(role_metric_signals(role_track)[:3])
-    execution_examples = role_execution_examples(role_track, industry)
-    insight_pack = human_insight_pack(role_track)
+    role_label = context.role_label
+    industry_label = context.industry_label
+    metrics = context.metrics_text
+    execution_examples = context.execution_examples
+    insight_pack = context.insight_pack
 
     def add_action(
         title: str,
@@ -4171,7 +4759,7 @@ def build_ninety_plus_plan(
             "3-6",
         )
 
-    leadership_clause = "Include team impact, planning quality, and decision ownership in each story." if experience_band == "senior" else "Highlight direct individual contribution and outcome ownership in each story."
+    leadership_clause = "Include team impact, planning quality, and decision ownership in each story." if context.experience_band == "senior" else "Highlight direct individual contribution and outcome ownership in each story."
     add_action(
         "Rewrite resume for recruiter-first clarity",
         f"Rewrite top bullets for {role_label} with measurable outcomes and clean role language.",
@@ -4225,24 +4813,29 @@ def build_ninety_plus_plan(
     }
 
 
+INTERVIEW_CALL_THRESHOLDS = (56, 76)
+INTERVIEW_CALL_LEVELS = (
+    ("low", "Likely to get interview calls: Low"),
+    ("medium", "Likely to get interview calls: Medium"),
+    ("high", "Likely to get interview calls: High"),
+)
+
+
 def build_interview_call_likelihood(overall_score: int, confidence: int) -> dict[str, Any]:
     weighted = clamp(0.68 * overall_score + 0.32 * confidence)
-    if weighted >= 76:
-        return {"level": "high", "label": "Likely to get interview calls: High", "score": weighted}
-    if weighted >= 56:
-        return {"level": "medium", "label": "Likely to get interview calls: Medium", "score": weighted}
-    return {"level": "low", "label": "Likely to get interview calls: Low", "score": weighted}
+    level, label = INTERVIEW_CALL_LEVELS[bisect.bisect_right(INTERVIEW_CALL_THRESHOLDS, weighted)]
+    return {"level": level, "label": label, "score": weighted}
 
 
 def track_fit_score(track: str, skills_list: list[str], role: str, industry: str) -> tuple[int, list[str]]:
     blueprint = ROLE_BLUEPRINTS.get(track, ROLE_BLUEPRINTS["general"])
     catalog = dedupe_preserve_order(
-        [
-            *blueprint["core"],
-            *blueprint["adjacent"],
-            *ROLE_CRITICAL_SKILLS.get(track, []),
-            *ROLE_TRACK_KEYWORDS.get(track, []),
-        ]
+        chain(
+            blueprint["core"],
+            blueprint["adjacent"],
+            ROLE_CRITICAL_SKILLS.get(track, ()),
+            ROLE_TRACK_KEYWORDS.get(track, ()),
+        )
     )
     catalog_set = set(catalog)
     hits = [skill for skill in skills_list if skill in catalog_set]
@@ -4253,7 +4846,7 @@ def track_fit_score(track: str, skills_list: list[str], role: str, industry: str
     score = clamp(ratio * 92 + keyword_bonus)
     if not hits and keyword_bonus < 8:
         return 0, []
-    return score, dedupe_preserve_order(hits)[:6]
+    return score, dedupe_take(hits, limit=6)
 
 
 def build_positioning_strategy(role_track: str, role: str, industry: str, skills_list: list[str]) -> dict[str, Any]:
@@ -4268,7 +4861,7 @@ def build_positioning_strategy(role_track: str, role: str, industry: str, skills
         score, hits = track_fit_score(track, skills_list, role, industry)
         track_scores.append((track, score, hits))
 
-    track_scores.sort(key=lambda item: item[1], reverse=True)
+    track_scores.sort(key=itemgetter(1), reverse=True)
     target_score = next((item[1] for item in track_scores if item[0] == target_track), 0)
 
     segment = TRACK_TO_MARKET_SEGMENT.get(target_track, "general")
@@ -4278,12 +4871,16 @@ def build_positioning_strategy(role_track: str, role: str, industry: str, skills
         if track not in {"general", target_track} and TRACK_TO_MARKET_SEGMENT.get(track, "general") == segment
     ]
     neighbor_tracks = ROLE_TRACK_NEIGHBORS.get(target_track, [])
-    preferred_tracks = dedupe_preserve_order([*neighbor_tracks, *same_segment_tracks])
+    preferred_tracks = dedupe_preserve_order(chain(neighbor_tracks, same_segment_tracks))
     score_lookup = {track: (score, hits) for track, score, hits in track_scores}
 
+    preferred_set = set(preferred_tracks)
+    fallback_tracks = [track for track, _, _ in track_scores if track not in preferred_set]
+
     alternatives: list[dict[str, Any]] = []
+    chosen_roles: set[str] = set()
     minimum_fit_threshold = max(28, target_score - 10)
-    for track in preferred_tracks:
+    for track in chain(preferred_tracks, fallback_tracks):
         if track in {"general", target_track} or track not in score_lookup:
             continue
         if family_tracks and track not in family_tracks:
@@ -4291,42 +4888,26 @@ def build_positioning_strategy(role_track: str, role: str, industry: str, skills
         score, hits = score_lookup[track]
         if score < minimum_fit_threshold:
             continue
-        stronger_fit = score >= target_score + 4
         options = TRACK_ROLE_OPTIONS.get(track, TRACK_ROLE_OPTIONS["general"])
+        if not chosen_roles.isdisjoint(options):
+            continue
+        stronger_fit = score >= target_score + 4
+        if track in preferred_set:
+            why = f"Skills signal strongest relevance for {', '.join(hits[:3]) or 'transferable capabilities'} in this role direction."
+        else:
+            why = f"Adjacent fit emerges from {', '.join(hits[:3]) or 'cross-functional capability overlap'}."
+        chosen_roles.add(options[0])
         alternatives.append(
             {
                 "role": options[0],
                 "fit_score": score,
                 "fit_signal": "higher_fit" if stronger_fit else "comparable_fit",
-                "why": f"Skills signal strongest relevance for {', '.join(hits[:3]) or 'transferable capabilities'} in this role direction.",
+                "why": why,
             }
         )
         if len(alternatives) == 3:
             break
 
-    if len(alternatives) < 3:
-        for track, score, hits in track_scores:
-            if (
-                track == target_track
-                or score < minimum_fit_threshold
-                or any(item["role"] in TRACK_ROLE_OPTIONS.get(track, []) for item in alternatives)
-            ):
-                continue
-            if family_tracks and track not in family_tracks:
-                continue
-            stronger_fit = score >= target_score + 4
-            options = TRACK_ROLE_OPTIONS.get(track, TRACK_ROLE_OPTIONS["general"])
-            alternatives.append(
-                {
-                    "role": options[0],
-                    "fit_score": score,
-                    "fit_signal": "higher_fit" if stronger_fit else "comparable_fit",
-                    "why": f"Adjacent fit emerges from {', '.join(hits[:3]) or 'cross-functional capability overlap'}.",
-                }
-            )
-            if len(alternatives) == 3:
-                break
-
     target_role_options = TRACK_ROLE_OPTIONS.get(target_track, TRACK_ROLE_OPTIONS["general"])
     if alternatives:
         summary = "Based on your current proof signals, these adjacent roles in your field may give faster interview traction."
@@ -4341,207 +4922,308 @@ def build_positioning_strategy(role_track: str, role: str, industry: str, skills
     }
 
 
-def learning_roadmap_phase2(role_track: str) -> tuple[list[str], str]:
-    if role_track == "sales":
-        return (
-            ["Deal story bank", "Objection-handling scripts", "Conversion proof by stage"],
-            "Convert experience into quantified deal evidence and interview-ready stories.",
-        )
-    if role_track in {"marketing", "content"}:
-        return (
-            ["Campaign outcome snapshots", "Channel-specific ROI evidence", "Audience-growth proof"],
-            "Turn campaign work into measurable outcome narratives recruiters trust quickly.",
-        )
-    if role_track in {"operations", "hr", "support"}:
-        return (
-            ["Process improvement evidence", "Service quality metrics", "Stakeholder ownership examples"],
-            "Show operational ownership and measurable business impact clearly.",
-        )
-    if role_track in {"business", "consulting", "finance"}:
-        return (
-            ["Case-style problem breakdowns", "Decision-impact summaries", "Business metrics evidence"],
-            "Demonstrate structured thinking and measurable decision impact.",
-        )
-    return (
-        ["Portfolio artifact", "Role-specific execution evidence"],
-        "Convert skills into outcome-based bullets with strong proof of execution.",
-    )
+ROADMAP_PHASE2_DEFAULT = (
+    ("Portfolio artifact", "Role-specific execution evidence"),
+    "Convert skills into outcome-based bullets with strong proof of execution.",
+)
+ROADMAP_PHASE2_MARKETING = (
+    ("Campaign outcome snapshots", "Channel-specific ROI evidence", "Audience-growth proof"),
+    "Turn campaign work into measurable outcome narratives recruiters trust quickly.",
+)
+ROADMAP_PHASE2_OPERATIONS = (
+    ("Process improvement evidence", "Service quality metrics", "Stakeholder ownership examples"),
+    "Show operational ownership and measurable business impact clearly.",
+)
+ROADMAP_PHASE2_BUSINESS = (
+    ("Case-style problem breakdowns", "Decision-impact summaries", "Business metrics evidence"),
+    "Demonstrate structured thinking and measurable decision impact.",
+)
+ROADMAP_PHASE2_BY_TRACK = {
+    "sales": (
+        ("Deal story bank", "Objection-handling scripts", "Conversion proof by stage"),
+        "Convert experience into quantified deal evidence and interview-ready stories.",
+    ),
+    "marketing": ROADMAP_PHASE2_MARKETING,
+    "content": ROADMAP_PHASE2_MARKETING,
+    "operations": ROADMAP_PHASE2_OPERATIONS,
+    "hr": ROADMAP_PHASE2_OPERATIONS,
+    "support": ROADMAP_PHASE2_OPERATIONS,
+    "business": ROADMAP_PHASE2_BUSINESS,
+    "consulting": ROADMAP_PHASE2_BUSINESS,
+    "finance": ROADMAP_PHASE2_BUSINESS,
+}
 
 
-def industry_focus_modules(role_track: str, industry: str) -> list[str]:
-    industry_text = normalize_search_text(industry)
-    if any(phrase_in_text(industry_text, token) for token in ["automobile", "automotive", "dealership"]):
-        if role_track == "sales":
-            return [
+def learning_roadmap_phase2(role_track: str) -> tuple[tuple[str, ...], str]:
+    return ROADMAP_PHASE2_BY_TRACK.get(role_track, ROADMAP_PHASE2_DEFAULT)
+
+
+INDUSTRY_FOCUS_KEYWORDS = {
+    "automobile": "automotive",
+    "automotive": "automotive",
+    "dealership": "automotive",
+    "saas": "software",
+    "software": "software",
+    "technology": "software",
+    "bank": "bfsi",
+    "finance": "bfsi",
+    "insurance": "bfsi",
+    "healthcare": "healthcare",
+    "hospital": "healthcare",
+    "pharma": "healthcare",
+}
+INDUSTRY_FOCUS_RE = re.compile(
+    r"(?<![^ ])(" + "|".join(re.escape(keyword) for keyword in sorted(INDUSTRY_FOCUS_KEYWORDS, key=len, reverse=True)) + r")(?![^ ])"
+)
+INDUSTRY_RISK_KEYWORDS = {
+    "startup": "startup",
+    "d2c": "startup",
+    "gaming": "creator",
+    "media": "creator",
+    "fintech": "fintech",
+    "edtech": "edtech",
+}
+INDUSTRY_RISK_RE = re.compile("|".join(re.escape(keyword) for keyword in sorted(INDUSTRY_RISK_KEYWORDS, key=len, reverse=True)))
+INDUSTRY_RISK_NOTES = (
+    ("startup", "early-stage startups operating on short runway"),
+    ("creator", "ad and creator-economy businesses with unstable quarter-on-quarter demand"),
+    ("fintech", "compliance-heavy fintech teams exposed to regulatory policy swings"),
+    ("edtech", "enrollment-dependent edtech businesses with seasonal headcount cuts"),
+)
+
+
+def industry_focus_categories(industry: str) -> set[str]:
+    return {INDUSTRY_FOCUS_KEYWORDS[match] for match in INDUSTRY_FOCUS_RE.findall(normalize_search_text(industry))}
+
+
+def industry_risk_categories(industry: str) -> set[str]:
+    return {INDUSTRY_RISK_KEYWORDS[match] for match in INDUSTRY_RISK_RE.findall(safe_text(industry).lower())}
+
+
+INDUSTRY_FOCUS_MODULE_TABLE = (
+    (
+        "automotive",
+        {
+            "sales": (
                 "Dealer network expansion",
                 "Test-drive to booking conversion",
                 "Financing and insurance attach rate",
                 "Territory and outlet productivity",
-            ]
-        if role_track == "marketing":
-            return [
+            ),
+            "marketing": (
                 "Local showroom lead-gen campaigns",
                 "Model launch conversion funnels",
                 "Regional demand seasonality planning",
-            ]
-        return ["Automotive customer journey", "Dealer-channel operations"]
-    if any(phrase_in_text(industry_text, token) for token in ["saas", "software", "technology"]):
-        return ["Pipeline hygiene and CRM velocity" if role_track == "sales" else "Product-led growth metrics", "Retention and expansion workflows"]
-    if any(phrase_in_text(industry_text, token) for token in ["bank", "finance", "insurance"]):
-        return ["Compliance-safe client communication", "Risk-aware conversion process"]
-    if any(phrase_in_text(industry_text, token) for token in ["healthcare", "hospital", "pharma"]):
-        return ["Clinical stakeholder communication", "Audit-ready documentation standards"]
-    return []
-
-
-def roadmap_deliverables(role_track: str, experience_band: str) -> tuple[list[str], list[str], list[str]]:
-    phase1 = [
+            ),
+        },
+        ("Automotive customer journey", "Dealer-channel operations"),
+    ),
+    (
+        "software",
+        {"sales": ("Pipeline hygiene and CRM velocity", "Retention and expansion workflows")},
+        ("Product-led growth metrics", "Retention and expansion workflows"),
+    ),
+    ("bfsi", {}, ("Compliance-safe client communication", "Risk-aware conversion process")),
+    ("healthcare", {}, ("Clinical stakeholder communication", "Audit-ready documentation standards")),
+)
+
+
+def industry_focus_modules(role_track: str, industry: str) -> tuple[str, ...]:
+    categories = industry_focus_categories(industry)
+    for category, track_modules, default_modules in INDUSTRY_FOCUS_MODULE_TABLE:
+        if category in categories:
+            return track_modules.get(role_track, default_modules)
+    return ()
+
+
+ROADMAP_DEFAULT_DELIVERABLES = (
+    (
         "Map target JD must-haves vs current profile and identify top 5 gaps.",
         "Build one-page role narrative with role keywords and proof bullets.",
-    ]
-    phase2 = [
+    ),
+    (
         "Create 2 proof projects/case studies aligned to target role expectations.",
         "Rewrite 8-12 resume bullets with quantified outcomes and scope.",
-    ]
-    phase3 = [
+    ),
+    (
         "Run weekly application batches with role-specific resume variants.",
         "Track callback, rejection reason, and adjust targeting every week.",
-    ]
-
-    if role_track == "sales":
-        phase1 = [
+    ),
+)
+ROADMAP_TRACK_DELIVERABLES = {
+    "sales": (
+        (
             "Build target-account and territory map with ICP, segment priority, and outreach plan.",
             "Create objection-handling playbook by deal stage with confidence scripts.",
-        ]
-        phase2 = [
+        ),
+        (
             "Build deal story bank: 5 wins + 2 recoveries with conversion metrics.",
             "Document funnel metrics by stage (lead->meeting->proposal->close) and explain lift levers.",
-        ]
-        phase3 = [
+        ),
+        (
             "Apply with role-tailored narratives (hunter/farmer/enterprise) and weekly follow-up cadence.",
             "Run callback post-mortem each week and improve pitch, domain story, and quantified evidence.",
-        ]
-        if experience_band == "senior":
-            phase2.insert(0, "Create regional revenue plan with quota split, channel mix, and forecast confidence.")
-    elif role_track in {"marketing", "content"}:
-        phase2 = [
-            "Ship campaign case studies with CAC/ROAS/CTR outcomes and channel mix rationale.",
-            "Build monthly experiment backlog and publish win/loss learnings.",
-        ]
-    elif role_track in {"business", "consulting", "finance"}:
-        phase2 = [
-            "Prepare 3 structured business cases with hypotheses, analysis, and decision impact.",
-            "Build dashboard snapshots linking recommendations to measurable outcomes.",
-        ]
-    elif role_track in {"operations", "support", "hr"}:
-        phase2 = [
-            "Document process-improvement before/after metrics (TAT, SLA, quality, cost).",
-            "Build stakeholder communication templates for escalation and closure.",
-        ]
+        ),
+    ),
+}
+ROADMAP_PHASE2_MARKETING_DELIVERABLES = (
+    "Ship campaign case studies with CAC/ROAS/CTR outcomes and channel mix rationale.",
+    "Build monthly experiment backlog and publish win/loss learnings.",
+)
+ROADMAP_PHASE2_BUSINESS_DELIVERABLES = (
+    "Prepare 3 structured business cases with hypotheses, analysis, and decision impact.",
+    "Build dashboard snapshots linking recommendations to measurable outcomes.",
+)
+ROADMAP_PHASE2_OPERATIONS_DELIVERABLES = (
+    "Document process-improvement before/after metrics (TAT, SLA, quality, cost).",
+    "Build stakeholder communication templates for escalation and closure.",
+)
+ROADMAP_PHASE2_DELIVERABLES_BY_TRACK = {
+    "marketing": ROADMAP_PHASE2_MARKETING_DELIVERABLES,
+    "content": ROADMAP_PHASE2_MARKETING_DELIVERABLES,
+    "business": ROADMAP_PHASE2_BUSINESS_DELIVERABLES,
+    "consulting": ROADMAP_PHASE2_BUSINESS_DELIVERABLES,
+    "finance": ROADMAP_PHASE2_BUSINESS_DELIVERABLES,
+    "operations": ROADMAP_PHASE2_OPERATIONS_DELIVERABLES,
+    "support": ROADMAP_PHASE2_OPERATIONS_DELIVERABLES,
+    "hr": ROADMAP_PHASE2_OPERATIONS_DELIVERABLES,
+}
+SENIOR_SALES_PHASE2_DELIVERABLE = "Create regional revenue plan with quota split, channel mix, and forecast confidence."
+
 
+def roadmap_deliverables(role_track: str, experience_band: str) -> tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]]:
+    phase1, phase2, phase3 = ROADMAP_TRACK_DELIVERABLES.get(role_track, ROADMAP_DEFAULT_DELIVERABLES)
+    phase2 = ROADMAP_PHASE2_DELIVERABLES_BY_TRACK.get(role_track, phase2)
+    if role_track == "sales" and experience_band == "senior":
+        phase2 = (SENIOR_SALES_PHASE2_DELIVERABLE, *phase2)
     return phase1, phase2, phase3
 
 
 def build_learning_roadmap(
-    role_track: str,
-    role: str,
-    industry: str,
-    experience_years: float | None,
+    context: ProfileContext,
     critical_missing: list[str],
     core_missing: list[str],
     adjacent_missing: list[str],
 ) -> dict[str, Any]:
-    experience_band = infer_experience_band(experience_years, infer_seniority(role))
-    role_label = safe_text(role) or "your target role"
-    insight_pack = human_insight_pack(role_track)
-    foundation_focus = dedupe_preserve_order([*critical_missing[:3], *core_missing[:2]])[:4]
-    execution_focus = dedupe_preserve_order([*core_missing[2:6], *adjacent_missing[:3]])[:4]
-    phase2_default_focus, phase2_default_outcome = learning_roadmap_phase2(role_track)
-    context_modules = industry_focus_modules(role_track, industry)
-    phase1_deliverables, phase2_deliverables, phase3_deliverables = roadmap_deliverables(role_track, experience_band)
+    role_label = context.role_label
+    foundation_focus = dedupe_take(critical_missing[:3], core_missing[:2], limit=4)
+    execution_focus = dedupe_take(core_missing[2:6], adjacent_missing[:3], limit=4)
+    phase2_default_focus = list(context.phase2_focus)
+    phase2_default_outcome = context.phase2_outcome
+    context_modules = context.focus_modules
+    phase1_deliverables, phase2_deliverables, phase3_deliverables = context.deliverables
 
     phases: list[dict[str, Any]] = [
         {
             "phase": "Phase 1: Foundation",
             "duration_weeks": "1-3",
-            "focus": dedupe_preserve_order([*foundation_focus, *context_modules[:2]])[:4]
+            "focus": dedupe_take(foundation_focus, context_modules[:2], limit=4)
             or ["Role fundamentals", "Keyword-ready skill language"],
             "outcome": f"Cover must-have gaps and become baseline interview-ready for {role_label}.",
-            "deliverables": phase1_deliverables,
+            "deliverables": list(phase1_deliverables),
         },
         {
             "phase": "Phase 2: Proof Of Work",
             "duration_weeks": "3-6",
-            "focus": dedupe_preserve_order([*execution_focus, *phase2_default_focus, *context_modules])[:5] or phase2_default_focus,
+            "focus": dedupe_take(execution_focus, phase2_default_focus, context_modules, limit=5) or phase2_default_focus,
             "outcome": phase2_default_outcome,
-            "deliverables": phase2_deliverables,
+            "deliverables": list(phase2_deliverables),
         },
         {
             "phase": "Phase 3: Conversion Sprint",
             "duration_weeks": "2-4",
             "focus": ["Resume variants", "Interview stories", "Targeted application batching", "Weekly proof updates"],
             "outcome": "Increase interview call rate through sharper positioning and stronger recruiter trust signals.",
-            "deliverables": phase3_deliverables,
+            "deliverables": list(phase3_deliverables),
         },
     ]
 
     return {
-        "target_role": safe_text(role),
-        "target_industry": safe_text(industry),
-        "experience_band": experience_band,
+        "target_role": context.role,
+        "target_industry": context.industry,
+        "experience_band": context.experience_band,
         "total_duration_weeks": "6-13",
-        "coach_note": insight_pack["weekly_move"],
+        "coach_note": context.insight_pack["weekly_move"],
         "phases": phases,
     }
 
 
-def build_hiring_timing_insights(role_track: str, industry: str) -> dict[str, Any]:
-    segment = market_segment_for_track(role_track, industry)
+RISK_LEVELS = ("low", "medium", "high")
+RISK_LEVEL_INDEX = {level: index for index, level in enumerate(RISK_LEVELS)}
+RISK_LEVEL_ROLE_NOTES = {
+    "low": "This role is typically tied to business continuity and tends to recover hiring faster.",
+    "medium": "Demand is healthy but budgeting discipline and team criticality matter a lot.",
+    "high": "Hiring can swing sharply with revenue cycles, so role-targeted positioning is essential.",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class TimingRow:
+    best_months: tuple[str, ...]
+    peak_windows: tuple[str, ...]
+    layoff_risk_level: str
+    layoff_risk_note: str
+    application_timing_tip: str
+    segment_risk: tuple[str, ...]
+
+
+def build_timing_row(role_track: str, segment: str) -> TimingRow:
     market_data = INDIA_MARKET_SEGMENTS.get(segment, INDIA_MARKET_SEGMENTS["general"])
     role_hint = ROLE_TRACK_MARKET_HINTS.get(role_track, ROLE_TRACK_MARKET_HINTS["general"])
 
-    best_months = dedupe_preserve_order([*role_hint["best_months"], *market_data["best_months"]])[:6]
-    peak_windows = dedupe_preserve_order([*role_hint["peak_windows"], *market_data["hiring_peak_windows"]])[:3]
+    best_months = dedupe_take(role_hint["best_months"], market_data["best_months"], limit=6)
+    peak_windows = dedupe_take(role_hint["peak_windows"], market_data["hiring_peak_windows"], limit=3)
 
-    risk_levels = ["low", "medium", "high"]
     base_level = safe_text(market_data["layoff_risk"]).lower() or "medium"
-    try:
-        base_idx = risk_levels.index(base_level)
-    except ValueError:
-        base_idx = 1
+    base_idx = RISK_LEVEL_INDEX.get(base_level, 1)
     risk_delta = int(role_hint.get("risk_delta", 0))
-    adjusted_level = risk_levels[max(0, min(len(risk_levels) - 1, base_idx + risk_delta))]
-
-    role_note = {
-        "low": "This role is typically tied to business continuity and tends to recover hiring faster.",
-        "medium": "Demand is healthy but budgeting discipline and team criticality matter a lot.",
-        "high": "Hiring can swing sharply with revenue cycles, so role-targeted positioning is essential.",
-    }[adjusted_level]
-
-    industry_tokens = safe_text(industry).lower()
-    segment_risk = SEGMENT_RISK_SEGMENTS_INDIA.get(segment, HIGH_RISK_INDUSTRIES_INDIA)
-    dynamic_risk_segments = list(segment_risk)
-    if "startup" in industry_tokens or "d2c" in industry_tokens:
-        dynamic_risk_segments.append("early-stage startups operating on short runway")
-    if "gaming" in industry_tokens or "media" in industry_tokens:
-        dynamic_risk_segments.append("ad and creator-economy businesses with unstable quarter-on-quarter demand")
-    if "fintech" in industry_tokens:
-        dynamic_risk_segments.append("compliance-heavy fintech teams exposed to regulatory policy swings")
-    if "edtech" in industry_tokens:
-        dynamic_risk_segments.append("enrollment-dependent edtech businesses with seasonal headcount cuts")
+    adjusted_level = RISK_LEVELS[max(0, min(len(RISK_LEVELS) - 1, base_idx + risk_delta))]
 
     timing_tip = role_hint.get("timing_tip") or "Apply in focused weekly batches with role-specific evidence."
     timing_window = f"{best_months[0]} and {best_months[1]}" if len(best_months) >= 2 else "peak months"
+    return TimingRow(
+        best_months=tuple(best_months),
+        peak_windows=tuple(peak_windows),
+        layoff_risk_level=adjusted_level,
+        layoff_risk_note=f"{market_data['layoff_note']} {RISK_LEVEL_ROLE_NOTES[adjusted_level]}",
+        application_timing_tip=f"Prioritize first-wave applications in {timing_window}. {timing_tip}",
+        segment_risk=tuple(SEGMENT_RISK_SEGMENTS_INDIA.get(segment, HIGH_RISK_INDUSTRIES_INDIA)),
+    )
+
+
+TIMING_ROWS: dict[tuple[str, str], TimingRow] = {
+    (role_track, segment): build_timing_row(role_track, segment)
+    for role_track in ROLE_TRACK_MARKET_HINTS
+    for segment in INDIA_MARKET_SEGMENTS
+}
+
+
+def build_hiring_timing_insights(role_track: str, industry: str) -> dict[str, Any]:
+    segment = market_segment_for_track(role_track, industry)
+    row = (
+        TIMING_ROWS.get((role_track, segment))
+        or TIMING_ROWS.get(("general", segment))
+        or build_timing_row(role_track, segment)
+    )
+    risk_categories = industry_risk_categories(industry)
+    dynamic_notes = (note for category, note in INDUSTRY_RISK_NOTES if category in risk_categories)
     return {
-        "best_months_to_apply": best_months,
-        "hiring_peak_windows": peak_windows,
-        "layoff_risk_level": adjusted_level,
-        "layoff_risk_note": f"{market_data['layoff_note']} {role_note}",
-        "higher_layoff_risk_industries": dedupe_preserve_order(dynamic_risk_segments)[:4],
-        "application_timing_tip": f"Prioritize first-wave applications in {timing_window}. {timing_tip}",
+        "best_months_to_apply": list(row.best_months),
+        "hiring_peak_windows": list(row.peak_windows),
+        "layoff_risk_level": row.layoff_risk_level,
+        "layoff_risk_note": row.layoff_risk_note,
+        "higher_layoff_risk_industries": dedupe_take(row.segment_risk, dynamic_notes, limit=4),
+        "application_timing_tip": row.application_timing_tip,
     }
 
 
+CALLBACK_ANALYSIS_WINDOW_WEEKS = 4
+CALLBACK_ESTIMATE_TEMPLATE = {
+    "analysis_window_weeks": CALLBACK_ANALYSIS_WINDOW_WEEKS,
+    "weekly_note": "Weekly callback view is modeled on a 4-week application cycle.",
+}
+
+
 def build_callback_estimator(
     overall_score: int,
     confidence: int,
@@ -4553,37 +5235,57 @@ def build_callback_estimator(
     improvement_headroom = 2.0 + max(0.0, ninety_plus_plan["gap_to_90"] * 0.24)
     improved_rate = clamp_float(base_rate + improvement_headroom, base_rate, 48.0)
 
-    expected_callbacks = round((application_volume * base_rate) / 100.0, 1)
-    improved_callbacks = round((application_volume * improved_rate) / 100.0, 1)
-    analysis_window_weeks = 4
-    applications_per_week = round(application_volume / analysis_window_weeks, 1)
-    expected_callbacks_per_week = round(expected_callbacks / analysis_window_weeks, 2)
-    improved_callbacks_per_week = round(improved_callbacks / analysis_window_weeks, 2)
+    expected_callbacks = application_volume * base_rate / 100.0
+    improved_callbacks = application_volume * improved_rate / 100.0
 
     return {
+        **CALLBACK_ESTIMATE_TEMPLATE,
         "applications_input": application_volume,
-        "analysis_window_weeks": analysis_window_weeks,
-        "applications_per_week": applications_per_week,
+        "applications_per_week": round(application_volume / CALLBACK_ANALYSIS_WINDOW_WEEKS, 1),
         "estimated_callback_rate": round(base_rate, 1),
-        "expected_callbacks": expected_callbacks,
-        "expected_callbacks_per_week": expected_callbacks_per_week,
+        "expected_callbacks": round(expected_callbacks, 1),
+        "expected_callbacks_per_week": round(expected_callbacks / CALLBACK_ANALYSIS_WINDOW_WEEKS, 2),
         "improved_callback_rate": round(improved_rate, 1),
-        "expected_callbacks_after_improvements": improved_callbacks,
-        "expected_callbacks_after_improvements_per_week": improved_callbacks_per_week,
-        "weekly_note": "Weekly callback view is modeled on a 4-week application cycle.",
+        "expected_callbacks_after_improvements": round(improved_callbacks, 1),
+        "expected_callbacks_after_improvements_per_week": round(improved_callbacks / CALLBACK_ANALYSIS_WINDOW_WEEKS, 2),
         "improvement_actions": [action["action"] for action in ninety_plus_plan.get("actions", [])[:3]],
     }
 
 
-def analyze_profile(
+@dataclass(frozen=True)
+class ProfileScores:
+    skills_list: list[str]
+    role_track: str
+    blueprint: dict[str, list[str]]
+    critical_skills: list[str]
+    adaptive_profile: bool
+    seniority: str
+    skill_match_score: int
+    keyword_matches: list[str]
+    profile_score: int
+    profile_details: dict[str, Any]
+    coverage_score: int
+    core_hits: list[str]
+    core_missing: list[str]
+    adjacent_hits: list[str]
+    adjacent_missing: list[str]
+    critical_coverage: int
+    critical_missing: list[str]
+    consistency_score: int
+    raw_overall: int
+    strictness_penalty: float
+    normalized_age_years: int | None
+    age_factor: dict[str, Any]
+    overall_score: int
+
+
+def score_profile(
     industry: str,
     role: str,
     skills_text: str,
     experience_years: float | None = None,
     age_years: float | None = None,
-    applications_count: int | None = None,
-    salary_boost_toggles: list[str] | None = None,
-) -> dict[str, Any]:
+) -> ProfileScores:
     normalized_skills_text = safe_text(skills_text)
     skills_list = extract_skills_from_text(normalized_skills_text)
 
@@ -4628,24 +5330,111 @@ def analyze_profile(
         if critical_coverage >= 34:
             overall_score = max(overall_score, 24)
 
-    confidence = confidence_by_seniority(seniority, profile_details["listed_count"], critical_coverage)
+    return ProfileScores(
+        skills_list=skills_list,
+        role_track=role_track,
+        blueprint=blueprint,
+        critical_skills=critical_skills,
+        adaptive_profile=adaptive_profile,
+        seniority=seniority,
+        skill_match_score=skill_match_score,
+        keyword_matches=keyword_matches,
+        profile_score=profile_score,
+        profile_details=profile_details,
+        coverage_score=coverage_score,
+        core_hits=core_hits,
+        core_missing=core_missing,
+        adjacent_hits=adjacent_hits,
+        adjacent_missing=adjacent_missing,
+        critical_coverage=critical_coverage,
+        critical_missing=critical_missing,
+        consistency_score=consistency_score,
+        raw_overall=raw_overall,
+        strictness_penalty=strictness_penalty,
+        normalized_age_years=normalized_age_years,
+        age_factor=age_factor,
+        overall_score=overall_score,
+    )
+
+
+# Entries are pickled snapshots: the fresh result goes back to the caller untouched and every hit unpickles a private copy.
+ANALYZE_PROFILE_CACHE: OrderedDict[bytes, bytes] = OrderedDict()
+ANALYZE_PROFILE_CACHE_LOCK = threading.Lock()
+
+
+def analyze_profile(
+    industry: str,
+    role: str,
+    skills_text: str,
+    experience_years: float | None = None,
+    age_years: float | None = None,
+    applications_count: int | None = None,
+    salary_boost_toggles: list[str] | None = None,
+) -> dict[str, Any]:
+    if ANALYZE_PROFILE_CACHE_SIZE <= 0:
+        return build_profile_analysis(
+            industry, role, skills_text, experience_years, age_years, applications_count, salary_boost_toggles
+        )
+    material = "\x00".join(
+        [
+            safe_text(industry),
+            safe_text(role),
+            safe_text(skills_text),
+            repr(experience_years),
+            repr(age_years),
+            repr(applications_count),
+            "\x01".join(salary_boost_toggles or []),
+        ]
+    )
+    cache_key = hashlib.blake2b(material.encode("utf-8"), digest_size=16).digest()
+    with ANALYZE_PROFILE_CACHE_LOCK:
+        cached = ANALYZE_PROFILE_CACHE.get(cache_key)
+        if cached is not None:
+            ANALYZE_PROFILE_CACHE.move_to_end(cache_key)
+    if cached is not None:
+        return pickle.loads(cached)
+
+    analysis = build_profile_analysis(
+        industry, role, skills_text, experience_years, age_years, applications_count, salary_boost_toggles
+    )
+    snapshot = pickle.dumps(analysis, protocol=pickle.HIGHEST_PROTOCOL)
+    with ANALYZE_PROFILE_CACHE_LOCK:
+        ANALYZE_PROFILE_CACHE[cache_key] = snapshot
+        ANALYZE_PROFILE_CACHE.move_to_end(cache_key)
+        while len(ANALYZE_PROFILE_CACHE) > ANALYZE_PROFILE_CACHE_SIZE:
+            ANALYZE_PROFILE_CACHE.popitem(last=False)
+    return analysis
+
+
+def build_profile_analysis(
+    industry: str,
+    role: str,
+    skills_text: str,
+    experience_years: float | None = None,
+    age_years: float | None = None,
+    applications_count: int | None = None,
+    salary_boost_toggles: list[str] | None = None,
+) -> dict[str, Any]:
+    scores = score_profile(industry, role, skills_text, experience_years, age_years)
+
+    confidence = confidence_by_seniority(scores.seniority, scores.profile_details["listed_count"], scores.critical_coverage)
     confidence = clamp(
         confidence
-        + min(8, consistency_score * 0.08)
-        - min(10, len(critical_missing) * 2.3)
-        + int(age_factor["confidence_delta"])
+        + min(8, scores.consistency_score * 0.08)
+        - min(10, len(scores.critical_missing) * 2.3)
+        + int(scores.age_factor["confidence_delta"])
     )
     confidence = min(96, confidence)
-    prediction_band = build_prediction_band(overall_score, confidence)
+    prediction_band = build_prediction_band(scores.overall_score, confidence)
 
     prediction_reasoning = [
-        f"Critical-skill coverage is {critical_coverage}% for your target role intent.",
-        f"Role blueprint coverage is {coverage_score}% and keyword alignment is {skill_match_score}%.",
-        f"Consistency score is {consistency_score}%; profile quality signal is {profile_score}%.",
+        f"Critical-skill coverage is {scores.critical_coverage}% for your target role intent.",
+        f"Role blueprint coverage is {scores.coverage_score}% and keyword alignment is {scores.skill_match_score}%.",
+        f"Consistency score is {scores.consistency_score}%; profile quality signal is {scores.profile_score}%.",
     ]
-    if age_factor["opinions"]:
-        prediction_reasoning.append(age_factor["opinions"][0])
-    if adaptive_profile:
+    if scores.age_factor["opinions"]:
+        prediction_reasoning.append(scores.age_factor["opinions"][0])
+    if scores.adaptive_profile:
         prediction_reasoning.append("Adaptive open-role profiling is active for this title.")
 
     role_text = safe_text(role).lower()
@@ -4654,107 +5443,94 @@ def analyze_profile(
     is_fresher_profile = bool(
         explicit_fresher_role
         or (exp_value is not None and exp_value <= 1.0)
-        or (exp_value is None and seniority == "junior" and profile_details["listed_count"] <= 2)
+        or (exp_value is None and scores.seniority == "junior" and scores.profile_details["listed_count"] <= 2)
     )
 
-    experience_band = infer_experience_band(experience_years, seniority)
+    experience_band = infer_experience_band(experience_years, scores.seniority)
+    profile_context = build_profile_context(scores.role_track, role, industry, scores.seniority, experience_band)
     quick_wins = build_quick_wins(
-        role_track,
-        role,
-        industry,
-        critical_missing,
-        core_missing,
-        adjacent_missing,
-        experience_band,
+        profile_context,
+        scores.critical_missing,
+        scores.core_missing,
+        scores.adjacent_missing,
     )
-    if age_factor["opinions"]:
-        quick_wins = dedupe_preserve_order([*quick_wins, *age_factor["opinions"]])[:5]
+    if scores.age_factor["opinions"]:
+        quick_wins = dedupe_take(quick_wins, scores.age_factor["opinions"], limit=5)
 
     areas_to_improve = build_improvement_areas(
-        role_track,
-        role,
-        industry,
-        critical_missing,
-        core_missing,
-        adjacent_missing,
-        profile_details,
-        consistency_score,
+        profile_context,
+        scores.critical_missing,
+        scores.core_missing,
+        scores.adjacent_missing,
+        scores.profile_details,
+        scores.consistency_score,
     )
     applications_used = normalize_applications_count(applications_count)
     ninety_plus_strategy = build_ninety_plus_plan(
-        overall_score,
-        role_track,
-        role,
-        industry,
-        experience_band,
-        critical_missing,
-        core_missing,
-        adjacent_missing,
+        scores.overall_score,
+        profile_context,
+        scores.critical_missing,
+        scores.core_missing,
+        scores.adjacent_missing,
     )
-    interview_call_likelihood = build_interview_call_likelihood(overall_score, confidence)
+    interview_call_likelihood = build_interview_call_likelihood(scores.overall_score, confidence)
     salary_insight = build_salary_insight(
-        role_track=role_track,
-        role=role,
-        industry=industry,
-        overall_score=overall_score,
+        context=profile_context,
+        overall_score=scores.overall_score,
         confidence=confidence,
-        seniority=seniority,
         experience_years=experience_years,
         selected_toggle_ids=salary_boost_toggles,
     )
-    positioning_strategy = None if is_fresher_profile else build_positioning_strategy(role_track, role, industry, skills_list)
+    positioning_strategy = None if is_fresher_profile else build_positioning_strategy(scores.role_track, role, industry, scores.skills_list)
     learning_roadmap = build_learning_roadmap(
-        role_track,
-        role,
-        industry,
-        experience_years,
-        critical_missing,
-        core_missing,
-        adjacent_missing,
+        profile_context,
+        scores.critical_missing,
+        scores.core_missing,
+        scores.adjacent_missing,
     )
-    hiring_market_insights = build_hiring_timing_insights(role_track, industry)
-    callback_forecast = build_callback_estimator(overall_score, confidence, applications_used, ninety_plus_strategy)
+    hiring_market_insights = copy.deepcopy(profile_context.hiring_timing)
+    callback_forecast = build_callback_estimator(scores.overall_score, confidence, applications_used, ninety_plus_strategy)
 
     return {
         "stage": "analyze",
-        "overall_score": overall_score,
-        "ats_friendliness": profile_score,
-        "skill_match": skill_match_score,
-        "shortlist_prediction": build_shortlist_prediction(overall_score),
+        "overall_score": scores.overall_score,
+        "ats_friendliness": scores.profile_score,
+        "skill_match": scores.skill_match_score,
+        "shortlist_prediction": build_shortlist_prediction(scores.overall_score),
         "confidence": confidence,
         "prediction_range": prediction_band,
-        "role_track": role_track,
-        "profile_mode": "adaptive" if adaptive_profile else "standard",
-        "seniority_assumption": seniority,
-        "matched_skills": skills_list[:20],
-        "matched_keywords": keyword_matches[:12],
-        "critical_coverage": critical_coverage,
-        "critical_missing_skills": critical_missing[:10],
-        "consistency_score": consistency_score,
-        "matched_core_skills": core_hits[:10],
-        "matched_adjacent_skills": adjacent_hits[:10],
-        "missing_core_skills": core_missing[:10],
-        "missing_adjacent_skills": adjacent_missing[:10],
+        "role_track": scores.role_track,
+        "profile_mode": "adaptive" if scores.adaptive_profile else "standard",
+        "seniority_assumption": scores.seniority,
+        "matched_skills": scores.skills_list[:20],
+        "matched_keywords": scores.keyword_matches[:12],
+        "critical_coverage": scores.critical_coverage,
+        "critical_missing_skills": scores.critical_missing[:10],
+        "consistency_score": scores.consistency_score,
+        "matched_core_skills": scores.core_hits[:10],
+        "matched_adjacent_skills": scores.adjacent_hits[:10],
+        "missing_core_skills": scores.core_missing[:10],
+        "missing_adjacent_skills": scores.adjacent_missing[:10],
         "precision_diagnostics": {
-            "raw_overall": raw_overall,
-            "strictness_penalty": clamp(strictness_penalty),
-            "listed_skills": profile_details["listed_count"],
-            "unique_skills": profile_details["unique_count"],
-            "specificity_hits": profile_details["specificity_hits"],
-            "adaptive_profile": adaptive_profile,
+            "raw_overall": scores.raw_overall,
+            "strictness_penalty": clamp(scores.strictness_penalty),
+            "listed_skills": scores.profile_details["listed_count"],
+            "unique_skills": scores.profile_details["unique_count"],
+            "specificity_hits": scores.profile_details["specificity_hits"],
+            "adaptive_profile": scores.adaptive_profile,
         },
         "role_profile": {
-            "core": blueprint["core"][:10],
-            "adjacent": blueprint["adjacent"][:8],
-            "critical": critical_skills[:5],
-            "projects": blueprint["projects"][:3],
+            "core": scores.blueprint["core"][:10],
+            "adjacent": scores.blueprint["adjacent"][:8],
+            "critical": scores.critical_skills[:5],
+            "projects": scores.blueprint["projects"][:3],
         },
         "prediction_reasoning": prediction_reasoning,
         "quick_wins": quick_wins,
-        "age_years_used": normalized_age_years,
-        "age_opinions": age_factor["opinions"],
-        "career_stage": age_factor["career_stage"],
-        "experience_expectation_years": age_factor["expected_experience_years"],
+        "age_years_used": scores.normalized_age_years,
+        "age_opinions": scores.age_factor["opinions"],
+        "career_stage": scores.age_factor["career_stage"],
+        "experience_expectation_years": scores.age_factor["expected_experience_years"],
         "areas_to_improve": areas_to_improve,
         "role_universe_mode": "unlimited_open_role",
         "likely_interview_call": interview_call_likelihood,
@@ -4774,7 +5550,7 @@ def parse_llm_json_payload(content: str) -> dict[str, Any] | None:
         return None
 
     candidates = [text]
-    fenced = re.search(r"```(?:json)?\s*(\{.*\})\s*```", text, flags=re.DOTALL | re.IGNORECASE)
+    fenced = JSON_FENCE_RE.search(text)
     if fenced:
         candidates.insert(0, fenced.group(1).strip())
     start = text.find("{")
@@ -4794,9 +5570,9 @@ def parse_llm_json_payload(content: str) -> dict[str, Any] | None:
 
 def normalize_string_list(value: Any, limit: int = 6, max_item_len: int = 140) -> list[str]:
     if isinstance(value, str):
-        raw_items = [item.strip() for item in re.split(r"[\n,;]+", value) if item.strip()]
+        raw_items = [item.strip() for item in LIST_ITEM_SPLIT_RE.split(value) if item.strip()]
     elif isinstance(value, list):
-        raw_items = [safe_text(str(item)) for item in value if safe_text(str(item))]
+        raw_items = [cleaned for item in value if (cleaned := safe_text(str(item)))]
     else:
         raw_items = []
     normalized: list[str] = []
@@ -4824,7 +5600,7 @@ def safe_float(value: Any, default: float = 0.0) -> float:
 
 
 def normalize_counter_key(value: str) -> str:
-    return re.sub(r"\s+", " ", safe_text(value)).strip()
+    return WHITESPACE_RUN_RE.sub(" ", safe_text(value)).strip()
 
 
 def parse_counter_json(raw_value: Any) -> dict[str, int]:
@@ -4903,7 +5679,7 @@ def build_semantic_cache_key(
         "age_years": None if age_years is None else round(float(age_years), 1),
         "skills": normalized_skills[:120],
     }
-    return hashlib.sha256(json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")).hexdigest()
+    return hashlib.blake2b(canonical_json_bytes(payload), digest_size=32).hexdigest()
 
 
 def default_learning_memory(bucket: dict[str, str]) -> dict[str, Any]:
@@ -4929,22 +5705,21 @@ def fetch_learning_memory(bucket: dict[str, str]) -> dict[str, Any]:
     if not ANALYZE_SELF_LEARNING_ENABLED:
         return default_learning_memory(bucket)
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            row = connection.execute(
-                """
-                SELECT bucket_key, industry, role, role_track, sample_count, feedback_count, avg_feedback_rating,
-                       avg_overall_score, avg_confidence, positive_feedback_count, negative_feedback_count,
-                       quick_win_counts_json, missing_skill_counts_json, model_success_json
-                FROM analysis_learning_memory
-                WHERE bucket_key = ?
-                LIMIT 1
-                """,
-                (safe_text(bucket.get("bucket_key")),),
-            ).fetchone()
-        finally:
-            connection.close()
+    connection = auth_db_connection()
+    try:
+        row = connection.execute(
+            """
+            SELECT bucket_key, industry, role, role_track, sample_count, feedback_count, avg_feedback_rating,
+                   avg_overall_score, avg_confidence, positive_feedback_count, negative_feedback_count,
+                   quick_win_counts_json, missing_skill_counts_json, model_success_json
+            FROM analysis_learning_memory
+            WHERE bucket_key = ?
+            LIMIT 1
+            """,
+            (safe_text(bucket.get("bucket_key")),),
+        ).fetchone()
+    finally:
+        connection.close()
 
     memory = default_learning_memory(bucket)
     if not row:
@@ -5023,72 +5798,71 @@ def persist_learning_memory(
         elif rating <= 2:
             negative_feedback_count += 1
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            existing = cursor.execute(
-                "SELECT bucket_key FROM analysis_learning_memory WHERE bucket_key = ? LIMIT 1",
-                (safe_text(bucket.get("bucket_key")),),
-            ).fetchone()
-            payload = (
-                safe_text(bucket.get("industry")),
-                safe_text(bucket.get("role")),
-                safe_text(bucket.get("role_track")),
-                int(sample_count),
-                int(feedback_count),
-                round(avg_feedback, 4),
-                round(avg_overall, 4),
-                round(avg_conf, 4),
-                int(positive_feedback_count),
-                int(negative_feedback_count),
-                json.dumps(quick_win_counts, separators=(",", ":"), sort_keys=True),
-                json.dumps(missing_skill_counts, separators=(",", ":"), sort_keys=True),
-                json.dumps(model_success, separators=(",", ":"), sort_keys=True),
-                now_utc_iso(),
-                safe_text(bucket.get("bucket_key")),
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        existing = cursor.execute(
+            "SELECT bucket_key FROM analysis_learning_memory WHERE bucket_key = ? LIMIT 1",
+            (safe_text(bucket.get("bucket_key")),),
+        ).fetchone()
+        payload = (
+            safe_text(bucket.get("industry")),
+            safe_text(bucket.get("role")),
+            safe_text(bucket.get("role_track")),
+            int(sample_count),
+            int(feedback_count),
+            round(avg_feedback, 4),
+            round(avg_overall, 4),
+            round(avg_conf, 4),
+            int(positive_feedback_count),
+            int(negative_feedback_count),
+            meta_json_text(quick_win_counts),
+            meta_json_text(missing_skill_counts),
+            meta_json_text(model_success),
+            now_utc_iso(),
+            safe_text(bucket.get("bucket_key")),
+        )
+        if existing:
+            cursor.execute(
+                """
+                UPDATE analysis_learning_memory
+                SET industry = ?,
+                    role = ?,
+                    role_track = ?,
+                    sample_count = ?,
+                    feedback_count = ?,
+                    avg_feedback_rating = ?,
+                    avg_overall_score = ?,
+                    avg_confidence = ?,
+                    positive_feedback_count = ?,
+                    negative_feedback_count = ?,
+                    quick_win_counts_json = ?,
+                    missing_skill_counts_json = ?,
+                    model_success_json = ?,
+                    updated_at = ?
+                WHERE bucket_key = ?
+                """,
+                payload,
             )
-            if existing:
-                cursor.execute(
-                    """
-                    UPDATE analysis_learning_memory
-                    SET industry = ?,
-                        role = ?,
-                        role_track = ?,
-                        sample_count = ?,
-                        feedback_count = ?,
-                        avg_feedback_rating = ?,
-                        avg_overall_score = ?,
-                        avg_confidence = ?,
-                        positive_feedback_count = ?,
-                        negative_feedback_count = ?,
-                        quick_win_counts_json = ?,
-                        missing_skill_counts_json = ?,
-                        model_success_json = ?,
-                        updated_at = ?
-                    WHERE bucket_key = ?
-                    """,
-                    payload,
-                )
-            else:
-                cursor.execute(
-                    """
-                    INSERT INTO analysis_learning_memory (
-                        industry, role, role_track, sample_count, feedback_count, avg_feedback_rating,
-                        avg_overall_score, avg_confidence, positive_feedback_count, negative_feedback_count,
-                        quick_win_counts_json, missing_skill_counts_json, model_success_json, updated_at, bucket_key
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    payload,
+        else:
+            cursor.execute(
+                """
+                INSERT INTO analysis_learning_memory (
+                    industry, role, role_track, sample_count, feedback_count, avg_feedback_rating,
+                    avg_overall_score, avg_confidence, positive_feedback_count, negative_feedback_count,
+                    quick_win_counts_json, missing_skill_counts_json, model_success_json, updated_at, bucket_key
                 )
-            connection.commit()
-        except Exception:
-            connection.rollback()
-            logger.exception("Failed to persist analysis learning memory for bucket '%s'.", safe_text(bucket.get("bucket_key")))
-        finally:
-            connection.close()
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                payload,
+            )
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        logger.exception("Failed to persist analysis learning memory for bucket '%s'.", safe_text(bucket.get("bucket_key")))
+    finally:
+        connection.close()
 
 
 def fetch_cached_semantic_overlay(cache_key: str) -> tuple[dict[str, Any] | None, str | None]:
@@ -5098,50 +5872,49 @@ def fetch_cached_semantic_overlay(cache_key: str) -> tuple[dict[str, Any] | None
     if not cache_token:
         return None, None
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            row = connection.execute(
-                """
-                SELECT cache_key, payload_json, model, updated_at
-                FROM analysis_semantic_cache
-                WHERE cache_key = ?
-                LIMIT 1
-                """,
-                (cache_token,),
-            ).fetchone()
-            if not row:
-                return None, None
-
-            updated_at = parse_iso_datetime(safe_text(row["updated_at"]))
-            age_seconds = max(0.0, (datetime.now(timezone.utc) - updated_at).total_seconds())
-            if age_seconds > (ANALYZE_CACHE_TTL_HOURS * 3600.0):
-                return None, None
+    connection = auth_db_connection()
+    try:
+        row = connection.execute(
+            """
+            SELECT cache_key, payload_json, model, updated_at
+            FROM analysis_semantic_cache
+            WHERE cache_key = ?
+            LIMIT 1
+            """,
+            (cache_token,),
+        ).fetchone()
+        if not row:
+            return None, None
 
-            payload = parse_meta_json(row["payload_json"])
-            if not isinstance(payload, dict):
-                return None, None
+        updated_at = parse_iso_datetime(safe_text(row["updated_at"]))
+        age_seconds = max(0.0, (datetime.now(timezone.utc) - updated_at).total_seconds())
+        if age_seconds > (ANALYZE_CACHE_TTL_HOURS * 3600.0):
+            return None, None
 
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            cursor.execute(
-                """
-                UPDATE analysis_semantic_cache
-                SET usage_count = COALESCE(usage_count, 0) + 1,
-                    last_used_at = ?,
-                    updated_at = ?
-                WHERE cache_key = ?
-                """,
-                (now_utc_iso(), now_utc_iso(), cache_token),
-            )
-            connection.commit()
-            return payload, safe_text(row["model"]) or None
-        except Exception:
-            connection.rollback()
-            logger.exception("Failed to read semantic cache entry.")
+        payload = parse_meta_json(row["payload_json"])
+        if not isinstance(payload, dict):
             return None, None
-        finally:
-            connection.close()
+
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        cursor.execute(
+            """
+            UPDATE analysis_semantic_cache
+            SET usage_count = COALESCE(usage_count, 0) + 1,
+                last_used_at = ?,
+                updated_at = ?
+            WHERE cache_key = ?
+            """,
+            (now_utc_iso(), now_utc_iso(), cache_token),
+        )
+        connection.commit()
+        return payload, safe_text(row["model"]) or None
+    except Exception:
+        connection.rollback()
+        logger.exception("Failed to read semantic cache entry.")
+        return None, None
+    finally:
+        connection.close()
 
 
 def save_cached_semantic_overlay(
@@ -5158,65 +5931,64 @@ def save_cached_semantic_overlay(
     if not cache_token or not isinstance(semantic_payload, dict):
         return
 
-    serialized = json.dumps(semantic_payload, separators=(",", ":"), ensure_ascii=False, sort_keys=True, default=str)
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            existing = cursor.execute(
-                "SELECT id FROM analysis_semantic_cache WHERE cache_key = ? LIMIT 1",
-                (cache_token,),
-            ).fetchone()
-            if existing:
-                cursor.execute(
-                    """
-                    UPDATE analysis_semantic_cache
-                    SET industry = ?,
-                        role = ?,
-                        role_track = ?,
-                        payload_json = ?,
-                        model = ?,
-                        updated_at = ?
-                    WHERE cache_key = ?
-                    """,
-                    (
-                        normalize_search_text(industry)[:96],
-                        normalize_search_text(role)[:96],
-                        normalize_search_text(role_track)[:48],
-                        serialized,
-                        safe_text(model),
-                        now_utc_iso(),
-                        cache_token,
-                    ),
-                )
-            else:
-                cursor.execute(
-                    """
-                    INSERT INTO analysis_semantic_cache (
-                        cache_key, industry, role, role_track, payload_json, model, usage_count, created_at, updated_at, last_used_at
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        cache_token,
-                        normalize_search_text(industry)[:96],
-                        normalize_search_text(role)[:96],
-                        normalize_search_text(role_track)[:48],
-                        serialized,
-                        safe_text(model),
-                        0,
-                        now_utc_iso(),
-                        now_utc_iso(),
-                        None,
-                    ),
+    serialized = stored_json_text(semantic_payload)
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        existing = cursor.execute(
+            "SELECT id FROM analysis_semantic_cache WHERE cache_key = ? LIMIT 1",
+            (cache_token,),
+        ).fetchone()
+        if existing:
+            cursor.execute(
+                """
+                UPDATE analysis_semantic_cache
+                SET industry = ?,
+                    role = ?,
+                    role_track = ?,
+                    payload_json = ?,
+                    model = ?,
+                    updated_at = ?
+                WHERE cache_key = ?
+                """,
+                (
+                    normalize_search_text(industry)[:96],
+                    normalize_search_text(role)[:96],
+                    normalize_search_text(role_track)[:48],
+                    serialized,
+                    safe_text(model),
+                    now_utc_iso(),
+                    cache_token,
+                ),
+            )
+        else:
+            cursor.execute(
+                """
+                INSERT INTO analysis_semantic_cache (
+                    cache_key, industry, role, role_track, payload_json, model, usage_count, created_at, updated_at, last_used_at
                 )
-            connection.commit()
-        except Exception:
-            connection.rollback()
-            logger.exception("Failed to store semantic cache entry.")
-        finally:
-            connection.close()
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    cache_token,
+                    normalize_search_text(industry)[:96],
+                    normalize_search_text(role)[:96],
+                    normalize_search_text(role_track)[:48],
+                    serialized,
+                    safe_text(model),
+                    0,
+                    now_utc_iso(),
+                    now_utc_iso(),
+                    None,
+                ),
+            )
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        logger.exception("Failed to store semantic cache entry.")
+    finally:
+        connection.close()
 
 
 def build_memory_prompt_context(memory: dict[str, Any]) -> dict[str, Any]:
@@ -5231,10 +6003,10 @@ def build_memory_prompt_context(memory: dict[str, Any]) -> dict[str, Any]:
 def apply_learning_memory_overlay(base: dict[str, Any], memory: dict[str, Any], max_items: int = 3) -> None:
     learned_quick_wins = top_counter_phrases(parse_counter_json(memory.get("quick_win_counts")), limit=max_items, max_chars=110)
     if learned_quick_wins:
-        base["quick_wins"] = dedupe_preserve_order([*learned_quick_wins, *(base.get("quick_wins") or [])])[:7]
+        base["quick_wins"] = dedupe_take(learned_quick_wins, base.get("quick_wins") or [], limit=7)
     learned_missing = top_counter_phrases(parse_counter_json(memory.get("missing_skill_counts")), limit=max_items, max_chars=64)
     if learned_missing:
-        base["critical_missing_skills"] = dedupe_preserve_order([*(base.get("critical_missing_skills") or []), *learned_missing])[:10]
+        base["critical_missing_skills"] = dedupe_take(base.get("critical_missing_skills") or [], learned_missing, limit=10)
 
 
 def choose_hybrid_routing(base_analysis: dict[str, Any], skills_text: str, memory: dict[str, Any]) -> dict[str, Any]:
@@ -5319,21 +6091,20 @@ def choose_hybrid_routing(base_analysis: dict[str, Any], skills_text: str, memor
 def apply_feedback_learning_signal(user_id: int, rating: int) -> None:
     if not ANALYZE_SELF_LEARNING_ENABLED or user_id <= 0:
         return
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            row = connection.execute(
-                """
-                SELECT industry, role, report_json
-                FROM analysis_reports
-                WHERE user_id = ?
-                ORDER BY id DESC
-                LIMIT 1
-                """,
-                (int(user_id),),
-            ).fetchone()
-        finally:
-            connection.close()
+    connection = auth_db_connection()
+    try:
+        row = connection.execute(
+            """
+            SELECT industry, role, report_json
+            FROM analysis_reports
+            WHERE user_id = ?
+            ORDER BY id DESC
+            LIMIT 1
+            """,
+            (int(user_id),),
+        ).fetchone()
+    finally:
+        connection.close()
     if not row:
         return
 
@@ -5561,48 +6332,43 @@ def analyze_profile_hybrid(
 
     semantic_reasoning = normalize_string_list(semantic_payload.get("semantic_prediction_reasoning"), limit=3, max_item_len=180)
     if semantic_reasoning:
-        base["prediction_reasoning"] = dedupe_preserve_order([*semantic_reasoning, *(base.get("prediction_reasoning") or [])])[:6]
+        base["prediction_reasoning"] = dedupe_take(semantic_reasoning, base.get("prediction_reasoning") or [], limit=6)
 
     semantic_quick_wins = normalize_string_list(semantic_payload.get("semantic_quick_wins"), limit=4, max_item_len=160)
     if semantic_quick_wins:
-        base["quick_wins"] = dedupe_preserve_order([*semantic_quick_wins, *(base.get("quick_wins") or [])])[:7]
+        base["quick_wins"] = dedupe_take(semantic_quick_wins, base.get("quick_wins") or [], limit=7)
 
     semantic_missing = normalize_string_list(semantic_payload.get("semantic_missing_skills"), limit=6, max_item_len=64)
     if semantic_missing:
-        base["critical_missing_skills"] = dedupe_preserve_order([*(base.get("critical_missing_skills") or []), *semantic_missing])[:10]
+        base["critical_missing_skills"] = dedupe_take(base.get("critical_missing_skills") or [], semantic_missing, limit=10)
 
     semantic_strengths = normalize_string_list(semantic_payload.get("semantic_strengths"), limit=6, max_item_len=64)
     if semantic_strengths:
-        base["matched_keywords"] = dedupe_preserve_order([*semantic_strengths, *(base.get("matched_keywords") or [])])[:12]
+        base["matched_keywords"] = dedupe_take(semantic_strengths, base.get("matched_keywords") or [], limit=12)
 
     semantic_summary = safe_text(str(semantic_payload.get("semantic_summary", "")))[:240]
     if semantic_summary:
         base["semantic_summary"] = semantic_summary
 
     seniority = safe_text(str(base.get("seniority_assumption", ""))) or infer_seniority(role)
-    critical_missing = [safe_text(str(item)) for item in (base.get("critical_missing_skills") or []) if safe_text(str(item))]
-    core_missing = [safe_text(str(item)) for item in (base.get("missing_core_skills") or []) if safe_text(str(item))]
-    adjacent_missing = [safe_text(str(item)) for item in (base.get("missing_adjacent_skills") or []) if safe_text(str(item))]
+    critical_missing = [cleaned for item in (base.get("critical_missing_skills") or []) if (cleaned := safe_text(str(item)))]
+    core_missing = [cleaned for item in (base.get("missing_core_skills") or []) if (cleaned := safe_text(str(item)))]
+    adjacent_missing = [cleaned for item in (base.get("missing_adjacent_skills") or []) if (cleaned := safe_text(str(item)))]
     applications_used = normalize_applications_count(applications_count)
     experience_band = infer_experience_band(experience_years, seniority)
+    profile_context = build_profile_context(role_track, role, industry, seniority, experience_band)
 
     base["ninety_plus_strategy"] = build_ninety_plus_plan(
         blended_overall,
-        role_track,
-        role,
-        industry,
-        experience_band,
+        profile_context,
         critical_missing,
         core_missing,
         adjacent_missing,
     )
     base["salary_insight"] = build_salary_insight(
-        role_track=role_track,
-        role=role,
-        industry=industry,
+        context=profile_context,
         overall_score=blended_overall,
         confidence=blended_confidence,
-        seniority=seniority,
         experience_years=experience_years,
         selected_toggle_ids=salary_boost_toggles,
     )
@@ -5665,10 +6431,30 @@ RESUME_DROP_PREFIX_LINES = {
 }
 
 
+RESUME_DROP_BRACKETS_RE = re.compile(r"[\[\]\(\)\{\}]+")
+NON_ALNUM_RUN_RE = re.compile(r"[^a-zA-Z0-9]+")
+BLANK_LINE_RUN_RE = re.compile(r"\n{3,}")
+
+
+class CharTranslation(dict):
+    def __init__(self, allowed: str, replacement: str | None) -> None:
+        super().__init__((ord(char), ord(char)) for char in allowed)
+        self.replacement = replacement
+
+    def __missing__(self, codepoint: int) -> str | None:
+        self[codepoint] = self.replacement
+        return self.replacement
+
+
+SECTION_KEY_TRANSLATION = CharTranslation(string.ascii_lowercase + string.digits, " ")
+HEADING_COMPACT_TRANSLATION = CharTranslation(string.ascii_letters + string.digits + " ", None)
+DOWNLOAD_NAME_TRANSLATION = CharTranslation(string.ascii_letters + string.digits + "._-", "\0")
+
+
 def normalize_resume_drop_text(value: str) -> str:
     cleaned = safe_text(value)
-    cleaned = re.sub(r"[\[\]\(\)\{\}]+", " ", cleaned)
-    cleaned = re.sub(r"[^a-zA-Z0-9]+", " ", cleaned).strip().lower()
+    cleaned = RESUME_DROP_BRACKETS_RE.sub(" ", cleaned)
+    cleaned = NON_ALNUM_RUN_RE.sub(" ", cleaned).strip().lower()
     return cleaned
 
 
@@ -5678,9 +6464,9 @@ def should_drop_resume_line(value: str) -> bool:
         return False
     if normalized in RESUME_DROP_EXACT_LINES:
         return True
-    words_count = len(normalized.split())
     for blocked_prefix in RESUME_DROP_PREFIX_LINES:
-        if normalized.startswith(f"{blocked_prefix} ") and words_count <= 7:
+        # Only the prefix rule depends on length, so count words just for lines that match it.
+        if normalized.startswith(f"{blocked_prefix} ") and len(normalized.split()) <= 7:
             return True
     return False
 
@@ -5690,17 +6476,22 @@ def sanitize_resume_output(text: str) -> str:
     if not normalized_text:
         return ""
 
-    lines = normalized_text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
     filtered_lines: list[str] = []
-    for raw_line in lines:
+    previous_blank = False
+    for raw_line in normalized_text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        if not raw_line:
+            # Keep paragraph spacing readable while removing excessive empty lines.
+            if previous_blank:
+                continue
+            previous_blank = True
+            filtered_lines.append(raw_line)
+            continue
         if should_drop_resume_line(raw_line):
             continue
+        previous_blank = False
         filtered_lines.append(raw_line)
 
-    # Keep paragraph spacing readable while removing excessive empty lines.
-    cleaned = "\n".join(filtered_lines)
-    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
-    return cleaned.strip()
+    return "\n".join(filtered_lines).strip()
 
 
 def extract_llm_text(message_content: Any) -> str:
@@ -5728,8 +6519,73 @@ def extract_llm_text(message_content: Any) -> str:
     return safe_text(message_content)
 
 
+TRANSIENT_OPENAI_ERROR_NAMES = frozenset({"APIConnectionError", "APITimeoutError", "InternalServerError"})
+
+
 def is_transient_openai_error(exc: Exception) -> bool:
-    return type(exc).__name__ in {"APIConnectionError", "APITimeoutError", "InternalServerError"}
+    return type(exc).__name__ in TRANSIENT_OPENAI_ERROR_NAMES
+
+
+LLM_RESPONSE_CACHE: OrderedDict[bytes, str] = OrderedDict()
+LLM_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def llm_response_cache_key(system_prompt: str, user_prompt: str, temperature: float, models: list[str]) -> bytes:
+    material = "\x00".join([system_prompt, user_prompt, f"{temperature:.3f}", ",".join(models)])
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=16).digest()
+
+
+def fetch_cached_llm_response(cache_key: bytes) -> str | None:
+    if LLM_RESPONSE_CACHE_SIZE <= 0:
+        return None
+    with LLM_RESPONSE_CACHE_LOCK:
+        content = LLM_RESPONSE_CACHE.get(cache_key)
+        if content is not None:
+            LLM_RESPONSE_CACHE.move_to_end(cache_key)
+        return content
+
+
+def store_cached_llm_response(cache_key: bytes, content: str) -> None:
+    if LLM_RESPONSE_CACHE_SIZE <= 0:
+        return
+    with LLM_RESPONSE_CACHE_LOCK:
+        LLM_RESPONSE_CACHE[cache_key] = content
+        LLM_RESPONSE_CACHE.move_to_end(cache_key)
+        while len(LLM_RESPONSE_CACHE) > LLM_RESPONSE_CACHE_SIZE:
+            LLM_RESPONSE_CACHE.popitem(last=False)
+
+
+def request_llm_completion(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+) -> tuple[str, str | None]:
+    last_error: str | None = None
+    for attempt in range(3):
+        try:
+            response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=temperature,
+            )
+            content = extract_llm_text(response.choices[0].message.content if response.choices else "")
+            if content:
+                return content, None
+            logger.error("OpenAI returned empty content for model '%s'.", model)
+            return "", f"empty response from model {model}"
+        except Exception as exc:
+            last_error = f"{type(exc).__name__} on model {model}"
+            logger.exception("OpenAI request failed for model '%s' (attempt %s).", model, attempt + 1)
+
+            if attempt < 2 and is_transient_openai_error(exc):
+                time.sleep(0.35 * (attempt + 1))
+                continue
+            break
+    return "", last_error
 
 
 def generate_with_llm(
@@ -5746,32 +6602,37 @@ def generate_with_llm(
         if model and model not in models:
             models.append(model)
 
-    last_error: str | None = None
-    for model in models:
-        for attempt in range(3):
-            try:
-                response = client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    temperature=temperature,
-                )
-                content = extract_llm_text(response.choices[0].message.content if response.choices else "")
-                if content:
-                    return content, True, None
-                last_error = f"empty response from model {model}"
-                logger.error("OpenAI returned empty content for model '%s'.", model)
-                break
-            except Exception as exc:
-                last_error = f"{type(exc).__name__} on model {model}"
-                logger.exception("OpenAI request failed for model '%s' (attempt %s).", model, attempt + 1)
+    cache_key = llm_response_cache_key(system_prompt, user_prompt, temperature, models)
+    cached_content = fetch_cached_llm_response(cache_key)
+    if cached_content:
+        return cached_content, True, None
 
-                if attempt < 2 and is_transient_openai_error(exc):
-                    time.sleep(0.35 * (attempt + 1))
-                    continue
-                break
+    last_error: str | None = None
+    if LLM_HEDGE_EXECUTOR is None or len(models) < 2:
+        for model in models:
+            content, last_error = request_llm_completion(model, system_prompt, user_prompt, temperature)
+            if content:
+                store_cached_llm_response(cache_key, content)
+                return content, True, None
+        return fallback_text, False, last_error
+
+    # Hedged fan-out: the next model starts when the previous one fails or is still running after the hedge delay.
+    remaining = list(models)
+    pending: set[Future] = set()
+    while remaining or pending:
+        if remaining:
+            pending.add(LLM_HEDGE_EXECUTOR.submit(request_llm_completion, remaining.pop(0), system_prompt, user_prompt, temperature))
+        done, pending = wait(pending, timeout=OPENAI_HEDGE_DELAY_SECONDS if remaining else None, return_when=FIRST_COMPLETED)
+        for future in done:
+            content, error = future.result()
+            if content:
+                # cancel() only drops hedges that have not started; a request already in flight keeps its worker
+                # (and is billed) until it finishes or hits OPENAI_REQUEST_TIMEOUT_SECONDS.
+                for straggler in pending:
+                    straggler.cancel()
+                store_cached_llm_response(cache_key, content)
+                return content, True, None
+            last_error = error
 
     return fallback_text, False, last_error
 
@@ -5824,7 +6685,7 @@ Instructions:
     )
     improved_resume = sanitize_resume_output(improved_resume)
 
-    post_analysis = analyze_profile(data.industry, data.role, improved_resume)
+    post_scores = score_profile(data.industry, data.role, improved_resume)
 
     return {
         "stage": "improvise",
@@ -5832,10 +6693,10 @@ Instructions:
         "improvisation_notes": suggestions["priority_actions"][:4],
         "pre_improvement_score": analysis["overall_score"],
         "post_improvement_estimate": {
-            "overall_score": post_analysis["overall_score"],
-            "skill_match": post_analysis["skill_match"],
-            "ats_friendliness": post_analysis["ats_friendliness"],
-            "shortlist_prediction": post_analysis["shortlist_prediction"],
+            "overall_score": post_scores.overall_score,
+            "skill_match": post_scores.skill_match_score,
+            "ats_friendliness": post_scores.profile_score,
+            "shortlist_prediction": build_shortlist_prediction(post_scores.overall_score),
         },
         "ai_generated": ai_generated,
         "ai_error": ai_error,
@@ -5846,7 +6707,8 @@ def sanitize_download_name(value: str | None) -> str:
     cleaned = safe_text(value)
     if cleaned and should_drop_resume_line(cleaned):
         cleaned = ""
-    base = re.sub(r"[^a-zA-Z0-9._-]+", "-", cleaned or "resume").strip("-").lower()
+    translated = (cleaned or "resume").translate(DOWNLOAD_NAME_TRANSLATION)
+    base = "-".join(part for part in translated.split("\0") if part).strip("-").lower()
     return base or "resume"
 
 
@@ -5877,8 +6739,10 @@ RESUME_SECTION_ALIASES = {
     "languages": "languages",
     "interests": "interests",
 }
+RESUME_SECTION_KEYS = frozenset(RESUME_SECTION_ALIASES.values())
+DATED_RESUME_SECTION_KEYS = frozenset({"experience", "projects"})
 
-RESUME_SECTION_ORDER = [
+RESUME_SECTION_ORDER = (
     "summary",
     "skills",
     "experience",
@@ -5888,7 +6752,7 @@ RESUME_SECTION_ORDER = [
     "achievements",
     "languages",
     "interests",
-]
+)
 
 RESUME_SECTION_TITLES = {
     "summary": "Professional Summary",
@@ -5902,6 +6766,12 @@ RESUME_SECTION_TITLES = {
     "interests": "Interests",
 }
 
+
+def resume_section_title(section_key: str) -> str:
+    title = RESUME_SECTION_TITLES.get(section_key)
+    return title if title is not None else section_key.replace("_", " ").title()
+
+
 RESUME_PLACEHOLDER_NAMES = {
     "candidate",
     "candidate name",
@@ -5914,8 +6784,14 @@ RESUME_PLACEHOLDER_NAMES = {
 }
 
 
+CONTACT_PHONE_RE = re.compile(r"\+?\d[\d\-\s]{7,}")
+MARKDOWN_EMPHASIS_RE = re.compile(r"[*_`]+")
+RESUME_NAME_NOISE_RE = re.compile(r"\b(resume|curriculum vitae|professional summary|profile)\b")
+DIGIT_RUN_RE = re.compile(r"\d{3,}")
+
+
 def normalize_resume_section_key(value: str) -> str:
-    normalized = re.sub(r"[^a-z0-9]+", " ", safe_text(value).lower()).strip()
+    normalized = " ".join(safe_text(value).lower().translate(SECTION_KEY_TRANSLATION).split())
     if normalized in RESUME_SECTION_ALIASES:
         return RESUME_SECTION_ALIASES[normalized]
     return normalized or "summary"
@@ -5926,9 +6802,9 @@ def looks_like_resume_heading(line: str) -> bool:
     if not raw:
         return False
     normalized = normalize_resume_section_key(raw)
-    if normalized in RESUME_SECTION_ALIASES.values():
+    if normalized in RESUME_SECTION_KEYS:
         return True
-    compact = re.sub(r"[^a-zA-Z0-9 ]+", "", raw).strip()
+    compact = raw.translate(HEADING_COMPACT_TRANSLATION).strip()
     if not compact:
         return False
     if compact.isupper() and 2 <= len(compact) <= 45 and len(compact.split()) <= 5:
@@ -5937,14 +6813,13 @@ def looks_like_resume_heading(line: str) -> bool:
 
 
 def looks_like_contact_line(line: str) -> bool:
-    text = safe_text(line).lower()
-    return bool(
-        "@" in text
-        or "linkedin" in text
-        or "github" in text
-        or "|" in text
-        or re.search(r"\+?\d[\d\-\s]{7,}", text)
-    )
+    text = safe_text(line)
+    if not text:
+        return False
+    if "@" in text or "|" in text:
+        return True
+    lowered = text.lower()
+    return bool("linkedin" in lowered or "github" in lowered or CONTACT_PHONE_RE.search(text))
 
 
 def is_placeholder_candidate_name(value: str) -> bool:
@@ -5960,7 +6835,7 @@ def is_placeholder_candidate_name(value: str) -> bool:
 
 def infer_candidate_name_from_resume_lines(lines: list[str]) -> str:
     for raw_line in lines[:10]:
-        line = clean_resume_line(re.sub(r"[*_`]+", "", safe_text(raw_line)))
+        line = clean_resume_line(MARKDOWN_EMPHASIS_RE.sub("", safe_text(raw_line)))
         if not line:
             continue
         if should_drop_resume_line(line):
@@ -5975,9 +6850,9 @@ def infer_candidate_name_from_resume_lines(lines: list[str]) -> str:
             continue
         if len(line.split()) > 6:
             continue
-        if re.search(r"\b(resume|curriculum vitae|professional summary|profile)\b", line.lower()):
+        if RESUME_NAME_NOISE_RE.search(line.lower()):
             continue
-        if re.search(r"\d{3,}", line):
+        if DIGIT_RUN_RE.search(line):
             continue
         return line
     return ""
@@ -5986,14 +6861,18 @@ def infer_candidate_name_from_resume_lines(lines: list[str]) -> str:
 BULLET_PREFIX_RE = re.compile(r"^(?:[-*•]\s+|\d{1,2}[\).]\s+)")
 INLINE_BOLD_RE = re.compile(r"(\*\*|__)(.+?)\1")
 INLINE_ITALIC_RE = re.compile(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)")
+MARKDOWN_HEADING_RE = re.compile(r"^(?:#+\s*)+")
+MULTI_SPACE_RE = re.compile(r"[ ]{2,}")
+YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+META_NOTE_PREFIX_RE = re.compile(r"^(location|email|phone|linkedin|github)\b")
 
 
 def clean_resume_line(line: str) -> str:
     text = safe_text(line).replace("\t", " ").strip()
     if not text:
         return ""
-    text = re.sub(r"^#+\s*", "", text)
-    text = re.sub(r"[ ]{2,}", " ", text).strip()
+    text = MARKDOWN_HEADING_RE.sub("", text)
+    text = MULTI_SPACE_RE.sub(" ", text).strip()
     return text
 
 
@@ -6005,23 +6884,34 @@ def strip_bullet_prefix(line: str) -> str:
     return BULLET_PREFIX_RE.sub("", clean_resume_line(line)).strip()
 
 
+def inline_bold_html(match: re.Match[str]) -> str:
+    return f"<b>{match.group(2).strip()}</b>"
+
+
+def inline_italic_html(match: re.Match[str]) -> str:
+    return f"<i>{match.group(1).strip()}</i>"
+
+
+def inline_markup_html(text: str) -> str:
+    escaped = html.escape(text)
+    escaped = INLINE_BOLD_RE.sub(inline_bold_html, escaped)
+    return INLINE_ITALIC_RE.sub(inline_italic_html, escaped)
+
+
 def resume_inline_html(line: str) -> str:
     raw = clean_resume_line(line)
     if not raw:
         return ""
-    escaped = html.escape(raw)
-    escaped = INLINE_BOLD_RE.sub(lambda match: f"<b>{match.group(2).strip()}</b>", escaped)
-    escaped = INLINE_ITALIC_RE.sub(lambda match: f"<i>{match.group(1).strip()}</i>", escaped)
-    return escaped
+    return inline_markup_html(raw)
 
 
 def looks_like_role_heading_line(section_key: str, line: str) -> bool:
-    text = clean_resume_line(re.sub(r"[*_`]+", "", safe_text(line)))
+    text = clean_resume_line(MARKDOWN_EMPHASIS_RE.sub("", safe_text(line)))
     if not text or len(text) > 130:
         return False
-    if section_key not in {"experience", "projects"}:
+    if section_key not in DATED_RESUME_SECTION_KEYS:
         return False
-    if re.search(r"\b(19|20)\d{2}\b", text) and ("|" in text or "—" in text or " - " in text):
+    if YEAR_RE.search(text) and ("|" in text or "—" in text or " - " in text):
         return True
     if "—" in text and len(text.split()) <= 18:
         return True
@@ -6031,19 +6921,18 @@ def looks_like_role_heading_line(section_key: str, line: str) -> bool:
 
 
 def looks_like_meta_note_line(section_key: str, line: str) -> bool:
-    text = clean_resume_line(re.sub(r"[*_`]+", "", safe_text(line)))
+    text = clean_resume_line(MARKDOWN_EMPHASIS_RE.sub("", safe_text(line)))
     if not text or len(text) > 120:
         return False
-    if section_key in {"experience", "projects"} and re.search(r"\b(19|20)\d{2}\b", text):
+    if section_key in DATED_RESUME_SECTION_KEYS and YEAR_RE.search(text):
         return True
-    if re.match(r"^(location|email|phone|linkedin|github)\b", text.lower()):
+    if META_NOTE_PREFIX_RE.match(text.lower()):
         return True
     return False
 
 
 def parse_resume_sections(name: str, resume_text: str) -> dict[str, Any]:
-    raw_lines = [clean_resume_line(line) for line in resume_text.replace("\r", "\n").split("\n")]
-    lines = [line for line in raw_lines if line]
+    lines = [line for raw_line in resume_text.replace("\r", "\n").split("\n") if (line := clean_resume_line(raw_line))]
 
     guessed_name = safe_text(name)
     if is_placeholder_candidate_name(guessed_name) or should_drop_resume_line(guessed_name):
@@ -6051,46 +6940,39 @@ def parse_resume_sections(name: str, resume_text: str) -> dict[str, Any]:
     if not guessed_name:
         guessed_name = infer_candidate_name_from_resume_lines(lines)
 
-    sections: dict[str, list[str]] = {}
+    sections: defaultdict[str, list[str]] = defaultdict(list)
     contact_lines: list[str] = []
     current = "summary"
-    seen_heading = False
+    contact_scan_open = True
 
-    for index, line in enumerate(lines):
-        normalized_line = clean_resume_line(line)
-        if not normalized_line:
-            continue
+    for index, normalized_line in enumerate(lines):
         if should_drop_resume_line(normalized_line):
             continue
         if index == 0 and guessed_name and normalized_line.lower() == guessed_name.lower():
             continue
 
         if looks_like_resume_heading(normalized_line):
-            current = normalize_resume_section_key(re.sub(r"[*_`]+", "", normalized_line).strip(":"))
+            current = normalize_resume_section_key(MARKDOWN_EMPHASIS_RE.sub("", normalized_line).strip(":"))
             if current == "meta_ignore":
                 current = "summary"
                 continue
             sections.setdefault(current, [])
-            seen_heading = True
+            contact_scan_open = False
             continue
 
-        if (not seen_heading) and len(contact_lines) < 3 and looks_like_contact_line(normalized_line):
+        if contact_scan_open and looks_like_contact_line(normalized_line):
             contact_lines.append(normalized_line)
+            contact_scan_open = len(contact_lines) < 3
             continue
 
-        sections.setdefault(current, []).append(normalized_line)
+        sections[current].append(normalized_line)
 
-    cleaned_sections: dict[str, list[str]] = {}
-    for key, value in sections.items():
-        lines_clean = [safe_text(line) for line in value if safe_text(line)]
-        if lines_clean:
-            cleaned_sections[key] = lines_clean
+    cleaned_sections: dict[str, list[str]] = {key: value for key, value in sections.items() if value}
 
     if not cleaned_sections:
         cleaned_sections = {"summary": [safe_text(resume_text) or "Resume content not provided."]}
 
-    ordered_keys = [key for key in RESUME_SECTION_ORDER if key in cleaned_sections]
-    ordered_keys += [key for key in cleaned_sections if key not in ordered_keys]
+    ordered_keys = list(dict.fromkeys(chain((key for key in RESUME_SECTION_ORDER if key in cleaned_sections), cleaned_sections)))
 
     headline = ""
     summary_lines = cleaned_sections.get("summary", [])
@@ -6115,7 +6997,7 @@ def coerce_resume_layout_payload(payload: dict[str, Any]) -> dict[str, Any] | No
         return None
 
     sections_raw = payload.get("sections")
-    collected: dict[str, list[str]] = {}
+    collected: defaultdict[str, list[str]] = defaultdict(list)
 
     if isinstance(sections_raw, dict):
         iterator = [{"key": key, "lines": value} for key, value in sections_raw.items()]
@@ -6144,13 +7026,12 @@ def coerce_resume_layout_payload(payload: dict[str, Any]) -> dict[str, Any] | No
 
         cleaned = [line for line in lines if line and not should_drop_resume_line(line)]
         if cleaned:
-            collected.setdefault(key, []).extend(cleaned[:32])
+            collected[key].extend(cleaned[:32])
 
     if not collected:
         return None
 
-    ordered_keys = [key for key in RESUME_SECTION_ORDER if key in collected]
-    ordered_keys += [key for key in collected if key not in ordered_keys]
+    ordered_keys = list(dict.fromkeys(chain((key for key in RESUME_SECTION_ORDER if key in collected), collected)))
     sections = [(key, collected[key][:40]) for key in ordered_keys]
 
     parsed_name = clean_resume_line(safe_text(payload.get("name")))
@@ -6250,90 +7131,113 @@ Output schema:
     return deterministic
 
 
+TEMPLATE_PALETTES: dict[str, dict[str, colors.Color]] = {
+    "minimal": {
+        "name": colors.HexColor("#102A3E"),
+        "accent": colors.HexColor("#2D6FA9"),
+        "accent_soft": colors.HexColor("#CFE2F2"),
+        "text": colors.HexColor("#1E3446"),
+        "muted": colors.HexColor("#607C8F"),
+        "line": colors.HexColor("#D8E7F1"),
+        "surface": colors.HexColor("#F5FAFE"),
+        "header_bg": colors.white,
+        "header_text": colors.HexColor("#102A3E"),
+        "footer_text": colors.HexColor("#698398"),
+        "highlight": colors.HexColor("#A7C9E5"),
+    },
+    "executive": {
+        "name": colors.HexColor("#101A2A"),
+        "accent": colors.HexColor("#1C2A3E"),
+        "accent_soft": colors.HexColor("#2A3A55"),
+        "text": colors.HexColor("#1C2634"),
+        "muted": colors.HexColor("#657487"),
+        "line": colors.HexColor("#CAD2DC"),
+        "surface": colors.HexColor("#F4F7FA"),
+        "header_bg": colors.HexColor("#162132"),
+        "header_text": colors.white,
+        "footer_text": colors.HexColor("#D6DEE7"),
+        "highlight": colors.HexColor("#DAB680"),
+    },
+    "quantum": {
+        "name": colors.HexColor("#083A59"),
+        "accent": colors.HexColor("#0B8AB5"),
+        "accent_soft": colors.HexColor("#BEE8F5"),
+        "text": colors.HexColor("#144760"),
+        "muted": colors.HexColor("#4E7489"),
+        "line": colors.HexColor("#BFDEEC"),
+        "surface": colors.HexColor("#ECF9FF"),
+        "header_bg": colors.HexColor("#E8F6FC"),
+        "header_text": colors.HexColor("#083A59"),
+        "footer_text": colors.HexColor("#4E7489"),
+        "highlight": colors.HexColor("#67D4F2"),
+    },
+    "dublin": {
+        "name": colors.HexColor("#2E3445"),
+        "accent": colors.HexColor("#0AA594"),
+        "accent_soft": colors.HexColor("#CBEDE8"),
+        "text": colors.HexColor("#2B3442"),
+        "muted": colors.HexColor("#6E7787"),
+        "line": colors.HexColor("#CFD9E4"),
+        "surface": colors.HexColor("#F8FBFD"),
+        "header_bg": colors.HexColor("#EDF5F8"),
+        "header_text": colors.HexColor("#2E3445"),
+        "footer_text": colors.HexColor("#6D7787"),
+        "highlight": colors.HexColor("#0AA594"),
+    },
+    "slate": {
+        "name": colors.HexColor("#333A42"),
+        "accent": colors.HexColor("#0A6D6D"),
+        "accent_soft": colors.HexColor("#CFE6E6"),
+        "text": colors.HexColor("#333A42"),
+        "muted": colors.HexColor("#66707A"),
+        "line": colors.HexColor("#CAD2D8"),
+        "surface": colors.HexColor("#F4F6F7"),
+        "header_bg": colors.HexColor("#0A6D6D"),
+        "header_text": colors.white,
+        "footer_text": colors.HexColor("#E4F4F4"),
+        "highlight": colors.HexColor("#0FB5B5"),
+    },
+    "metro": {
+        "name": colors.HexColor("#171D25"),
+        "accent": colors.HexColor("#456BB3"),
+        "accent_soft": colors.HexColor("#DDE4F4"),
+        "text": colors.HexColor("#2D3746"),
+        "muted": colors.HexColor("#5F6B7A"),
+        "line": colors.HexColor("#CFD6E0"),
+        "surface": colors.HexColor("#F7F8FA"),
+        "header_bg": colors.white,
+        "header_text": colors.HexColor("#171D25"),
+        "footer_text": colors.HexColor("#66707D"),
+        "highlight": colors.HexColor("#C77852"),
+    },
+}
+SLATE_PAGE_COLORS: dict[str, colors.Color] = {
+    "canvas": colors.HexColor("#EFEFEF"),
+    "canvas_rule": colors.HexColor("#C8CED3"),
+    "canvas_footer": colors.HexColor("#5E6B75"),
+    "headline": colors.HexColor("#0A8C90"),
+    "sidebar_glow": colors.Color(1, 1, 1, alpha=0.07),
+    "sidebar_rule": colors.Color(1, 1, 1, alpha=0.2),
+    "page_number": colors.Color(1, 1, 1, alpha=0.85),
+}
+ANALYSIS_REPORT_COLORS: dict[str, colors.Color] = {
+    "title": colors.HexColor("#0D2D47"),
+    "subtitle": colors.HexColor("#4A6A80"),
+    "section": colors.HexColor("#145B87"),
+    "body": colors.HexColor("#1E3F56"),
+    "metric_label": colors.HexColor("#0E2A43"),
+    "metric_value": colors.HexColor("#264B63"),
+    "surface": colors.HexColor("#F5FAFE"),
+    "box": colors.HexColor("#BFD9EC"),
+    "line": colors.HexColor("#D5E6F3"),
+}
+
+
 def template_palette(template_key: str) -> dict[str, colors.Color]:
-    palettes = {
-        "minimal": {
-            "name": colors.HexColor("#102A3E"),
-            "accent": colors.HexColor("#2D6FA9"),
-            "accent_soft": colors.HexColor("#CFE2F2"),
-            "text": colors.HexColor("#1E3446"),
-            "muted": colors.HexColor("#607C8F"),
-            "line": colors.HexColor("#D8E7F1"),
-            "surface": colors.HexColor("#F5FAFE"),
-            "header_bg": colors.white,
-            "header_text": colors.HexColor("#102A3E"),
-            "footer_text": colors.HexColor("#698398"),
-            "highlight": colors.HexColor("#A7C9E5"),
-        },
-        "executive": {
-            "name": colors.HexColor("#101A2A"),
-            "accent": colors.HexColor("#1C2A3E"),
-            "accent_soft": colors.HexColor("#2A3A55"),
-            "text": colors.HexColor("#1C2634"),
-            "muted": colors.HexColor("#657487"),
-            "line": colors.HexColor("#CAD2DC"),
-            "surface": colors.HexColor("#F4F7FA"),
-            "header_bg": colors.HexColor("#162132"),
-            "header_text": colors.white,
-            "footer_text": colors.HexColor("#D6DEE7"),
-            "highlight": colors.HexColor("#DAB680"),
-        },
-        "quantum": {
-            "name": colors.HexColor("#083A59"),
-            "accent": colors.HexColor("#0B8AB5"),
-            "accent_soft": colors.HexColor("#BEE8F5"),
-            "text": colors.HexColor("#144760"),
-            "muted": colors.HexColor("#4E7489"),
-            "line": colors.HexColor("#BFDEEC"),
-            "surface": colors.HexColor("#ECF9FF"),
-            "header_bg": colors.HexColor("#E8F6FC"),
-            "header_text": colors.HexColor("#083A59"),
-            "footer_text": colors.HexColor("#4E7489"),
-            "highlight": colors.HexColor("#67D4F2"),
-        },
-        "dublin": {
-            "name": colors.HexColor("#2E3445"),
-            "accent": colors.HexColor("#0AA594"),
-            "accent_soft": colors.HexColor("#CBEDE8"),
-            "text": colors.HexColor("#2B3442"),
-            "muted": colors.HexColor("#6E7787"),
-            "line": colors.HexColor("#CFD9E4"),
-            "surface": colors.HexColor("#F8FBFD"),
-            "header_bg": colors.HexColor("#EDF5F8"),
-            "header_text": colors.HexColor("#2E3445"),
-            "footer_text": colors.HexColor("#6D7787"),
-            "highlight": colors.HexColor("#0AA594"),
-        },
-        "slate": {
-            "name": colors.HexColor("#333A42"),
-            "accent": colors.HexColor("#0A6D6D"),
-            "accent_soft": colors.HexColor("#CFE6E6"),
-            "text": colors.HexColor("#333A42"),
-            "muted": colors.HexColor("#66707A"),
-            "line": colors.HexColor("#CAD2D8"),
-            "surface": colors.HexColor("#F4F6F7"),
-            "header_bg": colors.HexColor("#0A6D6D"),
-            "header_text": colors.white,
-            "footer_text": colors.HexColor("#E4F4F4"),
-            "highlight": colors.HexColor("#0FB5B5"),
-        },
-        "metro": {
-            "name": colors.HexColor("#171D25"),
-            "accent": colors.HexColor("#456BB3"),
-            "accent_soft": colors.HexColor("#DDE4F4"),
-            "text": colors.HexColor("#2D3746"),
-            "muted": colors.HexColor("#5F6B7A"),
-            "line": colors.HexColor("#CFD6E0"),
-            "surface": colors.HexColor("#F7F8FA"),
-            "header_bg": colors.white,
-            "header_text": colors.HexColor("#171D25"),
-            "footer_text": colors.HexColor("#66707D"),
-            "highlight": colors.HexColor("#C77852"),
-        },
-    }
-    return palettes.get(template_key, palettes["minimal"])
+    return TEMPLATE_PALETTES.get(template_key, TEMPLATE_PALETTES["minimal"])
 
 
+@lru_cache(maxsize=8)
 def build_pdf_styles(template_key: str) -> dict[str, ParagraphStyle]:
     sample = getSampleStyleSheet()
     palette = template_palette(template_key)
@@ -6486,116 +7390,174 @@ def build_pdf_styles(template_key: str) -> dict[str, ParagraphStyle]:
     return styles
 
 
+@lru_cache(maxsize=8)
+def section_header_table_style(template_key: str) -> TableStyle:
+    palette = template_palette(template_key)
+    if template_key == "executive":
+        return TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (0, -1), palette["highlight"]),
+                ("BACKGROUND", (1, 0), (1, -1), palette["accent"]),
+                ("TEXTCOLOR", (1, 0), (1, -1), colors.white),
+                ("LEFTPADDING", (1, 0), (1, -1), 8),
+                ("RIGHTPADDING", (1, 0), (1, -1), 8),
+                ("TOPPADDING", (1, 0), (1, -1), 5.2),
+                ("BOTTOMPADDING", (1, 0), (1, -1), 4.2),
+                ("BOX", (0, 0), (-1, -1), 0.7, palette["line"]),
+            ]
+        )
+    if template_key == "quantum":
+        return TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (0, -1), palette["accent"]),
+                ("BACKGROUND", (1, 0), (1, -1), palette["surface"]),
+                ("LEFTPADDING", (1, 0), (1, -1), 8.5),
+                ("RIGHTPADDING", (1, 0), (1, -1), 8),
+                ("TOPPADDING", (1, 0), (1, -1), 4.6),
+                ("BOTTOMPADDING", (1, 0), (1, -1), 4.1),
+                ("BOX", (0, 0), (-1, -1), 0.75, palette["line"]),
+            ]
+        )
+    if template_key == "dublin":
+        return TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, -1), colors.white),
+                ("TEXTCOLOR", (0, 0), (-1, -1), palette["accent"]),
+                ("LEFTPADDING", (0, 0), (-1, -1), 0),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+                ("TOPPADDING", (0, 0), (-1, -1), 0),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 1.8),
+                ("LINEABOVE", (0, 0), (-1, -1), 0.7, palette["line"]),
+                ("LINEBELOW", (0, 0), (-1, -1), 0.7, palette["line"]),
+            ]
+        )
+    if template_key == "slate":
+        return TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, -1), colors.white),
+                ("LEFTPADDING", (0, 0), (-1, -1), 0),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+                ("TOPPADDING", (0, 0), (-1, -1), 0),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 1.6),
+                ("LINEBELOW", (0, 0), (-1, -1), 0.75, palette["line"]),
+            ]
+        )
+    if template_key == "metro":
+        return TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, -1), colors.white),
+                ("LEFTPADDING", (0, 0), (-1, -1), 0),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+                ("TOPPADDING", (0, 0), (-1, -1), 0),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 1.8),
+                ("LINEBELOW", (0, 0), (-1, -1), 0.72, palette["line"]),
+            ]
+        )
+    return TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (0, -1), palette["accent"]),
+            ("BACKGROUND", (1, 0), (1, -1), colors.white),
+            ("LEFTPADDING", (1, 0), (1, -1), 6),
+            ("RIGHTPADDING", (1, 0), (1, -1), 0),
+            ("TOPPADDING", (1, 0), (1, -1), 0),
+            ("BOTTOMPADDING", (1, 0), (1, -1), 2.1),
+            ("LINEBELOW", (1, 0), (1, -1), 0.72, palette["line"]),
+        ]
+    )
+
+
 def section_header_flowable(
     template_key: str,
     section_title: str,
     styles: dict[str, ParagraphStyle],
-    palette: dict[str, colors.Color],
     width: float,
 ) -> Any:
-    title_html = html.escape(section_title.upper())
-    title_para = Paragraph(title_html, styles["section"])
+    title_para = Paragraph(html.escape(section_title.upper()), styles["section"])
 
     if template_key == "executive":
         table = Table([["", title_para]], colWidths=[7, width - 7])
-        table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (0, -1), palette["highlight"]),
-                    ("BACKGROUND", (1, 0), (1, -1), palette["accent"]),
-                    ("TEXTCOLOR", (1, 0), (1, -1), colors.white),
-                    ("LEFTPADDING", (1, 0), (1, -1), 8),
-                    ("RIGHTPADDING", (1, 0), (1, -1), 8),
-                    ("TOPPADDING", (1, 0), (1, -1), 5.2),
-                    ("BOTTOMPADDING", (1, 0), (1, -1), 4.2),
-                    ("BOX", (0, 0), (-1, -1), 0.7, palette["line"]),
-                ]
-            )
-        )
-        return table
-
-    if template_key == "quantum":
+    elif template_key == "quantum":
         table = Table([["", title_para]], colWidths=[11, width - 11])
-        table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (0, -1), palette["accent"]),
-                    ("BACKGROUND", (1, 0), (1, -1), palette["surface"]),
-                    ("LEFTPADDING", (1, 0), (1, -1), 8.5),
-                    ("RIGHTPADDING", (1, 0), (1, -1), 8),
-                    ("TOPPADDING", (1, 0), (1, -1), 4.6),
-                    ("BOTTOMPADDING", (1, 0), (1, -1), 4.1),
-                    ("BOX", (0, 0), (-1, -1), 0.75, palette["line"]),
-                ]
-            )
-        )
-        return table
+    elif template_key in {"dublin", "slate", "metro"}:
+        table = Table([[title_para]], colWidths=[width])
+    else:
+        table = Table([["", title_para]], colWidths=[4.5, width - 4.5])
+    table.setStyle(section_header_table_style(template_key))
+    return table
 
+
+@lru_cache(maxsize=8)
+def resume_header_table_style(template_key: str) -> TableStyle:
+    palette = template_palette(template_key)
     if template_key == "dublin":
-        table = Table([[Paragraph(html.escape(section_title.upper()), styles["section"])]], colWidths=[width])
-        table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), colors.white),
-                    ("TEXTCOLOR", (0, 0), (-1, -1), palette["accent"]),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 0),
-                    ("TOPPADDING", (0, 0), (-1, -1), 0),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 1.8),
-                    ("LINEABOVE", (0, 0), (-1, -1), 0.7, palette["line"]),
-                    ("LINEBELOW", (0, 0), (-1, -1), 0.7, palette["line"]),
-                ]
-            )
+        return TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, -1), palette["header_bg"]),
+                ("BOX", (0, 0), (-1, -1), 0.8, palette["line"]),
+                ("LEFTPADDING", (0, 0), (-1, -1), 8),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 8),
+                ("TOPPADDING", (0, 0), (-1, -1), 7.5),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 6.8),
+                ("LINEBEFORE", (2, 0), (2, 0), 0.7, palette["line"]),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ]
         )
-        return table
-
-    if template_key == "slate":
-        table = Table([[Paragraph(html.escape(section_title.upper()), styles["section"])]], colWidths=[width])
-        table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), colors.white),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 0),
-                    ("TOPPADDING", (0, 0), (-1, -1), 0),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 1.6),
-                    ("LINEBELOW", (0, 0), (-1, -1), 0.75, palette["line"]),
-                ]
-            )
+    if template_key == "executive":
+        return TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, -1), palette["header_bg"]),
+                ("LEFTPADDING", (0, 0), (-1, -1), 10.5),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 10.5),
+                ("TOPPADDING", (0, 0), (-1, -1), 7),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 6.3),
+                ("BOX", (0, 0), (-1, -1), 0.8, palette["line"]),
+                ("LINEBELOW", (0, 0), (-1, -1), 0.55, colors.Color(1, 1, 1, alpha=0.28)),
+            ]
         )
-        return table
-
-    if template_key == "metro":
-        table = Table([[Paragraph(html.escape(section_title.upper()), styles["section"])]], colWidths=[width])
-        table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), colors.white),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 0),
-                    ("TOPPADDING", (0, 0), (-1, -1), 0),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 1.8),
-                    ("LINEBELOW", (0, 0), (-1, -1), 0.72, palette["line"]),
-                ]
-            )
+    if template_key == "quantum":
+        return TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (0, 0), colors.white),
+                ("BACKGROUND", (1, 0), (1, 0), palette["header_bg"]),
+                ("LEFTPADDING", (0, 0), (-1, -1), 9.5),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 9),
+                ("TOPPADDING", (0, 0), (-1, -1), 8),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 7.5),
+                ("BOX", (0, 0), (-1, -1), 0.8, palette["line"]),
+                ("LINEBEFORE", (1, 0), (1, 0), 0.8, palette["line"]),
+            ]
         )
-        return table
-
-    table = Table([["", Paragraph(html.escape(section_title.upper()), styles["section"])]], colWidths=[4.5, width - 4.5])
-    table.setStyle(
-        TableStyle(
+    if template_key == "metro":
+        return TableStyle(
             [
-                ("BACKGROUND", (0, 0), (0, -1), palette["accent"]),
-                ("BACKGROUND", (1, 0), (1, -1), colors.white),
-                ("LEFTPADDING", (1, 0), (1, -1), 6),
-                ("RIGHTPADDING", (1, 0), (1, -1), 0),
-                ("TOPPADDING", (1, 0), (1, -1), 0),
-                ("BOTTOMPADDING", (1, 0), (1, -1), 2.1),
-                ("LINEBELOW", (1, 0), (1, -1), 0.72, palette["line"]),
+                ("BACKGROUND", (0, 0), (-1, -1), colors.white),
+                ("LEFTPADDING", (0, 0), (-1, -1), 0),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+                ("TOPPADDING", (0, 0), (-1, -1), 0),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 4.8),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
             ]
         )
+    return TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (-1, -1), palette["surface"]),
+            ("LEFTPADDING", (0, 0), (-1, -1), 8),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 8),
+            ("TOPPADDING", (0, 0), (-1, -1), 5),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 4.6),
+            ("BOX", (0, 0), (-1, -1), 0.6, palette["line"]),
+        ]
     )
-    return table
+
+
+DUBLIN_PHOTO_CELL_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, -1), colors.white),
+        ("BOX", (0, 0), (-1, -1), 1.0, TEMPLATE_PALETTES["dublin"]["line"]),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ]
+)
 
 
 def draw_template_page_decoration(pdf: canvas.Canvas, doc: SimpleDocTemplate, template_key: str) -> None:
@@ -6635,11 +7597,11 @@ def draw_template_page_decoration(pdf: canvas.Canvas, doc: SimpleDocTemplate, te
         sidebar_width = width * 0.33
         pdf.setFillColor(palette["accent"])
         pdf.rect(width - sidebar_width, 0, sidebar_width, height, fill=1, stroke=0)
-        pdf.setFillColor(colors.Color(1, 1, 1, alpha=0.07))
+        pdf.setFillColor(SLATE_PAGE_COLORS["sidebar_glow"])
         pdf.rect(width - sidebar_width, height - 126, sidebar_width, 126, fill=1, stroke=0)
-        pdf.setFillColor(colors.HexColor("#EFEFEF"))
+        pdf.setFillColor(SLATE_PAGE_COLORS["canvas"])
         pdf.rect(0, 0, width - sidebar_width, height, fill=1, stroke=0)
-        pdf.setStrokeColor(colors.HexColor("#C8CED3"))
+        pdf.setStrokeColor(SLATE_PAGE_COLORS["canvas_rule"])
         pdf.setLineWidth(0.95)
         pdf.line(doc.leftMargin, height - 116, width - sidebar_width - 16, height - 116)
     elif template_key == "metro":
@@ -6665,11 +7627,11 @@ def draw_template_page_decoration(pdf: canvas.Canvas, doc: SimpleDocTemplate, te
     pdf.setFont("Helvetica", 8)
     if template_key == "slate":
         sidebar_width = width * 0.33
-        pdf.setFillColor(colors.Color(1, 1, 1, alpha=0.85))
+        pdf.setFillColor(SLATE_PAGE_COLORS["page_number"])
         pdf.drawRightString(width - 10, 11.2, f"Page {pdf.getPageNumber()}")
-        pdf.setFillColor(colors.HexColor("#5E6B75"))
+        pdf.setFillColor(SLATE_PAGE_COLORS["canvas_footer"])
         pdf.drawString(doc.leftMargin, 11.2, "HireScore Resume")
-        pdf.setStrokeColor(colors.Color(1, 1, 1, alpha=0.2))
+        pdf.setStrokeColor(SLATE_PAGE_COLORS["sidebar_rule"])
         pdf.line(width - sidebar_width + 10, 22.8, width - 10, 22.8)
     else:
         pdf.setFillColor(palette["footer_text"])
@@ -6685,34 +7647,42 @@ def append_resume_sections_to_story(
     palette: dict[str, colors.Color],
     section_width: float,
 ) -> None:
+    bullet_symbol = "▪" if template_key == "executive" else ("▸" if template_key == "quantum" else "•")
+    bullet_label = f"{bullet_symbol} "
     for section_key, lines in sections:
-        section_title = RESUME_SECTION_TITLES.get(section_key, section_key.replace("_", " ").title())
-        story.append(section_header_flowable(template_key, section_title, styles, palette, section_width))
+        section_title = resume_section_title(section_key)
+        story.append(section_header_flowable(template_key, section_title, styles, section_width))
         if template_key in {"minimal", "dublin", "slate", "metro"}:
             story.append(HRFlowable(width="100%", color=palette["line"], thickness=0.48, spaceBefore=0.8, spaceAfter=3.0))
         else:
             story.append(Spacer(1, 4.4))
 
-        for line in lines:
-            content = clean_resume_line(line)
-            if not content:
-                continue
-            if is_bullet_line(content):
-                bullet_text = resume_inline_html(strip_bullet_prefix(content))
-                bullet_symbol = "▪" if template_key == "executive" else ("▸" if template_key == "quantum" else "•")
-                story.append(Paragraph(bullet_text, styles["bullet"], bulletText=f"{bullet_symbol} "))
+        contents = [content for line in lines if (content := clean_resume_line(line))]
+        body_run: list[str] = []
+        for content in contents:
+            bullet_match = BULLET_PREFIX_RE.match(content)
+            if bullet_match:
+                bullet_text = resume_inline_html(content[bullet_match.end() :])
+                paragraph = Paragraph(bullet_text, styles["bullet"], bulletText=bullet_label)
             elif looks_like_role_heading_line(section_key, content):
-                story.append(Paragraph(resume_inline_html(content), styles["role_line"]))
+                paragraph = Paragraph(inline_markup_html(content), styles["role_line"])
             elif looks_like_meta_note_line(section_key, content):
-                story.append(Paragraph(resume_inline_html(content), styles["meta_line"]))
+                paragraph = Paragraph(inline_markup_html(content), styles["meta_line"])
             else:
-                story.append(Paragraph(resume_inline_html(content), styles["body"]))
+                body_run.append(inline_markup_html(content))
+                continue
+            if body_run:
+                story.append(Paragraph("<br/>".join(body_run), styles["body"]))
+                body_run = []
+            story.append(paragraph)
+        if body_run:
+            story.append(Paragraph("<br/>".join(body_run), styles["body"]))
 
         story.append(Spacer(1, 4.8 if template_key in {"dublin", "slate"} else (5 if template_key in {"minimal", "metro"} else 6.5)))
 
 
 def wrap_canvas_text(pdf: canvas.Canvas, text: str, font_name: str, font_size: float, max_width: float) -> list[str]:
-    cleaned = re.sub(r"\s+", " ", safe_text(text)).strip()
+    cleaned = WHITESPACE_RUN_RE.sub(" ", safe_text(text)).strip()
     if not cleaned:
         return []
     words = cleaned.split(" ")
@@ -6763,7 +7733,7 @@ def collect_slate_sidebar_sections(parsed: dict[str, Any]) -> list[tuple[str, li
     blocks: list[tuple[str, list[str]]] = []
     for key in sidebar_order:
         lines = sections_map.get(key) or []
-        clipped = [safe_text(line) for line in lines if safe_text(line)][:14]
+        clipped = [cleaned for line in lines if (cleaned := safe_text(line))][:14]
         if clipped:
             blocks.append((key, clipped))
     return blocks
@@ -6796,7 +7766,7 @@ def draw_slate_sidebar_content(pdf: canvas.Canvas, parsed: dict[str, Any], sideb
     muted_color = colors.Color(1, 1, 1, alpha=0.78)
 
     for section_key, lines in sidebar_sections[:4]:
-        title = RESUME_SECTION_TITLES.get(section_key, section_key.replace("_", " ").title()).upper()
+        title = resume_section_title(section_key).upper()
         pdf.setFont("Helvetica-Bold", 10.8)
         pdf.setFillColor(heading_color)
         pdf.drawString(x, y, title)
@@ -6832,9 +7802,50 @@ def draw_slate_sidebar_content(pdf: canvas.Canvas, parsed: dict[str, Any], sideb
             return
 
 
-def render_resume_pdf_bytes(name: str, template: str, resume_text: str) -> bytes:
+RESUME_TEMPLATE_KEYS = frozenset({"minimal", "executive", "quantum", "dublin", "slate", "metro"})
+TEMPLATE_PAGE_DECORATIONS = {
+    template_key: partial(draw_template_page_decoration, template_key=template_key) for template_key in RESUME_TEMPLATE_KEYS
+}
+
+
+def prime_pdf_render_caches() -> None:
+    for template_key in RESUME_TEMPLATE_KEYS:
+        build_pdf_styles(template_key)
+        section_header_table_style(template_key)
+        resume_header_table_style(template_key)
+
+
+PDF_RENDER_POOL = (
+    ProcessPoolExecutor(
+        max_workers=PDF_RENDER_PROCESSES,
+        # Workers start lazily from an already multithreaded server, so never fork it directly.
+        mp_context=multiprocessing.get_context(
+            "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        ),
+        initializer=prime_pdf_render_caches,
+    )
+    if PDF_RENDER_PROCESSES > 0
+    else None
+)
+
+
+def pdf_download_response(pdf_buffer: io.BytesIO, filename: str, extra_headers: dict[str, str] | None = None) -> Response:
+    return Response(
+        content=pdf_buffer.getvalue(),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', **(extra_headers or {})},
+    )
+
+
+def run_in_pdf_pool(work: Any, *args: Any) -> Any:
+    if PDF_RENDER_POOL is None:
+        return work(*args)
+    return PDF_RENDER_POOL.submit(work, *args).result()
+
+
+def render_resume_pdf_buffer(name: str, template: str, resume_text: str) -> io.BytesIO:
     template_key = safe_text(template).lower() or "minimal"
-    if template_key not in {"minimal", "executive", "quantum", "dublin", "slate", "metro"}:
+    if template_key not in RESUME_TEMPLATE_KEYS:
         template_key = "minimal"
 
     sanitized_resume = sanitize_resume_output(resume_text)
@@ -6913,16 +7924,7 @@ def render_resume_pdf_bytes(name: str, template: str, resume_text: str) -> bytes
             name_lines.append(Paragraph(resume_inline_html(parsed["headline"]).upper(), styles["meta_line"]))
 
         profile_cell = Table([[Paragraph("PHOTO", styles["meta_line"])]], colWidths=[56], rowHeights=[56])
-        profile_cell.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), colors.white),
-                    ("BOX", (0, 0), (-1, -1), 1.0, palette["line"]),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ]
-            )
-        )
+        profile_cell.setStyle(DUBLIN_PHOTO_CELL_STYLE)
 
         right_lines: list[Any] = []
         if parsed["contact_line"]:
@@ -6933,20 +7935,7 @@ def render_resume_pdf_bytes(name: str, template: str, resume_text: str) -> bytes
             [[profile_cell, name_lines, right_lines]],
             colWidths=[66, doc.width * 0.51, doc.width * 0.29],
         )
-        header_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), palette["header_bg"]),
-                    ("BOX", (0, 0), (-1, -1), 0.8, palette["line"]),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 8),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 8),
-                    ("TOPPADDING", (0, 0), (-1, -1), 7.5),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 6.8),
-                    ("LINEBEFORE", (2, 0), (2, 0), 0.7, palette["line"]),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ]
-            )
-        )
+        header_table.setStyle(resume_header_table_style(template_key))
         story.append(header_table)
         story.append(Spacer(1, 8))
     elif template_key == "executive":
@@ -6961,19 +7950,7 @@ def render_resume_pdf_bytes(name: str, template: str, resume_text: str) -> bytes
 
         header_rows: list[list[Any]] = [[left_block, right_block]]
         header_table = Table(header_rows, colWidths=[doc.width * 0.62, doc.width * 0.38])
-        header_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), palette["header_bg"]),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 10.5),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 10.5),
-                    ("TOPPADDING", (0, 0), (-1, -1), 7),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 6.3),
-                    ("BOX", (0, 0), (-1, -1), 0.8, palette["line"]),
-                    ("LINEBELOW", (0, 0), (-1, -1), 0.55, colors.Color(1, 1, 1, alpha=0.28)),
-                ]
-            )
-        )
+        header_table.setStyle(resume_header_table_style(template_key))
         story.append(header_table)
         story.append(Spacer(1, 9))
     elif template_key == "quantum":
@@ -6991,20 +7968,7 @@ def render_resume_pdf_bytes(name: str, template: str, resume_text: str) -> bytes
             colWidths=[doc.width * 0.63, doc.width * 0.37],
             hAlign="LEFT",
         )
-        header_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (0, 0), colors.white),
-                    ("BACKGROUND", (1, 0), (1, 0), palette["header_bg"]),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 9.5),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 9),
-                    ("TOPPADDING", (0, 0), (-1, -1), 8),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 7.5),
-                    ("BOX", (0, 0), (-1, -1), 0.8, palette["line"]),
-                    ("LINEBEFORE", (1, 0), (1, 0), 0.8, palette["line"]),
-                ]
-            )
-        )
+        header_table.setStyle(resume_header_table_style(template_key))
         story.append(header_table)
         story.append(Spacer(1, 7.8))
     elif template_key == "slate":
@@ -7031,7 +7995,7 @@ def render_resume_pdf_bytes(name: str, template: str, resume_text: str) -> bytes
                         fontName="Helvetica",
                         fontSize=10.7,
                         leading=13.6,
-                        textColor=colors.HexColor("#0A8C90"),
+                        textColor=SLATE_PAGE_COLORS["headline"],
                         spaceAfter=3.5,
                     ),
                 )
@@ -7104,18 +8068,7 @@ def render_resume_pdf_bytes(name: str, template: str, resume_text: str) -> bytes
             right_lines.append(Paragraph("Metro Prime Resume", styles["meta_line"]))
 
         header_table = Table([[left_header, right_lines]], colWidths=[doc.width * 0.64, doc.width * 0.36])
-        header_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), colors.white),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 0),
-                    ("TOPPADDING", (0, 0), (-1, -1), 0),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 4.8),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ]
-            )
-        )
+        header_table.setStyle(resume_header_table_style(template_key))
         story.append(header_table)
         story.append(HRFlowable(width="100%", color=palette["line"], thickness=0.86, spaceBefore=0.8, spaceAfter=5.8))
     else:
@@ -7132,18 +8085,7 @@ def render_resume_pdf_bytes(name: str, template: str, resume_text: str) -> bytes
             surface_meta = f"{surface_meta} | {parsed['headline']}" if surface_meta else parsed["headline"]
         if surface_meta:
             meta_table = Table([[Paragraph(resume_inline_html(surface_meta), styles["meta_line"])]], colWidths=[doc.width])
-            meta_table.setStyle(
-                TableStyle(
-                    [
-                        ("BACKGROUND", (0, 0), (-1, -1), palette["surface"]),
-                        ("LEFTPADDING", (0, 0), (-1, -1), 8),
-                        ("RIGHTPADDING", (0, 0), (-1, -1), 8),
-                        ("TOPPADDING", (0, 0), (-1, -1), 5),
-                        ("BOTTOMPADDING", (0, 0), (-1, -1), 4.6),
-                        ("BOX", (0, 0), (-1, -1), 0.6, palette["line"]),
-                    ]
-                )
-            )
+            meta_table.setStyle(resume_header_table_style(template_key))
             story.append(meta_table)
             story.append(Spacer(1, 3.2))
         story.append(HRFlowable(width="100%", color=palette["line"], thickness=0.9, spaceBefore=1.5, spaceAfter=6.4))
@@ -7158,23 +8100,16 @@ def render_resume_pdf_bytes(name: str, template: str, resume_text: str) -> bytes
         append_resume_sections_to_story(story, template_key, parsed["sections"], styles, palette, doc.width)
 
     if template_key == "slate":
-        def _on_first(pdf: canvas.Canvas, page_doc: SimpleDocTemplate) -> None:
+        def _decorate_slate_page(pdf: canvas.Canvas, page_doc: SimpleDocTemplate) -> None:
             draw_template_page_decoration(pdf, page_doc, template_key)
             draw_slate_sidebar_content(pdf, parsed, sidebar_sections)
 
-        def _on_later(pdf: canvas.Canvas, page_doc: SimpleDocTemplate) -> None:
-            draw_template_page_decoration(pdf, page_doc, template_key)
-            draw_slate_sidebar_content(pdf, parsed, sidebar_sections)
-
-        doc.build(story, onFirstPage=_on_first, onLaterPages=_on_later)
+        doc.build(story, onFirstPage=_decorate_slate_page, onLaterPages=_decorate_slate_page)
     else:
-        doc.build(
-            story,
-            onFirstPage=lambda pdf, page_doc: draw_template_page_decoration(pdf, page_doc, template_key),
-            onLaterPages=lambda pdf, page_doc: draw_template_page_decoration(pdf, page_doc, template_key),
-        )
+        decorate_page = TEMPLATE_PAGE_DECORATIONS[template_key]
+        doc.build(story, onFirstPage=decorate_page, onLaterPages=decorate_page)
     output.seek(0)
-    return output.getvalue()
+    return output
 
 
 @app.get("/")
@@ -7254,7 +8189,7 @@ def request_signup_otp(data: SignupOtpRequest) -> dict[str, Any]:
 @app.post("/auth/signup/verify-otp")
 def verify_signup_otp(data: SignupOtpVerifyRequest) -> dict[str, Any]:
     email = normalize_email(data.email)
-    otp = re.sub(r"[^0-9]", "", safe_text(data.otp))
+    otp = NON_DIGIT_RE.sub("", safe_text(data.otp))
     if len(otp) < 4:
         raise HTTPException(status_code=400, detail="Enter a valid OTP.")
     try:
@@ -7330,7 +8265,7 @@ def request_password_reset_otp(data: ForgotPasswordRequest) -> dict[str, Any]:
 @app.post("/auth/forgot-password/reset")
 def reset_password_with_otp(data: ForgotPasswordResetRequest) -> dict[str, Any]:
     email = normalize_email(data.email)
-    otp = re.sub(r"[^0-9]", "", safe_text(data.otp))
+    otp = NON_DIGIT_RE.sub("", safe_text(data.otp))
     new_password = safe_text(data.new_password)
     if len(new_password) < 6:
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters.")
@@ -7366,7 +8301,7 @@ def user_analysis_reports(request: Request, auth_token: str | None = None, limit
 
 
 @app.get("/analysis/reports/{report_id}/download")
-def download_user_analysis_report(report_id: int, request: Request, auth_token: str | None = None) -> StreamingResponse:
+def download_user_analysis_report(report_id: int, request: Request, auth_token: str | None = None) -> Response:
     if report_id <= 0:
         raise HTTPException(status_code=400, detail="Invalid report id.")
     user = require_authenticated_user(request, auth_token)
@@ -7392,20 +8327,19 @@ def download_user_analysis_report(report_id: int, request: Request, auth_token:
         f"{safe_text(row['role']) or 'analysis'}-{safe_text(row['created_at'])[:10] or 'report'}-{report_id}"
     )
     try:
-        pdf_bytes = render_analysis_report_pdf_bytes(parsed_payload, row)
+        pdf_buffer = run_in_pdf_pool(render_analysis_report_pdf_buffer, parsed_payload, dict(row))
     except Exception as exc:
         logger.exception("Failed to render analysis report PDF for report_id=%s user_id=%s", report_id, user_id)
         raise HTTPException(status_code=500, detail="Unable to generate report PDF right now.") from exc
-    return StreamingResponse(
-        io.BytesIO(pdf_bytes),
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="{filename_base}.pdf"'},
-    )
+    return pdf_download_response(pdf_buffer, f"{filename_base}.pdf")
+
+
+LEAK_TRACE_ACTION_STRIP_RE = re.compile(r"[^a-z0-9_:-]")
 
 
 @app.post("/security/leak-trace")
 def security_leak_trace(data: SecurityLeakTraceRequest, request: Request) -> dict[str, Any]:
-    action = re.sub(r"[^a-z0-9_:-]", "", safe_text(data.action).lower())[:64] or "unknown"
+    action = LEAK_TRACE_ACTION_STRIP_RE.sub("", safe_text(data.action).lower())[:64] or "unknown"
     user_id: int | None = None
     try:
         user = require_authenticated_user(request, data.auth_token)
@@ -7432,12 +8366,14 @@ def auth_topup(data: TopupRequest, request: Request, auth_token: str | None = No
 
     credits = int(clamp_float(float(data.credits), 1.0, 5000.0))
     user = require_authenticated_user(request, auth_token)
-    topup = credit_credits(int(user["id"]), "manual_topup", credits, meta={"source": "api_topup"})
-    refreshed = fetch_user_by_id(int(user["id"]))
-    if not refreshed:
-        raise HTTPException(status_code=500, detail="Unable to refresh wallet.")
-    log_analytics_event("credits", "manual_topup", user_id=int(user["id"]), meta={"credits": credits})
-    payload = auth_response_payload(refreshed)
+    topup = credit_credits(
+        int(user["id"]),
+        "manual_topup",
+        credits,
+        meta={"source": "api_topup"},
+        event=analytics_event_row("credits", "manual_topup", user_id=int(user["id"]), meta={"credits": credits}),
+    )
+    payload = auth_response_payload(topup["user"])
     payload["wallet"] = topup["wallet"]
     payload["credit_transaction_id"] = topup["transaction_id"]
     return payload
@@ -7450,35 +8386,37 @@ def submit_feedback(data: FeedbackSubmitRequest, request: Request) -> dict[str,
     comment = safe_text(data.comment)
     if len(comment) < 4:
         raise HTTPException(status_code=400, detail="Please add a short feedback comment.")
+    source_txt = safe_text(data.source) or "post_analysis"
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            connection.execute(
-                """
-                INSERT INTO user_feedback (user_id, rating, comment, source, created_at)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    int(user["id"]),
-                    rating,
-                    comment,
-                    safe_text(data.source) or "post_analysis",
-                    now_utc_iso(),
-                ),
-            )
-            connection.commit()
-        finally:
-            connection.close()
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        cursor.execute(
+            """
+            INSERT INTO user_feedback (user_id, rating, comment, source, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (
+                int(user["id"]),
+                rating,
+                comment,
+                source_txt,
+                now_utc_iso(),
+            ),
+        )
+        refreshed = update_user_returning(cursor, "feedback_count = feedback_count + 1", (), int(user["id"]))
+        connection.commit()
+    finally:
+        connection.close()
 
     log_analytics_event(
         "feedback",
         "feedback_submitted",
         user_id=int(user["id"]),
-        meta={"rating": rating, "source": safe_text(data.source)},
+        meta={"rating": rating, "source": source_txt},
     )
     apply_feedback_learning_signal(int(user["id"]), rating)
-    refreshed = fetch_user_by_id(int(user["id"]))
     if not refreshed:
         raise HTTPException(status_code=500, detail="Unable to refresh account.")
     payload = auth_response_payload(refreshed)
@@ -7492,23 +8430,22 @@ def user_chat_messages(request: Request, auth_token: str | None = None, limit: i
     safe_limit = int(clamp_float(float(limit), 1, 400))
     user_id = int(user["id"])
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            messages = collect_chat_messages_for_user(connection, user_id, safe_limit)
-            cursor.execute(
-                """
-                UPDATE user_chat_messages
-                SET read_by_user = 1
-                WHERE user_id = ? AND sender_role = 'admin' AND read_by_user = 0
-                """,
-                (user_id,),
-            )
-            connection.commit()
-        finally:
-            connection.close()
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        messages = collect_chat_messages_for_user(connection, user_id, safe_limit)
+        cursor.execute(
+            """
+            UPDATE user_chat_messages
+            SET read_by_user = 1
+            WHERE user_id = ? AND sender_role = 'admin' AND read_by_user = 0
+            """,
+            (user_id,),
+        )
+        connection.commit()
+    finally:
+        connection.close()
 
     return {"messages": messages}
 
@@ -7520,22 +8457,21 @@ def user_chat_send_message(data: ChatMessageCreateRequest, request: Request) ->
     if len(message) < 2:
         raise HTTPException(status_code=400, detail="Please enter a longer message.")
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            saved = insert_chat_message(
-                connection=connection,
-                user_id=int(user["id"]),
-                sender_role="user",
-                message=message,
-                read_by_user=True,
-                read_by_admin=False,
-            )
-            connection.commit()
-        finally:
-            connection.close()
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        saved = insert_chat_message(
+            connection=connection,
+            user_id=int(user["id"]),
+            sender_role="user",
+            message=message,
+            read_by_user=True,
+            read_by_admin=False,
+        )
+        connection.commit()
+    finally:
+        connection.close()
 
     log_analytics_event("chat", "user_message_sent", user_id=int(user["id"]), meta={"chars": len(message)})
     return {"message": saved}
@@ -7561,43 +8497,79 @@ def payment_packages() -> dict[str, Any]:
     }
 
 
+RAZORPAY_API_HOST = "api.razorpay.com"
+RAZORPAY_HTTP_LOCAL = threading.local()
+
+
+def open_razorpay_connection() -> http.client.HTTPSConnection:
+    # http.client ignores HTTPS_PROXY/NO_PROXY on its own, so honour them the way urllib did and CONNECT-tunnel.
+    proxy_url = urllib.request.getproxies().get("https")
+    if not proxy_url or urllib.request.proxy_bypass(RAZORPAY_API_HOST):
+        return http.client.HTTPSConnection(RAZORPAY_API_HOST, timeout=20)
+    proxy = urllib.parse.urlsplit(proxy_url if "://" in proxy_url else f"http://{proxy_url}")
+    tunnel_headers: dict[str, str] = {}
+    if proxy.username:
+        credentials = f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password or '')}"
+        tunnel_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+    connection = http.client.HTTPSConnection(proxy.hostname, proxy.port or (443 if proxy.scheme == "https" else 80), timeout=20)
+    connection.set_tunnel(RAZORPAY_API_HOST, 443, headers=tunnel_headers)
+    return connection
+
+
+def razorpay_connection() -> http.client.HTTPSConnection:
+    connection = getattr(RAZORPAY_HTTP_LOCAL, "connection", None)
+    if connection is None:
+        connection = open_razorpay_connection()
+        RAZORPAY_HTTP_LOCAL.connection = connection
+    return connection
+
+
+def discard_razorpay_connection() -> None:
+    connection = getattr(RAZORPAY_HTTP_LOCAL, "connection", None)
+    RAZORPAY_HTTP_LOCAL.connection = None
+    if connection is not None:
+        connection.close()
+
+
 def razorpay_request(path: str, payload: dict[str, Any]) -> dict[str, Any]:
     if not RAZORPAY_ENABLED:
         raise HTTPException(status_code=503, detail="Razorpay is not configured yet.")
-    url = f"https://api.razorpay.com/v1/{path.lstrip('/')}"
-    basic_token = base64.b64encode(f"{RAZORPAY_KEY_ID}:{RAZORPAY_KEY_SECRET}".encode("utf-8")).decode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=json.dumps(payload).encode("utf-8"),
-        method="POST",
-        headers={
-            "Authorization": f"Basic {basic_token}",
-            "Content-Type": "application/json",
-        },
-    )
+    url_path = f"/v1/{path.lstrip('/')}"
+    body = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode("utf-8")
     try:
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            raw = resp.read().decode("utf-8", errors="ignore")
-            parsed = json.loads(raw or "{}")
-            if int(resp.getcode() or 0) >= 400:
-                raise HTTPException(status_code=502, detail="Razorpay rejected checkout request.")
-            return parsed
-    except urllib.error.HTTPError as exc:
-        details = ""
-        try:
-            details = exc.read().decode("utf-8", errors="ignore")
-        except Exception:
-            details = ""
-        logger.exception("Razorpay HTTP error on %s", path)
-        if details:
-            raise HTTPException(status_code=502, detail=f"Razorpay error: {details[:220]}") from exc
-        raise HTTPException(status_code=502, detail="Unable to initialize Razorpay checkout.") from exc
-    except urllib.error.URLError as exc:
-        logger.exception("Razorpay network error on %s", path)
-        raise HTTPException(status_code=502, detail="Unable to reach Razorpay right now. Please retry.") from exc
+        for attempt in range(2):
+            connection = razorpay_connection()
+            reused = connection.sock is not None
+            try:
+                connection.request("POST", url_path, body=body, headers=RAZORPAY_REQUEST_HEADERS)
+                resp = connection.getresponse()
+                raw = resp.read().decode("utf-8", errors="ignore")
+                break
+            except http.client.RemoteDisconnected:
+                # Only an idle kept-alive socket closed before any response byte is safe to replay; order creation
+                # is not idempotent, so resets mid-request or on a fresh connection are surfaced instead.
+                discard_razorpay_connection()
+                if attempt or not reused:
+                    raise
+            except Exception:
+                discard_razorpay_connection()
+                raise
+        if resp.status >= 400:
+            logger.error("Razorpay HTTP error %s on %s", resp.status, path)
+            if raw:
+                raise HTTPException(status_code=502, detail=f"Razorpay error: {raw[:220]}")
+            raise HTTPException(status_code=502, detail="Unable to initialize Razorpay checkout.")
+        if orjson is not None:
+            return orjson.loads(raw or "{}")
+        return json.loads(raw or "{}")
+    except HTTPException:
+        raise
     except TimeoutError as exc:
         logger.exception("Razorpay timeout on %s", path)
         raise HTTPException(status_code=502, detail="Razorpay timed out. Please retry.") from exc
+    except OSError as exc:
+        logger.exception("Razorpay network error on %s", path)
+        raise HTTPException(status_code=502, detail="Unable to reach Razorpay right now. Please retry.") from exc
     except Exception as exc:
         logger.exception("Unexpected Razorpay error on %s", path)
         raise HTTPException(status_code=502, detail="Unable to initialize Razorpay checkout.") from exc
@@ -7605,11 +8577,7 @@ def razorpay_request(path: str, payload: dict[str, Any]) -> dict[str, Any]:
 
 def razorpay_signature_valid(order_id: str, payment_id: str, signature: str) -> bool:
     payload = f"{safe_text(order_id)}|{safe_text(payment_id)}"
-    expected = hmac.new(
-        RAZORPAY_KEY_SECRET.encode("utf-8"),
-        payload.encode("utf-8"),
-        hashlib.sha256,
-    ).hexdigest()
+    expected = hmac.digest(RAZORPAY_KEY_SECRET_BYTES, payload.encode("utf-8"), "sha256").hex()
     return hmac.compare_digest(expected, safe_text(signature))
 
 
@@ -7688,36 +8656,32 @@ def create_payment_checkout(data: PaymentCheckoutRequest, request: Request) -> d
     if not order_id:
         raise HTTPException(status_code=502, detail="Razorpay did not return order id.")
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            cursor.execute(
-                """
-                INSERT INTO payment_orders
-                (gateway, order_id, user_id, package_id, credits, amount_inr, currency, status, created_at, meta_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    "razorpay",
-                    order_id,
-                    int(user["id"]),
-                    package_id,
-                    credits,
-                    amount_inr,
-                    "INR",
-                    "created",
-                    now_utc_iso(),
-                    json.dumps(
-                        {"receipt": receipt, "gateway_order_status": safe_text(order.get("status"))},
-                        separators=(",", ":"),
-                        sort_keys=True,
-                    ),
-                ),
-            )
-            connection.commit()
-        finally:
-            connection.close()
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        cursor.execute(
+            """
+            INSERT INTO payment_orders
+            (gateway, order_id, user_id, package_id, credits, amount_inr, currency, status, created_at, meta_json)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                "razorpay",
+                order_id,
+                int(user["id"]),
+                package_id,
+                credits,
+                amount_inr,
+                "INR",
+                "created",
+                now_utc_iso(),
+                meta_json_text({"receipt": receipt, "gateway_order_status": safe_text(order.get("status"))}),
+            ),
+        )
+        connection.commit()
+    finally:
+        connection.close()
 
     log_analytics_event(
         "payment",
@@ -7753,145 +8717,253 @@ def verify_razorpay_payment(data: RazorpayVerifyRequest, request: Request) -> di
 
     checkout_logged_meta: dict[str, Any] | None = None
     refreshed_user = None
-    with AUTH_DB_LOCK:
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        order_row = cursor.execute(
+            """
+            SELECT o.id, o.user_id, o.package_id, o.credits, o.amount_inr, o.status, o.payment_id,
+                   u.email, u.credits AS user_credits
+            FROM payment_orders o
+            JOIN users u ON u.id = o.user_id
+            WHERE o.gateway = 'razorpay' AND o.order_id = ?
+            LIMIT 1
+            """
+            + SQL_FOR_UPDATE,
+            (order_id,),
+        ).fetchone()
+        if not order_row:
+            connection.rollback()
+            raise HTTPException(status_code=404, detail="Payment order not found.")
+        if int(order_row["user_id"]) != int(user["id"]):
+            connection.rollback()
+            raise HTTPException(status_code=403, detail="This payment order belongs to a different user.")
+
+        status = safe_text(order_row["status"]).lower()
+        existing_payment_id = safe_text(order_row["payment_id"])
+        if status == "paid":
+            if existing_payment_id and existing_payment_id != payment_id:
+                connection.rollback()
+                raise HTTPException(status_code=409, detail="Payment already verified with a different payment id.")
+            refreshed_user = {"id": int(order_row["user_id"]), "email": order_row["email"], "credits": order_row["user_credits"]}
+            connection.rollback()
+        else:
+            duplicate = cursor.execute(
+                """
+                SELECT order_id FROM payment_orders
+                WHERE gateway = 'razorpay' AND payment_id = ? AND status = 'paid' AND order_id != ?
+                LIMIT 1
+                """,
+                (payment_id, order_id),
+            ).fetchone()
+            if duplicate:
+                connection.rollback()
+                raise HTTPException(status_code=409, detail="This payment id is already consumed.")
+
+            credits_delta = int(order_row["credits"])
+            updated_credits = int(order_row["user_credits"]) + credits_delta
+            package_id = safe_text(order_row["package_id"])
+            amount_inr = int(order_row["amount_inr"])
+            plan_tier = user_plan_from_package_id(package_id)
+            refreshed_user = update_user_returning(
+                cursor,
+                "credits = credits + ?, plan_tier = ?",
+                (credits_delta, plan_tier),
+                int(user["id"]),
+            )
+            cursor.execute(
+                """
+                INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, external_ref, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    int(user["id"]),
+                    "razorpay_credit_pack",
+                    credits_delta,
+                    updated_credits,
+                    meta_json_text(
+                        {
+                            "gateway": "razorpay",
+                            "order_id": order_id,
+                            "payment_id": payment_id,
+                            "package_id": package_id,
+                            "amount_inr": amount_inr,
+                        }
+                    ),
+                    payment_id,
+                    now_utc_iso(),
+                ),
+            )
+            cursor.execute(
+                """
+                UPDATE payment_orders
+                SET status = 'paid', payment_id = ?, signature = ?, verified_at = ?, meta_json = ?
+                WHERE id = ?
+                """,
+                (
+                    payment_id,
+                    signature,
+                    now_utc_iso(),
+                    RAZORPAY_FRONTEND_VERIFY_META_JSON,
+                    int(order_row["id"]),
+                ),
+            )
+            connection.commit()
+            updated_credits = int(refreshed_user["credits"]) if refreshed_user else updated_credits
+            checkout_logged_meta = {
+                "gateway": "razorpay",
+                "package_id": package_id,
+                "plan": plan_tier,
+                "credits": credits_delta,
+                "order_id": order_id,
+                "payment_id": payment_id,
+                "credits_after": updated_credits,
+            }
+    except DB_INTEGRITY_ERRORS as exc:
+        connection.rollback()
+        raise HTTPException(status_code=409, detail="This payment id is already consumed.") from exc
+    finally:
+        connection.close()
+
+    if checkout_logged_meta:
+        log_analytics_event(
+            "payment",
+            "checkout_completed",
+            user_id=int(user["id"]),
+            meta=checkout_logged_meta,
+        )
+        email_error = send_payment_success_email(
+            safe_text(str(user["email"])),
+            "razorpay",
+            safe_text(str(checkout_logged_meta.get("package_id", ""))),
+            int(checkout_logged_meta.get("credits") or 0),
+            int(checkout_logged_meta.get("credits_after") or 0),
+        )
+        if email_error:
+            logger.warning("Payment success email failed for user %s: %s", int(user["id"]), email_error)
+    if not refreshed_user:
+        refreshed_user = fetch_user_by_id(int(user["id"]))
+    if not refreshed_user:
+        raise HTTPException(status_code=500, detail="Unable to refresh wallet after payment.")
+    return {
+        "message": "Payment verified and credits added.",
+        "wallet": wallet_payload(int(refreshed_user["credits"])),
+        "provider": "razorpay",
+    }
+
+
+STRIPE_SEEN_SESSIONS: OrderedDict[str, float] = OrderedDict()
+STRIPE_SEEN_SESSIONS_LOCK = threading.Lock()
+
+
+def stripe_session_recently_processed(stripe_session_id: str) -> bool:
+    with STRIPE_SEEN_SESSIONS_LOCK:
+        seen_at = STRIPE_SEEN_SESSIONS.get(stripe_session_id)
+        if seen_at is None:
+            return False
+        if time.monotonic() - seen_at > STRIPE_SEEN_SESSION_TTL_SECONDS:
+            del STRIPE_SEEN_SESSIONS[stripe_session_id]
+            return False
+        return True
+
+
+def remember_stripe_session(stripe_session_id: str) -> None:
+    with STRIPE_SEEN_SESSIONS_LOCK:
+        STRIPE_SEEN_SESSIONS[stripe_session_id] = time.monotonic()
+        STRIPE_SEEN_SESSIONS.move_to_end(stripe_session_id)
+        while len(STRIPE_SEEN_SESSIONS) > STRIPE_SEEN_SESSIONS_MAX:
+            STRIPE_SEEN_SESSIONS.popitem(last=False)
+
+
+def apply_stripe_checkout_session(session: Any) -> None:
+    metadata = session.get("metadata") or {}
+    user_id = int(float(metadata.get("user_id") or 0))
+    credits = int(float(metadata.get("credits") or 0))
+    package_id = safe_text(metadata.get("package_id"))
+    stripe_session_id = safe_text(session.get("id"))
+    checkout_logged_meta: dict[str, Any] | None = None
+    user_email = ""
+    if user_id > 0 and credits > 0 and stripe_session_id:
+        if stripe_session_recently_processed(stripe_session_id):
+            return
         connection = auth_db_connection()
         try:
             cursor = connection.cursor()
             begin_write_transaction(cursor)
-            order_row = cursor.execute(
+            existing = cursor.execute(
                 """
-                SELECT id, user_id, package_id, credits, amount_inr, status, payment_id
-                FROM payment_orders
-                WHERE gateway = 'razorpay' AND order_id = ?
+                SELECT id FROM credit_transactions
+                WHERE action = 'stripe_credit_pack' AND external_ref = ?
                 LIMIT 1
                 """,
-                (order_id,),
+                (stripe_session_id,),
             ).fetchone()
-            if not order_row:
-                connection.rollback()
-                raise HTTPException(status_code=404, detail="Payment order not found.")
-            if int(order_row["user_id"]) != int(user["id"]):
-                connection.rollback()
-                raise HTTPException(status_code=403, detail="This payment order belongs to a different user.")
-
-            status = safe_text(order_row["status"]).lower()
-            existing_payment_id = safe_text(order_row["payment_id"])
-            if status == "paid":
-                if existing_payment_id and existing_payment_id != payment_id:
-                    connection.rollback()
-                    raise HTTPException(status_code=409, detail="Payment already verified with a different payment id.")
-                refreshed_user = cursor.execute("SELECT id, email, credits FROM users WHERE id = ?", (int(user["id"]),)).fetchone()
-                connection.rollback()
-            else:
-                duplicate = cursor.execute(
-                    """
-                    SELECT order_id FROM payment_orders
-                    WHERE gateway = 'razorpay' AND payment_id = ? AND status = 'paid' AND order_id != ?
-                    LIMIT 1
-                    """,
-                    (payment_id, order_id),
-                ).fetchone()
-                if duplicate:
-                    connection.rollback()
-                    raise HTTPException(status_code=409, detail="This payment id is already consumed.")
+            if not existing:
                 user_row = cursor.execute(
-                    "SELECT id, email, credits FROM users WHERE id = ?",
-                    (int(user["id"]),),
+                    "SELECT id, email, credits FROM users WHERE id = ?" + SQL_FOR_UPDATE,
+                    (user_id,),
                 ).fetchone()
                 if not user_row:
                     connection.rollback()
-                    raise HTTPException(status_code=404, detail="User account was not found.")
-
-                credits_delta = int(order_row["credits"])
-                updated_credits = int(user_row["credits"]) + credits_delta
-                package_id = safe_text(order_row["package_id"])
-                amount_inr = int(order_row["amount_inr"])
+                    return
+                user_email = safe_text(str(user_row["email"]))
+                updated_credits = int(user_row["credits"]) + credits
                 plan_tier = user_plan_from_package_id(package_id)
                 cursor.execute(
-                    "UPDATE users SET credits = ?, plan_tier = ? WHERE id = ?",
-                    (updated_credits, plan_tier, int(user["id"])),
+                    "UPDATE users SET credits = credits + ?, plan_tier = ? WHERE id = ?",
+                    (credits, plan_tier, user_id),
                 )
                 cursor.execute(
                     """
-                    INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
+                    INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, external_ref, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
                     """,
                     (
-                        int(user["id"]),
-                        "razorpay_credit_pack",
-                        credits_delta,
+                        user_id,
+                        "stripe_credit_pack",
+                        credits,
                         updated_credits,
-                        json.dumps(
+                        meta_json_text(
                             {
-                                "gateway": "razorpay",
-                                "order_id": order_id,
-                                "payment_id": payment_id,
+                                "stripe_session_id": stripe_session_id,
                                 "package_id": package_id,
-                                "amount_inr": amount_inr,
-                            },
-                            separators=(",", ":"),
-                            sort_keys=True,
+                                "amount_inr": int(PAYMENT_CREDIT_PACKS.get(package_id, {}).get("amount_inr", 0)),
+                            }
                         ),
+                        stripe_session_id,
                         now_utc_iso(),
                     ),
                 )
-                cursor.execute(
-                    """
-                    UPDATE payment_orders
-                    SET status = 'paid', payment_id = ?, signature = ?, verified_at = ?, meta_json = ?
-                    WHERE id = ?
-                    """,
-                    (
-                        payment_id,
-                        signature,
-                        now_utc_iso(),
-                        json.dumps(
-                            {"verified_by": "frontend_callback"},
-                            separators=(",", ":"),
-                            sort_keys=True,
-                        ),
-                        int(order_row["id"]),
-                    ),
-                )
-                refreshed_user = cursor.execute("SELECT id, email, credits FROM users WHERE id = ?", (int(user["id"]),)).fetchone()
                 connection.commit()
                 checkout_logged_meta = {
-                    "gateway": "razorpay",
                     "package_id": package_id,
                     "plan": plan_tier,
-                    "credits": credits_delta,
-                    "order_id": order_id,
-                    "payment_id": payment_id,
+                    "credits": credits,
+                    "stripe_session_id": stripe_session_id,
                     "credits_after": updated_credits,
                 }
+            else:
+                connection.rollback()
         finally:
             connection.close()
-
-    if checkout_logged_meta:
-        log_analytics_event(
-            "payment",
-            "checkout_completed",
-            user_id=int(user["id"]),
-            meta=checkout_logged_meta,
-        )
-        email_error = send_payment_success_email(
-            safe_text(str(user["email"])),
-            "razorpay",
-            safe_text(str(checkout_logged_meta.get("package_id", ""))),
-            int(checkout_logged_meta.get("credits") or 0),
-            int(checkout_logged_meta.get("credits_after") or 0),
-        )
-        if email_error:
-            logger.warning("Payment success email failed for user %s: %s", int(user["id"]), email_error)
-    if not refreshed_user:
-        refreshed_user = fetch_user_by_id(int(user["id"]))
-    if not refreshed_user:
-        raise HTTPException(status_code=500, detail="Unable to refresh wallet after payment.")
-    return {
-        "message": "Payment verified and credits added.",
-        "wallet": wallet_payload(int(refreshed_user["credits"])),
-        "provider": "razorpay",
-    }
+        remember_stripe_session(stripe_session_id)
+        if checkout_logged_meta:
+            log_analytics_event(
+                "payment",
+                "checkout_completed",
+                user_id=user_id,
+                meta=checkout_logged_meta,
+            )
+            email_error = send_payment_success_email(
+                user_email,
+                "stripe",
+                safe_text(str(checkout_logged_meta.get("package_id", package_id))),
+                int(checkout_logged_meta.get("credits") or credits),
+                int(checkout_logged_meta.get("credits_after") or 0),
+            )
+            if email_error:
+                logger.warning("Payment success email failed for user %s: %s", user_id, email_error)
 
 
 @app.post("/payments/webhook")
@@ -7909,104 +8981,11 @@ async def stripe_webhook(request: Request) -> dict[str, bool]:
         raise HTTPException(status_code=400, detail="Invalid webhook signature.") from exc
 
     if safe_text(event.get("type")) == "checkout.session.completed":
-        session = event.get("data", {}).get("object", {})
-        metadata = session.get("metadata") or {}
-        user_id = int(float(metadata.get("user_id") or 0))
-        credits = int(float(metadata.get("credits") or 0))
-        package_id = safe_text(metadata.get("package_id"))
-        stripe_session_id = safe_text(session.get("id"))
-        checkout_logged_meta: dict[str, Any] | None = None
-        user_email = ""
-        if user_id > 0 and credits > 0 and stripe_session_id:
-            with AUTH_DB_LOCK:
-                connection = auth_db_connection()
-                try:
-                    cursor = connection.cursor()
-                    begin_write_transaction(cursor)
-                    existing = connection.execute(
-                        """
-                        SELECT id FROM credit_transactions
-                        WHERE action = 'stripe_credit_pack' AND meta_json LIKE ?
-                        LIMIT 1
-                        """,
-                        (f'%\"stripe_session_id\":\"{stripe_session_id}\"%',),
-                    ).fetchone()
-                    if not existing:
-                        user_row = cursor.execute(
-                            "SELECT id, email, credits FROM users WHERE id = ?",
-                            (user_id,),
-                        ).fetchone()
-                        if not user_row:
-                            connection.rollback()
-                            return {"received": True}
-                        user_email = safe_text(str(user_row["email"]))
-                        updated_credits = int(user_row["credits"]) + credits
-                        plan_tier = user_plan_from_package_id(package_id)
-                        cursor.execute(
-                            "UPDATE users SET credits = ?, plan_tier = ? WHERE id = ?",
-                            (updated_credits, plan_tier, user_id),
-                        )
-                        cursor.execute(
-                            """
-                            INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, created_at)
-                            VALUES (?, ?, ?, ?, ?, ?)
-                            """,
-                            (
-                                user_id,
-                                "stripe_credit_pack",
-                                credits,
-                                updated_credits,
-                                json.dumps(
-                                    {
-                                        "stripe_session_id": stripe_session_id,
-                                        "package_id": package_id,
-                                        "amount_inr": int(PAYMENT_CREDIT_PACKS.get(package_id, {}).get("amount_inr", 0)),
-                                    },
-                                    separators=(",", ":"),
-                                    sort_keys=True,
-                                ),
-                                now_utc_iso(),
-                            ),
-                        )
-                        connection.commit()
-                        checkout_logged_meta = {
-                            "package_id": package_id,
-                            "plan": plan_tier,
-                            "credits": credits,
-                            "stripe_session_id": stripe_session_id,
-                            "credits_after": updated_credits,
-                        }
-                    else:
-                        connection.rollback()
-                finally:
-                    connection.close()
-            if checkout_logged_meta:
-                log_analytics_event(
-                    "payment",
-                    "checkout_completed",
-                    user_id=user_id,
-                    meta=checkout_logged_meta,
-                )
-                email_error = send_payment_success_email(
-                    user_email,
-                    "stripe",
-                    safe_text(str(checkout_logged_meta.get("package_id", package_id))),
-                    int(checkout_logged_meta.get("credits") or credits),
-                    int(checkout_logged_meta.get("credits_after") or 0),
-                )
-                if email_error:
-                    logger.warning("Payment success email failed for user %s: %s", user_id, email_error)
+        await run_in_threadpool(apply_stripe_checkout_session, event.get("data", {}).get("object", {}))
 
     return {"received": True}
 
 
-def parse_meta_json(meta_json: Any) -> dict[str, Any]:
-    try:
-        return json.loads(meta_json or "{}")
-    except Exception:
-        return {}
-
-
 def serialize_analysis_report_row(row: Any) -> dict[str, Any]:
     try:
         raw_score = row["overall_score"]
@@ -8030,6 +9009,7 @@ def save_analysis_report(
     industry: str,
     role: str,
     report_payload: dict[str, Any],
+    event: tuple[Any, ...] | None = None,
 ) -> int | None:
     overall_score: int | None = None
     raw_score = report_payload.get("overall_score")
@@ -8040,47 +9020,48 @@ def save_analysis_report(
             overall_score = None
 
     shortlist_prediction = safe_text(str(report_payload.get("shortlist_prediction", "")))[:120]
-    report_json = json.dumps(report_payload, ensure_ascii=False, separators=(",", ":"), default=str)
+    report_json = stored_json_text(report_payload)
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            cursor.execute(
-                """
-                INSERT INTO analysis_reports (
-                    user_id,
-                    source,
-                    industry,
-                    role,
-                    overall_score,
-                    shortlist_prediction,
-                    report_json,
-                    created_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    user_id,
-                    safe_text(source) or "manual_input",
-                    safe_text(industry),
-                    safe_text(role),
-                    overall_score,
-                    shortlist_prediction,
-                    report_json,
-                    now_utc_iso(),
-                ),
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        cursor.execute(
+            """
+            INSERT INTO analysis_reports (
+                user_id,
+                source,
+                industry,
+                role,
+                overall_score,
+                shortlist_prediction,
+                report_json,
+                created_at
             )
-            report_id = inserted_row_id(connection, cursor)
-            connection.commit()
-            return report_id
-        except Exception:
-            connection.rollback()
-            logger.exception("Failed to save analysis report for user %s", user_id)
-            return None
-        finally:
-            connection.close()
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                user_id,
+                safe_text(source) or "manual_input",
+                safe_text(industry),
+                safe_text(role),
+                overall_score,
+                shortlist_prediction,
+                report_json,
+                now_utc_iso(),
+            ),
+        )
+        report_id = inserted_row_id(connection, cursor)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        logger.exception("Failed to save analysis report for user %s", user_id)
+        report_id = None
+    finally:
+        connection.close()
+    if event is not None:
+        enqueue_analytics_event_row(event)
+    return report_id
 
 
 def collect_analysis_reports_for_user(connection: AuthDBConnection, user_id: int, limit: int) -> list[dict[str, Any]]:
@@ -8113,7 +9094,7 @@ def normalize_chat_message_body(message: str) -> str:
     raw = safe_text(message).replace("\r\n", "\n").replace("\r", "\n")
     cleaned_lines = [line.strip() for line in raw.split("\n")]
     cleaned = "\n".join(line for line in cleaned_lines if line).strip()
-    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
+    cleaned = BLANK_LINE_RUN_RE.sub("\n\n", cleaned)
     if len(cleaned) > 1800:
         cleaned = cleaned[:1800].rstrip()
     return cleaned
@@ -8196,8 +9177,9 @@ def collect_admin_chat_threads(
     filters: list[str] = []
     values: list[Any] = []
     if search:
+        like_pattern = f"%{search}%"
         filters.append("(lower(u.email) LIKE ? OR lower(u.full_name) LIKE ?)")
-        values.extend([f"%{search}%", f"%{search}%"])
+        values.extend([like_pattern, like_pattern])
     where_sql = f"WHERE {' AND '.join(filters)}" if filters else ""
 
     query = f"""
@@ -8252,72 +9234,114 @@ def collect_admin_chat_threads(
     return threads
 
 
-def collect_admin_analytics_summary(connection: sqlite3.Connection) -> dict[str, Any]:
-    users_total = int(connection.execute("SELECT COUNT(*) AS count FROM users").fetchone()["count"])
-    feedback_row = connection.execute(
-        "SELECT COUNT(*) AS count, COALESCE(AVG(rating), 0) AS avg_rating FROM user_feedback"
-    ).fetchone()
-    feedback_total = int(feedback_row["count"])
-    feedback_avg = round(float(feedback_row["avg_rating"] or 0), 2)
-    signups_total = int(
-        connection.execute(
-            "SELECT COUNT(*) AS count FROM analytics_events WHERE event_type = 'auth' AND event_name = 'signup_success'"
-        ).fetchone()["count"]
-    )
-    logins_total = int(
-        connection.execute(
-            "SELECT COUNT(*) AS count FROM analytics_events WHERE event_type = 'auth' AND event_name = 'login_success'"
-        ).fetchone()["count"]
-    )
-    analyses_total = int(connection.execute("SELECT COUNT(*) AS count FROM credit_transactions WHERE action = 'analyze'").fetchone()["count"])
-    payments_total = int(
-        connection.execute(
-            "SELECT COUNT(*) AS count FROM credit_transactions WHERE action IN ('stripe_credit_pack', 'razorpay_credit_pack')"
-        ).fetchone()["count"]
-    )
-    credits_sold = int(
-        connection.execute(
-            "SELECT COALESCE(SUM(delta), 0) AS sold FROM credit_transactions WHERE action IN ('stripe_credit_pack', 'razorpay_credit_pack')"
-        ).fetchone()["sold"]
-    )
-    payment_rows = connection.execute(
-        "SELECT meta_json FROM credit_transactions WHERE action IN ('stripe_credit_pack', 'razorpay_credit_pack')"
-    ).fetchall()
-    revenue_inr = 0
-    for row in payment_rows:
-        meta = parse_meta_json(row["meta_json"])
-        revenue_inr += int(meta.get("amount_inr") or 0)
+PAYMENT_AMOUNT_INR_SQL = (
+    "CAST(meta_json::jsonb ->> 'amount_inr' AS NUMERIC)"
+    if AUTH_DB_BACKEND == "postgres"
+    else "CASE WHEN json_valid(meta_json) THEN CAST(json_extract(meta_json, '$.amount_inr') AS INTEGER) END"
+)
+ADMIN_ANALYTICS_SUMMARY_SQL = f"""
+    SELECT
+        (SELECT COUNT(*) FROM users) AS users_total,
+        (SELECT COUNT(*) FROM analytics_events WHERE event_type = 'auth' AND event_name = 'signup_success') AS signups_total,
+        (SELECT COUNT(*) FROM analytics_events WHERE event_type = 'auth' AND event_name = 'login_success') AS logins_total,
+        (SELECT COUNT(*) FROM credit_transactions WHERE action = 'analyze') AS analyses_total,
+        (SELECT COUNT(*) FROM user_feedback) AS feedback_total,
+        (SELECT COALESCE(AVG(rating), 0) FROM user_feedback) AS feedback_avg,
+        (SELECT COUNT(*) FROM credit_transactions WHERE action IN ('stripe_credit_pack', 'razorpay_credit_pack')) AS payments_total,
+        (SELECT COALESCE(SUM(delta), 0) FROM credit_transactions WHERE action IN ('stripe_credit_pack', 'razorpay_credit_pack')) AS credits_sold,
+        (
+            SELECT COALESCE(SUM({PAYMENT_AMOUNT_INR_SQL}), 0)
+            FROM credit_transactions
+            WHERE action IN ('stripe_credit_pack', 'razorpay_credit_pack')
+        ) AS revenue_inr
+"""
+
 
+def collect_admin_analytics_summary(connection: sqlite3.Connection) -> dict[str, Any]:
+    row = connection.execute(ADMIN_ANALYTICS_SUMMARY_SQL).fetchone()
     return {
-        "users_total": users_total,
-        "signups_total": signups_total,
-        "logins_total": logins_total,
-        "analyses_total": analyses_total,
-        "feedback_total": feedback_total,
-        "feedback_avg_rating": feedback_avg,
-        "payments_total": payments_total,
-        "credits_sold_total": credits_sold,
-        "revenue_inr_total": revenue_inr,
+        "users_total": int(row["users_total"]),
+        "signups_total": int(row["signups_total"]),
+        "logins_total": int(row["logins_total"]),
+        "analyses_total": int(row["analyses_total"]),
+        "feedback_total": int(row["feedback_total"]),
+        "feedback_avg_rating": round(float(row["feedback_avg"] or 0), 2),
+        "payments_total": int(row["payments_total"]),
+        "credits_sold_total": int(row["credits_sold"]),
+        "revenue_inr_total": int(row["revenue_inr"] or 0),
         "stripe_enabled": STRIPE_ENABLED,
         "razorpay_enabled": RAZORPAY_ENABLED,
         "payment_gateway": PAYMENT_GATEWAY_ACTIVE,
     }
 
 
-def collect_admin_events(connection: sqlite3.Connection, limit: int | None = None) -> list[dict[str, Any]]:
-    query = """
-        SELECT e.id, e.user_id, u.email, e.event_type, e.event_name, e.meta_json, e.created_at
-        FROM analytics_events e
-        LEFT JOIN users u ON u.id = e.user_id
-        ORDER BY e.id DESC
-    """
-    params: tuple[Any, ...] = ()
+ADMIN_EXPORT_PAGE_SIZE = 5000
+KEYSET_FIRST_PAGE_ID = 2**63 - 1
+ADMIN_EVENTS_SQL = """
+    SELECT e.id, e.user_id, u.email, e.event_type, e.event_name, e.meta_json, e.created_at
+    FROM analytics_events e
+    LEFT JOIN users u ON u.id = e.user_id
+    WHERE e.id < ?
+    ORDER BY e.id DESC
+    LIMIT ?
+"""
+ADMIN_FEEDBACK_SQL = """
+    SELECT f.id, f.user_id, u.email, f.rating, f.comment, f.source, f.created_at
+    FROM user_feedback f
+    LEFT JOIN users u ON u.id = f.user_id
+    WHERE f.id < ?
+    ORDER BY f.id DESC
+    LIMIT ?
+"""
+ADMIN_CREDIT_TRANSACTIONS_SQL = """
+    SELECT t.id, t.user_id, u.email, t.action, t.delta, t.balance_after, t.meta_json, t.created_at
+    FROM credit_transactions t
+    LEFT JOIN users u ON u.id = t.user_id
+    WHERE t.id < ?
+    ORDER BY t.id DESC
+    LIMIT ?
+"""
+ADMIN_USERS_SQL = """
+    SELECT
+        u.id,
+        u.full_name,
+        u.email,
+        lower(trim(u.plan_tier)) AS plan_tier,
+        u.credits,
+        u.created_at,
+        u.analyze_count,
+        u.feedback_count
+    FROM users u
+    WHERE (? = '' OR lower(u.email) LIKE ? OR lower(u.full_name) LIKE ?)
+    AND (? = '' OR lower(u.plan_tier) = ?)
+    AND u.id < ?
+    ORDER BY u.id DESC
+    LIMIT ? OFFSET ?
+"""
+
+
+def iter_keyset_rows(
+    connection: AuthDBConnection,
+    query: str,
+    params: tuple[Any, ...],
+    limit: int | None,
+    tail: tuple[Any, ...] = (),
+) -> Iterator[Any]:
     if limit is not None:
-        query += "\nLIMIT ?"
-        params = (int(limit),)
-    rows = connection.execute(query, params).fetchall()
-    return [
-        {
+        yield from connection.stream(query, (*params, KEYSET_FIRST_PAGE_ID, int(limit), *tail))
+        return
+    before_id = KEYSET_FIRST_PAGE_ID
+    while True:
+        rows = connection.execute(query, (*params, before_id, ADMIN_EXPORT_PAGE_SIZE, *tail)).fetchall()
+        yield from rows
+        if len(rows) < ADMIN_EXPORT_PAGE_SIZE:
+            return
+        before_id = int(rows[-1]["id"])
+
+
+def iter_admin_events(connection: sqlite3.Connection, limit: int | None = None) -> Iterator[dict[str, Any]]:
+    for row in iter_keyset_rows(connection, ADMIN_EVENTS_SQL, (), limit):
+        yield {
             "id": int(row["id"]),
             "user_id": int(row["user_id"]) if row["user_id"] is not None else None,
             "email": safe_text(row["email"]),
@@ -8326,24 +9350,15 @@ def collect_admin_events(connection: sqlite3.Connection, limit: int | None = Non
             "meta": parse_meta_json(row["meta_json"]),
             "created_at": safe_text(row["created_at"]),
         }
-        for row in rows
-    ]
 
 
-def collect_admin_feedback(connection: sqlite3.Connection, limit: int | None = None) -> list[dict[str, Any]]:
-    query = """
-        SELECT f.id, f.user_id, u.email, f.rating, f.comment, f.source, f.created_at
-        FROM user_feedback f
-        LEFT JOIN users u ON u.id = f.user_id
-        ORDER BY f.id DESC
-    """
-    params: tuple[Any, ...] = ()
-    if limit is not None:
-        query += "\nLIMIT ?"
-        params = (int(limit),)
-    rows = connection.execute(query, params).fetchall()
-    return [
-        {
+def collect_admin_events(connection: sqlite3.Connection, limit: int | None = None) -> list[dict[str, Any]]:
+    return list(iter_admin_events(connection, limit))
+
+
+def iter_admin_feedback(connection: sqlite3.Connection, limit: int | None = None) -> Iterator[dict[str, Any]]:
+    for row in iter_keyset_rows(connection, ADMIN_FEEDBACK_SQL, (), limit):
+        yield {
             "id": int(row["id"]),
             "user_id": int(row["user_id"]),
             "email": safe_text(row["email"]),
@@ -8352,24 +9367,15 @@ def collect_admin_feedback(connection: sqlite3.Connection, limit: int | None = N
             "source": safe_text(row["source"]),
             "created_at": safe_text(row["created_at"]),
         }
-        for row in rows
-    ]
 
 
-def collect_admin_credit_transactions(connection: sqlite3.Connection, limit: int | None = None) -> list[dict[str, Any]]:
-    query = """
-        SELECT t.id, t.user_id, u.email, t.action, t.delta, t.balance_after, t.meta_json, t.created_at
-        FROM credit_transactions t
-        LEFT JOIN users u ON u.id = t.user_id
-        ORDER BY t.id DESC
-    """
-    params: tuple[Any, ...] = ()
-    if limit is not None:
-        query += "\nLIMIT ?"
-        params = (int(limit),)
-    rows = connection.execute(query, params).fetchall()
-    return [
-        {
+def collect_admin_feedback(connection: sqlite3.Connection, limit: int | None = None) -> list[dict[str, Any]]:
+    return list(iter_admin_feedback(connection, limit))
+
+
+def iter_admin_credit_transactions(connection: sqlite3.Connection, limit: int | None = None) -> Iterator[dict[str, Any]]:
+    for row in iter_keyset_rows(connection, ADMIN_CREDIT_TRANSACTIONS_SQL, (), limit):
+        yield {
             "id": int(row["id"]),
             "user_id": int(row["user_id"]),
             "email": safe_text(row["email"]),
@@ -8379,116 +9385,166 @@ def collect_admin_credit_transactions(connection: sqlite3.Connection, limit: int
             "meta": parse_meta_json(row["meta_json"]),
             "created_at": safe_text(row["created_at"]),
         }
-        for row in rows
-    ]
 
 
-def collect_admin_users(
+def collect_admin_credit_transactions(connection: sqlite3.Connection, limit: int | None = None) -> list[dict[str, Any]]:
+    return list(iter_admin_credit_transactions(connection, limit))
+
+
+def iter_admin_users(
     connection: sqlite3.Connection,
     q: str | None = None,
     plan: str | None = None,
     limit: int | None = None,
     offset: int = 0,
-) -> list[dict[str, Any]]:
+) -> Iterator[dict[str, Any]]:
     search = safe_text(q).lower()
     raw_plan = safe_text(plan).lower()
     plan_filter = normalize_plan_tier(raw_plan) if raw_plan and raw_plan != "all" else ""
 
-    filters: list[str] = []
-    values: list[Any] = []
-    if search:
-        filters.append("(lower(u.email) LIKE ? OR lower(u.full_name) LIKE ?)")
-        values.extend([f"%{search}%", f"%{search}%"])
-    if plan_filter:
-        filters.append("lower(u.plan_tier) = ?")
-        values.append(plan_filter)
-    where_sql = f"WHERE {' AND '.join(filters)}" if filters else ""
-    pagination_sql = ""
-    if limit is not None:
-        pagination_sql = "LIMIT ? OFFSET ?"
-        values.extend([int(limit), max(0, int(offset))])
-
-    rows = connection.execute(
-        f"""
-        SELECT
-            u.id,
-            u.full_name,
-            u.email,
-            u.plan_tier,
-            u.credits,
-            u.created_at,
-            COALESCE(a.analyze_count, 0) AS analyze_count,
-            COALESCE(f.feedback_count, 0) AS feedback_count
-        FROM users u
-        LEFT JOIN (
-            SELECT user_id, COUNT(*) AS analyze_count
-            FROM credit_transactions
-            WHERE action = 'analyze'
-            GROUP BY user_id
-        ) a ON a.user_id = u.id
-        LEFT JOIN (
-            SELECT user_id, COUNT(*) AS feedback_count
-            FROM user_feedback
-            GROUP BY user_id
-        ) f ON f.user_id = u.id
-        {where_sql}
-        ORDER BY u.id DESC
-        {pagination_sql}
-        """,
-        tuple(values),
-    ).fetchall()
+    like_pattern = f"%{search}%"
+    rows = iter_keyset_rows(
+        connection,
+        ADMIN_USERS_SQL,
+        (search, like_pattern, like_pattern, plan_filter, plan_filter),
+        limit,
+        tail=(max(0, int(offset)) if limit is not None else 0,),
+    )
 
-    users: list[dict[str, Any]] = []
     for row in rows:
         analyze_count = int(row["analyze_count"] or 0)
         feedback_count = int(row["feedback_count"] or 0)
-        users.append(
-            {
-                "id": int(row["id"]),
-                "name": safe_text(row["full_name"]) or display_name_from_email(str(row["email"])),
-                "email": str(row["email"]),
-                "plan": normalize_plan_tier(str(row["plan_tier"])),
-                "credits": int(row["credits"]),
-                "created_at": str(row["created_at"]),
-                "analyze_count": analyze_count,
-                "feedback_submitted": feedback_count > 0,
-                "feedback_required": analyze_count >= 1 and feedback_count == 0,
-            }
-        )
-    return users
+        yield {
+            "id": int(row["id"]),
+            "name": safe_text(row["full_name"]) or display_name_from_email(str(row["email"])),
+            "email": str(row["email"]),
+            "plan": PLAN_TIER_CANONICAL.get(row["plan_tier"], "free"),
+            "credits": int(row["credits"]),
+            "created_at": str(row["created_at"]),
+            "analyze_count": analyze_count,
+            "feedback_submitted": feedback_count > 0,
+            "feedback_required": feedback_required_from_counts(analyze_count, feedback_count),
+        }
 
 
-def build_csv_bytes(rows: list[dict[str, Any]], fieldnames: list[str]) -> bytes:
+def collect_admin_users(
+    connection: sqlite3.Connection,
+    q: str | None = None,
+    plan: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[dict[str, Any]]:
+    return list(iter_admin_users(connection, q=q, plan=plan, limit=limit, offset=offset))
+
+
+CSV_STREAM_CHUNK_CHARS = 64 * 1024
+CSV_WRITE_BATCH_ROWS = 1000
+
+
+def csv_cell(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return meta_json_text(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def iter_csv_chunks(rows: Iterable[dict[str, Any]], fieldnames: list[str]) -> Iterator[bytes]:
     buffer = io.StringIO()
-    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
-    writer.writeheader()
+    writer = csv.writer(buffer)
+    writer.writerow(fieldnames)
+    batch: list[list[Any]] = []
     for row in rows:
-        serialized: dict[str, Any] = {}
-        for field in fieldnames:
-            value = row.get(field)
-            if isinstance(value, (dict, list)):
-                serialized[field] = json.dumps(value, separators=(",", ":"), sort_keys=True)
-            elif isinstance(value, bool):
-                serialized[field] = "true" if value else "false"
-            else:
-                serialized[field] = value
-        writer.writerow(serialized)
-    return buffer.getvalue().encode("utf-8")
+        batch.append([csv_cell(row.get(field)) for field in fieldnames])
+        if len(batch) >= CSV_WRITE_BATCH_ROWS:
+            writer.writerows(batch)
+            batch.clear()
+            if buffer.tell() >= CSV_STREAM_CHUNK_CHARS:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+    writer.writerows(batch)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_admin_export_rows(collect: Any, *args: Any, **kwargs: Any) -> Iterator[dict[str, Any]]:
+    connection = auth_db_connection()
+    try:
+        yield from collect(connection, *args, **kwargs)
+    finally:
+        connection.close()
+
+
+EXPORT_TIMESTAMP_FORMAT = "%Y%m%d-%H%M%S"
 
 
-def csv_download_response(filename: str, rows: list[dict[str, Any]], fieldnames: list[str]) -> StreamingResponse:
-    content = build_csv_bytes(rows, fieldnames)
+def export_filename(prefix: str, extension: str, now: datetime | None = None) -> str:
+    return f"{prefix}-{(now or datetime.now(timezone.utc)).strftime(EXPORT_TIMESTAMP_FORMAT)}.{extension}"
+
+
+def csv_download_response(filename: str, rows: Iterable[dict[str, Any]], fieldnames: list[str]) -> StreamingResponse:
     return StreamingResponse(
-        io.BytesIO(content),
+        iter_csv_chunks(rows, fieldnames),
         media_type="text/csv; charset=utf-8",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
-def json_download_response(filename: str, payload: dict[str, Any]) -> StreamingResponse:
-    content = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=False).encode("utf-8")
+JSON_EXPORT_BATCH_ROWS = 1000
+
+
+def json_export_bytes(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=False).encode("utf-8")
+
+
+def iter_json_array_chunks(rows: Iterable[Any]) -> Iterator[bytes]:
+    yield b"["
+    separator = b""
+    batch: list[Any] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= JSON_EXPORT_BATCH_ROWS:
+            yield separator + json_export_bytes(batch)[1:-1]
+            separator = b","
+            batch.clear()
+    if batch:
+        yield separator + json_export_bytes(batch)[1:-1]
+    yield b"]"
+
+
+ADMIN_EXPORT_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="admin-export")
+
+
+def collect_on_own_connection(collect: Any, *args: Any, **kwargs: Any) -> Any:
+    with auth_db_connection() as connection:
+        return collect(connection, *args, **kwargs)
+
+
+def iter_admin_export_json(q: str | None = None, plan: str | None = None, generated_at: str | None = None) -> Iterator[bytes]:
+    summary_future = ADMIN_EXPORT_EXECUTOR.submit(collect_on_own_connection, collect_admin_analytics_summary)
+    chat_threads_future = ADMIN_EXPORT_EXECUTOR.submit(collect_on_own_connection, collect_admin_chat_threads, q=q, limit=None)
+    with auth_db_connection() as connection:
+        yield b'{"generated_at_utc":' + json_export_bytes(generated_at or now_utc_iso())
+        yield b',"summary":' + json_export_bytes(summary_future.result())
+        sections = (
+            (b"users", iter_admin_users(connection, q=q, plan=plan, limit=None, offset=0)),
+            (b"events", iter_admin_events(connection, limit=None)),
+            (b"feedback", iter_admin_feedback(connection, limit=None)),
+            (b"credit_transactions", iter_admin_credit_transactions(connection, limit=None)),
+        )
+        for key, rows in sections:
+            yield b',"' + key + b'":'
+            yield from iter_json_array_chunks(rows)
+        yield b',"chat_threads":' + json_export_bytes(chat_threads_future.result())
+        yield b"}"
+
+
+def json_download_response(filename: str, chunks: Iterable[bytes]) -> StreamingResponse:
     return StreamingResponse(
-        io.BytesIO(content),
+        chunks,
         media_type="application/json",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
@@ -8597,7 +9653,7 @@ def analysis_action_lines(value: Any, limit: int = 5, max_item_len: int = 180) -
     return lines[:limit]
 
 
-def render_analysis_report_pdf_bytes(report_payload: dict[str, Any], report_row: Any | None = None) -> bytes:
+def render_analysis_report_pdf_buffer(report_payload: dict[str, Any], report_row: Any | None = None) -> io.BytesIO:
     output = io.BytesIO()
     doc = SimpleDocTemplate(
         output,
@@ -8617,7 +9673,7 @@ def render_analysis_report_pdf_bytes(report_payload: dict[str, Any], report_row:
         fontName="Helvetica-Bold",
         fontSize=21,
         leading=25,
-        textColor=colors.HexColor("#0D2D47"),
+        textColor=ANALYSIS_REPORT_COLORS["title"],
         spaceAfter=3,
     )
     subtitle_style = ParagraphStyle(
@@ -8626,7 +9682,7 @@ def render_analysis_report_pdf_bytes(report_payload: dict[str, Any], report_row:
         fontName="Helvetica",
         fontSize=9.6,
         leading=12.2,
-        textColor=colors.HexColor("#4A6A80"),
+        textColor=ANALYSIS_REPORT_COLORS["subtitle"],
         spaceAfter=12,
     )
     section_style = ParagraphStyle(
@@ -8635,7 +9691,7 @@ def render_analysis_report_pdf_bytes(report_payload: dict[str, Any], report_row:
         fontName="Helvetica-Bold",
         fontSize=11.5,
         leading=14,
-        textColor=colors.HexColor("#145B87"),
+        textColor=ANALYSIS_REPORT_COLORS["section"],
         spaceBefore=9,
         spaceAfter=4,
     )
@@ -8645,7 +9701,7 @@ def render_analysis_report_pdf_bytes(report_payload: dict[str, Any], report_row:
         fontName="Helvetica",
         fontSize=10,
         leading=14,
-        textColor=colors.HexColor("#1E3F56"),
+        textColor=ANALYSIS_REPORT_COLORS["body"],
         spaceAfter=3,
     )
     bullet_style = ParagraphStyle(
@@ -8654,7 +9710,7 @@ def render_analysis_report_pdf_bytes(report_payload: dict[str, Any], report_row:
         fontName="Helvetica",
         fontSize=9.9,
         leading=13.2,
-        textColor=colors.HexColor("#1E3F56"),
+        textColor=ANALYSIS_REPORT_COLORS["body"],
         leftIndent=14,
         bulletIndent=4,
         spaceAfter=2,
@@ -8665,7 +9721,7 @@ def render_analysis_report_pdf_bytes(report_payload: dict[str, Any], report_row:
         fontName="Helvetica-Bold",
         fontSize=9.3,
         leading=12,
-        textColor=colors.HexColor("#0E2A43"),
+        textColor=ANALYSIS_REPORT_COLORS["metric_label"],
     )
     metric_value_style = ParagraphStyle(
         "analysis_metric_value",
@@ -8673,7 +9729,7 @@ def render_analysis_report_pdf_bytes(report_payload: dict[str, Any], report_row:
         fontName="Helvetica",
         fontSize=9.6,
         leading=12.2,
-        textColor=colors.HexColor("#264B63"),
+        textColor=ANALYSIS_REPORT_COLORS["metric_value"],
     )
 
     role = safe_text(str(report_payload.get("role") or (report_row["role"] if report_row else "")))
@@ -8710,9 +9766,9 @@ def render_analysis_report_pdf_bytes(report_payload: dict[str, Any], report_row:
     metrics_table.setStyle(
         TableStyle(
             [
-                ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#F5FAFE")),
-                ("BOX", (0, 0), (-1, -1), 0.8, colors.HexColor("#BFD9EC")),
-                ("INNERGRID", (0, 0), (-1, -1), 0.35, colors.HexColor("#D5E6F3")),
+                ("BACKGROUND", (0, 0), (-1, -1), ANALYSIS_REPORT_COLORS["surface"]),
+                ("BOX", (0, 0), (-1, -1), 0.8, ANALYSIS_REPORT_COLORS["box"]),
+                ("INNERGRID", (0, 0), (-1, -1), 0.35, ANALYSIS_REPORT_COLORS["line"]),
                 ("LEFTPADDING", (0, 0), (-1, -1), 8),
                 ("RIGHTPADDING", (0, 0), (-1, -1), 8),
                 ("TOPPADDING", (0, 0), (-1, -1), 5),
@@ -8729,7 +9785,7 @@ def render_analysis_report_pdf_bytes(report_payload: dict[str, Any], report_row:
         if not filtered:
             return
         story.append(Paragraph(html.escape(title), section_style))
-        story.append(HRFlowable(width="100%", color=colors.HexColor("#D5E6F3"), thickness=0.65, spaceBefore=0.6, spaceAfter=3))
+        story.append(HRFlowable(width="100%", color=ANALYSIS_REPORT_COLORS["line"], thickness=0.65, spaceBefore=0.6, spaceAfter=3))
         for item in filtered:
             if bullet:
                 story.append(Paragraph(html.escape(item), bullet_style, bulletText="•"))
@@ -8802,7 +9858,7 @@ def render_analysis_report_pdf_bytes(report_payload: dict[str, Any], report_row:
 
     doc.build(story)
     output.seek(0)
-    return output.getvalue()
+    return output
 
 
 @app.post("/admin/auth/login")
@@ -8825,22 +9881,16 @@ def admin_auth_login(data: AdminLoginRequest) -> dict[str, Any]:
 @app.get("/admin/analytics")
 def admin_analytics(request: Request) -> dict[str, Any]:
     require_admin_access(request)
-    connection = auth_db_connection()
-    try:
+    with auth_db_connection() as connection:
         return collect_admin_analytics_summary(connection)
-    finally:
-        connection.close()
 
 
 @app.get("/admin/events")
 def admin_events(request: Request, limit: int = 200) -> dict[str, Any]:
     require_admin_access(request)
     safe_limit = int(clamp_float(float(limit), 1, 1000))
-    connection = auth_db_connection()
-    try:
+    with auth_db_connection() as connection:
         events = collect_admin_events(connection, safe_limit)
-    finally:
-        connection.close()
     return {"events": events}
 
 
@@ -8848,11 +9898,8 @@ def admin_events(request: Request, limit: int = 200) -> dict[str, Any]:
 def admin_feedback(request: Request, limit: int = 200) -> dict[str, Any]:
     require_admin_access(request)
     safe_limit = int(clamp_float(float(limit), 1, 1000))
-    connection = auth_db_connection()
-    try:
+    with auth_db_connection() as connection:
         feedback_rows = collect_admin_feedback(connection, safe_limit)
-    finally:
-        connection.close()
     return {"feedback": feedback_rows}
 
 
@@ -8868,11 +9915,8 @@ def admin_users(
     safe_limit = int(clamp_float(float(limit), 1, 200))
     safe_offset = max(0, int(offset))
 
-    connection = auth_db_connection()
-    try:
+    with auth_db_connection() as connection:
         users = collect_admin_users(connection, q=q, plan=plan, limit=safe_limit, offset=safe_offset)
-    finally:
-        connection.close()
     raw_plan = safe_text(plan).lower()
     plan_filter = normalize_plan_tier(raw_plan) if raw_plan and raw_plan != "all" else ""
     return {"users": users, "limit": safe_limit, "offset": safe_offset, "plan_filter": plan_filter or None}
@@ -8882,11 +9926,8 @@ def admin_users(
 def admin_chats(request: Request, q: str | None = None, limit: int = 120) -> dict[str, Any]:
     require_admin_access(request)
     safe_limit = int(clamp_float(float(limit), 1, 400))
-    connection = auth_db_connection()
-    try:
+    with auth_db_connection() as connection:
         threads = collect_admin_chat_threads(connection, q=q, limit=safe_limit)
-    finally:
-        connection.close()
     return {"threads": threads, "limit": safe_limit}
 
 
@@ -8897,30 +9938,29 @@ def admin_chat_messages(request: Request, user_id: int, limit: int = 200) -> dic
         raise HTTPException(status_code=400, detail="Invalid user id.")
     safe_limit = int(clamp_float(float(limit), 1, 500))
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            user = cursor.execute(
-                "SELECT id, full_name, email, plan_tier, credits FROM users WHERE id = ? LIMIT 1",
-                (user_id,),
-            ).fetchone()
-            if not user:
-                connection.rollback()
-                raise HTTPException(status_code=404, detail="User not found.")
-            messages = collect_chat_messages_for_user(connection, user_id=user_id, limit=safe_limit)
-            cursor.execute(
-                """
-                UPDATE user_chat_messages
-                SET read_by_admin = 1
-                WHERE user_id = ? AND sender_role = 'user' AND read_by_admin = 0
-                """,
-                (user_id,),
-            )
-            connection.commit()
-        finally:
-            connection.close()
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        user = cursor.execute(
+            "SELECT id, full_name, email, plan_tier, credits FROM users WHERE id = ? LIMIT 1",
+            (user_id,),
+        ).fetchone()
+        if not user:
+            connection.rollback()
+            raise HTTPException(status_code=404, detail="User not found.")
+        messages = collect_chat_messages_for_user(connection, user_id=user_id, limit=safe_limit)
+        cursor.execute(
+            """
+            UPDATE user_chat_messages
+            SET read_by_admin = 1
+            WHERE user_id = ? AND sender_role = 'user' AND read_by_admin = 0
+            """,
+            (user_id,),
+        )
+        connection.commit()
+    finally:
+        connection.close()
 
     return {
         "user": {
@@ -8943,29 +9983,28 @@ def admin_chat_reply(request: Request, user_id: int, data: AdminChatReplyRequest
     if len(message) < 2:
         raise HTTPException(status_code=400, detail="Please enter a longer reply.")
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            user = cursor.execute(
-                "SELECT id FROM users WHERE id = ? LIMIT 1",
-                (user_id,),
-            ).fetchone()
-            if not user:
-                connection.rollback()
-                raise HTTPException(status_code=404, detail="User not found.")
-            saved = insert_chat_message(
-                connection=connection,
-                user_id=user_id,
-                sender_role="admin",
-                message=message,
-                read_by_user=False,
-                read_by_admin=True,
-            )
-            connection.commit()
-        finally:
-            connection.close()
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        user = cursor.execute(
+            "SELECT id FROM users WHERE id = ? LIMIT 1",
+            (user_id,),
+        ).fetchone()
+        if not user:
+            connection.rollback()
+            raise HTTPException(status_code=404, detail="User not found.")
+        saved = insert_chat_message(
+            connection=connection,
+            user_id=user_id,
+            sender_role="admin",
+            message=message,
+            read_by_user=False,
+            read_by_admin=True,
+        )
+        connection.commit()
+    finally:
+        connection.close()
 
     log_analytics_event("admin_chat", "admin_reply_sent", user_id=user_id, meta={"chars": len(message)})
     return {"message": saved}
@@ -8977,33 +10016,32 @@ def admin_chat_delete_message(request: Request, user_id: int, message_id: int) -
     if user_id <= 0 or message_id <= 0:
         raise HTTPException(status_code=400, detail="Invalid user id or message id.")
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            user = cursor.execute("SELECT id FROM users WHERE id = ? LIMIT 1", (user_id,)).fetchone()
-            if not user:
-                connection.rollback()
-                raise HTTPException(status_code=404, detail="User not found.")
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        user = cursor.execute("SELECT id FROM users WHERE id = ? LIMIT 1", (user_id,)).fetchone()
+        if not user:
+            connection.rollback()
+            raise HTTPException(status_code=404, detail="User not found.")
 
-            message_row = cursor.execute(
-                """
-                SELECT id, sender_role
-                FROM user_chat_messages
-                WHERE id = ? AND user_id = ?
-                LIMIT 1
-                """,
-                (message_id, user_id),
-            ).fetchone()
-            if not message_row:
-                connection.rollback()
-                raise HTTPException(status_code=404, detail="Chat message not found.")
+        message_row = cursor.execute(
+            """
+            SELECT id, sender_role
+            FROM user_chat_messages
+            WHERE id = ? AND user_id = ?
+            LIMIT 1
+            """,
+            (message_id, user_id),
+        ).fetchone()
+        if not message_row:
+            connection.rollback()
+            raise HTTPException(status_code=404, detail="Chat message not found.")
 
-            cursor.execute("DELETE FROM user_chat_messages WHERE id = ? AND user_id = ?", (message_id, user_id))
-            connection.commit()
-        finally:
-            connection.close()
+        cursor.execute("DELETE FROM user_chat_messages WHERE id = ? AND user_id = ?", (message_id, user_id))
+        connection.commit()
+    finally:
+        connection.close()
 
     log_analytics_event(
         "admin_chat",
@@ -9020,21 +10058,20 @@ def admin_chat_clear_thread(request: Request, user_id: int) -> dict[str, Any]:
     if user_id <= 0:
         raise HTTPException(status_code=400, detail="Invalid user id.")
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            user = cursor.execute("SELECT id FROM users WHERE id = ? LIMIT 1", (user_id,)).fetchone()
-            if not user:
-                connection.rollback()
-                raise HTTPException(status_code=404, detail="User not found.")
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        user = cursor.execute("SELECT id FROM users WHERE id = ? LIMIT 1", (user_id,)).fetchone()
+        if not user:
+            connection.rollback()
+            raise HTTPException(status_code=404, detail="User not found.")
 
-            cursor.execute("DELETE FROM user_chat_messages WHERE user_id = ?", (user_id,))
-            deleted_count = int(max(0, cursor.rowcount))
-            connection.commit()
-        finally:
-            connection.close()
+        cursor.execute("DELETE FROM user_chat_messages WHERE user_id = ?", (user_id,))
+        deleted_count = int(max(0, cursor.rowcount))
+        connection.commit()
+    finally:
+        connection.close()
 
     log_analytics_event("admin_chat", "thread_cleared", user_id=user_id, meta={"deleted_messages": deleted_count})
     return {"deleted": True, "user_id": user_id, "deleted_messages": deleted_count}
@@ -9046,90 +10083,87 @@ def admin_update_user(user_id: int, data: AdminUserUpdateRequest, request: Reque
     if user_id <= 0:
         raise HTTPException(status_code=400, detail="Invalid user id.")
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            user = cursor.execute(
-                "SELECT id, full_name, email, password_hash, password_salt, plan_tier, credits, created_at FROM users WHERE id = ?",
-                (user_id,),
-            ).fetchone()
-            if not user:
-                connection.rollback()
-                raise HTTPException(status_code=404, detail="User not found.")
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        user = cursor.execute(USER_BY_ID_FOR_UPDATE_SQL, (user_id,)).fetchone()
+        if not user:
+            connection.rollback()
+            raise HTTPException(status_code=404, detail="User not found.")
 
-            updates: list[str] = []
-            values: list[Any] = []
-            meta: dict[str, Any] = {}
+        updates: list[str] = []
+        values: list[Any] = []
+        meta: dict[str, Any] = {}
 
-            if data.name is not None:
-                new_name = safe_text(data.name)
-                updates.append("full_name = ?")
-                values.append(new_name)
-                meta["name_updated"] = True
+        if data.name is not None:
+            new_name = safe_text(data.name)
+            updates.append("full_name = ?")
+            values.append(new_name)
+            meta["name_updated"] = True
 
-            if data.email is not None:
-                new_email = normalize_email(data.email)
-                if not new_email or "@" not in new_email:
-                    connection.rollback()
-                    raise HTTPException(status_code=400, detail="Enter a valid email address.")
-                updates.append("email = ?")
-                values.append(new_email)
-                meta["email_updated"] = True
-
-            if data.password is not None:
-                new_password = safe_text(data.password)
-                if len(new_password) < 6:
-                    connection.rollback()
-                    raise HTTPException(status_code=400, detail="Password must be at least 6 characters.")
-                new_salt = secrets.token_hex(16)
-                new_hash = hash_password(new_password, new_salt)
-                updates.extend(["password_hash = ?", "password_salt = ?"])
-                values.extend([new_hash, new_salt])
-                meta["password_updated"] = True
-
-            if data.plan is not None:
-                new_plan = normalize_plan_tier(data.plan)
-                updates.append("plan_tier = ?")
-                values.append(new_plan)
-                meta["plan_updated"] = new_plan
-
-            if updates:
-                values.append(user_id)
-                cursor.execute(f"UPDATE users SET {', '.join(updates)} WHERE id = ?", tuple(values))
-
-            if data.credits_set is not None:
-                target = max(0, int(data.credits_set))
-                current = int(user["credits"])
-                delta = target - current
-                cursor.execute("UPDATE users SET credits = ? WHERE id = ?", (target, user_id))
-                cursor.execute(
-                    """
-                    INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        user_id,
-                        "admin_set_credits",
-                        delta,
-                        target,
-                        json.dumps({"reason": "admin_update"}, separators=(",", ":"), sort_keys=True),
-                        now_utc_iso(),
-                    ),
-                )
-                meta["credits_set"] = target
+        if data.email is not None:
+            new_email = normalize_email(data.email)
+            if not new_email or "@" not in new_email:
+                connection.rollback()
+                raise HTTPException(status_code=400, detail="Enter a valid email address.")
+            updates.append("email = ?")
+            values.append(new_email)
+            meta["email_updated"] = True
+
+        if data.password is not None:
+            new_password = safe_text(data.password)
+            if len(new_password) < 6:
+                connection.rollback()
+                raise HTTPException(status_code=400, detail="Password must be at least 6 characters.")
+            new_salt = secrets.token_hex(16)
+            new_hash = hash_password(new_password, new_salt)
+            updates.extend(["password_hash = ?", "password_salt = ?"])
+            values.extend([new_hash, new_salt])
+            meta["password_updated"] = True
+
+        if data.plan is not None:
+            new_plan = normalize_plan_tier(data.plan)
+            updates.append("plan_tier = ?")
+            values.append(new_plan)
+            meta["plan_updated"] = new_plan
+
+        target = max(0, int(data.credits_set)) if data.credits_set is not None else None
+        if target is not None:
+            updates.append("credits = ?")
+            values.append(target)
+
+        refreshed = user
+        if updates:
+            refreshed = update_user_returning(cursor, ", ".join(updates), tuple(values), user_id)
+
+        if target is not None:
+            delta = target - int(user["credits"])
+            cursor.execute(
+                """
+                INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    user_id,
+                    "admin_set_credits",
+                    delta,
+                    target,
+                    ADMIN_UPDATE_CREDIT_META_JSON,
+                    now_utc_iso(),
+                ),
+            )
+            meta["credits_set"] = target
 
-            connection.commit()
-        except HTTPException:
-            raise
-        except DB_INTEGRITY_ERRORS as exc:
-            connection.rollback()
-            raise HTTPException(status_code=409, detail="Email already exists.") from exc
-        finally:
-            connection.close()
+        connection.commit()
+    except HTTPException:
+        raise
+    except DB_INTEGRITY_ERRORS as exc:
+        connection.rollback()
+        raise HTTPException(status_code=409, detail="Email already exists.") from exc
+    finally:
+        connection.close()
 
-    refreshed = fetch_user_by_id(user_id)
     if not refreshed:
         raise HTTPException(status_code=500, detail="Unable to refresh updated user.")
     log_analytics_event("admin", "user_updated", user_id=user_id, meta=meta)
@@ -9142,7 +10176,7 @@ def admin_update_user(user_id: int, data: AdminUserUpdateRequest, request: Reque
             "credits": int(refreshed["credits"]),
             "created_at": str(refreshed["created_at"]),
         },
-        "feedback_required": feedback_required_for_user(user_id),
+        "feedback_required": feedback_required_for_user(user_id, refreshed),
     }
 
 
@@ -9151,42 +10185,38 @@ def admin_adjust_credits(user_id: int, data: AdminCreditAdjustRequest, request:
     require_admin_access(request)
     if user_id <= 0:
         raise HTTPException(status_code=400, detail="Invalid user id.")
+    credit_meta_json = meta_json_text({"reason": safe_text(data.reason)})
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            user = cursor.execute(
-                "SELECT id, email, password_hash, password_salt, credits, created_at FROM users WHERE id = ?",
-                (user_id,),
-            ).fetchone()
-            if not user:
-                connection.rollback()
-                raise HTTPException(status_code=404, detail="User not found.")
-            current = int(user["credits"])
-            target = max(0, current + int(data.delta))
-            delta_applied = target - current
-            cursor.execute("UPDATE users SET credits = ? WHERE id = ?", (target, user_id))
-            cursor.execute(
-                """
-                INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    user_id,
-                    "admin_adjust_credits",
-                    delta_applied,
-                    target,
-                    json.dumps({"reason": safe_text(data.reason)}, separators=(",", ":"), sort_keys=True),
-                    now_utc_iso(),
-                ),
-            )
-            connection.commit()
-        finally:
-            connection.close()
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        user = cursor.execute("SELECT id, credits FROM users WHERE id = ?" + SQL_FOR_UPDATE, (user_id,)).fetchone()
+        if not user:
+            connection.rollback()
+            raise HTTPException(status_code=404, detail="User not found.")
+        current = int(user["credits"])
+        target = max(0, current + int(data.delta))
+        delta_applied = target - current
+        refreshed = update_user_returning(cursor, "credits = ?", (target,), user_id)
+        cursor.execute(
+            """
+            INSERT INTO credit_transactions (user_id, action, delta, balance_after, meta_json, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                user_id,
+                "admin_adjust_credits",
+                delta_applied,
+                target,
+                credit_meta_json,
+                now_utc_iso(),
+            ),
+        )
+        connection.commit()
+    finally:
+        connection.close()
 
-    refreshed = fetch_user_by_id(user_id)
     if not refreshed:
         raise HTTPException(status_code=500, detail="Unable to refresh wallet.")
     log_analytics_event("admin", "user_credits_adjusted", user_id=user_id, meta={"delta": int(data.delta), "reason": safe_text(data.reason)})
@@ -9208,27 +10238,21 @@ def admin_delete_user(user_id: int, request: Request) -> dict[str, Any]:
     if user_id <= 0:
         raise HTTPException(status_code=400, detail="Invalid user id.")
 
-    with AUTH_DB_LOCK:
-        connection = auth_db_connection()
-        try:
-            cursor = connection.cursor()
-            begin_write_transaction(cursor)
-            user = cursor.execute("SELECT id, email FROM users WHERE id = ? LIMIT 1", (user_id,)).fetchone()
-            if not user:
-                connection.rollback()
-                raise HTTPException(status_code=404, detail="User not found.")
-            cursor.execute("DELETE FROM payment_orders WHERE user_id = ?", (user_id,))
-            cursor.execute("DELETE FROM credit_transactions WHERE user_id = ?", (user_id,))
-            cursor.execute("DELETE FROM user_feedback WHERE user_id = ?", (user_id,))
-            cursor.execute("DELETE FROM analytics_events WHERE user_id = ?", (user_id,))
-            cursor.execute("DELETE FROM user_chat_messages WHERE user_id = ?", (user_id,))
-            cursor.execute("DELETE FROM analysis_reports WHERE user_id = ?", (user_id,))
-            cursor.execute("DELETE FROM password_reset_otps WHERE user_id = ?", (user_id,))
-            cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
-            connection.commit()
-        finally:
-            connection.close()
-    log_analytics_event("admin", "user_deleted", user_id=user_id, meta={"email": safe_text(user["email"]) if user else ""})
+    connection = auth_db_connection()
+    try:
+        cursor = connection.cursor()
+        begin_write_transaction(cursor)
+        user = cursor.execute("SELECT id, email FROM users WHERE id = ? LIMIT 1", (user_id,)).fetchone()
+        if not user:
+            connection.rollback()
+            raise HTTPException(status_code=404, detail="User not found.")
+        for table in USER_OWNED_TABLES:
+            cursor.execute(f"DELETE FROM {table} WHERE user_id = ?", (user_id,))
+        cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
+        connection.commit()
+    finally:
+        connection.close()
+    log_analytics_event("admin", "user_deleted", meta={"deleted_user_id": user_id, "email": safe_text(user["email"]) if user else ""})
     return {"deleted": True, "user_id": user_id}
 
 
@@ -9236,46 +10260,27 @@ def admin_delete_user(user_id: int, request: Request) -> dict[str, Any]:
 def admin_credit_transactions(request: Request, limit: int = 120) -> dict[str, Any]:
     require_admin_access(request)
     safe_limit = int(clamp_float(float(limit), 1, 400))
-    connection = auth_db_connection()
-    try:
+    with auth_db_connection() as connection:
         transactions = collect_admin_credit_transactions(connection, safe_limit)
-    finally:
-        connection.close()
     return {"transactions": transactions}
 
 
 @app.get("/admin/export/full.json")
 def admin_export_full_json(request: Request, q: str | None = None, plan: str | None = None) -> StreamingResponse:
     require_admin_access(request)
-    connection = auth_db_connection()
-    try:
-        payload = {
-            "generated_at_utc": now_utc_iso(),
-            "summary": collect_admin_analytics_summary(connection),
-            "users": collect_admin_users(connection, q=q, plan=plan, limit=None, offset=0),
-            "events": collect_admin_events(connection, limit=None),
-            "feedback": collect_admin_feedback(connection, limit=None),
-            "credit_transactions": collect_admin_credit_transactions(connection, limit=None),
-            "chat_threads": collect_admin_chat_threads(connection, q=q, limit=None),
-        }
-    finally:
-        connection.close()
-
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
-    return json_download_response(f"hirescore-admin-export-{timestamp}.json", payload)
+    generated_at = datetime.now(timezone.utc)
+    return json_download_response(
+        export_filename("hirescore-admin-export", "json", generated_at),
+        iter_admin_export_json(q=q, plan=plan, generated_at=generated_at.isoformat()),
+    )
 
 
 @app.get("/admin/export/users.csv")
 def admin_export_users_csv(request: Request, q: str | None = None, plan: str | None = None) -> StreamingResponse:
     require_admin_access(request)
-    connection = auth_db_connection()
-    try:
-        rows = collect_admin_users(connection, q=q, plan=plan, limit=None, offset=0)
-    finally:
-        connection.close()
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    rows = iter_admin_export_rows(iter_admin_users, q=q, plan=plan, limit=None, offset=0)
     return csv_download_response(
-        f"hirescore-users-{timestamp}.csv",
+        export_filename("hirescore-users", "csv"),
         rows,
         ["id", "name", "email", "plan", "credits", "created_at", "analyze_count", "feedback_submitted", "feedback_required"],
     )
@@ -9284,14 +10289,9 @@ def admin_export_users_csv(request: Request, q: str | None = None, plan: str | N
 @app.get("/admin/export/events.csv")
 def admin_export_events_csv(request: Request) -> StreamingResponse:
     require_admin_access(request)
-    connection = auth_db_connection()
-    try:
-        rows = collect_admin_events(connection, limit=None)
-    finally:
-        connection.close()
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    rows = iter_admin_export_rows(iter_admin_events, limit=None)
     return csv_download_response(
-        f"hirescore-events-{timestamp}.csv",
+        export_filename("hirescore-events", "csv"),
         rows,
         ["id", "user_id", "email", "event_type", "event_name", "meta", "created_at"],
     )
@@ -9300,14 +10300,9 @@ def admin_export_events_csv(request: Request) -> StreamingResponse:
 @app.get("/admin/export/feedback.csv")
 def admin_export_feedback_csv(request: Request) -> StreamingResponse:
     require_admin_access(request)
-    connection = auth_db_connection()
-    try:
-        rows = collect_admin_feedback(connection, limit=None)
-    finally:
-        connection.close()
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    rows = iter_admin_export_rows(iter_admin_feedback, limit=None)
     return csv_download_response(
-        f"hirescore-feedback-{timestamp}.csv",
+        export_filename("hirescore-feedback", "csv"),
         rows,
         ["id", "user_id", "email", "rating", "comment", "source", "created_at"],
     )
@@ -9316,23 +10311,18 @@ def admin_export_feedback_csv(request: Request) -> StreamingResponse:
 @app.get("/admin/export/credit-transactions.csv")
 def admin_export_credit_transactions_csv(request: Request) -> StreamingResponse:
     require_admin_access(request)
-    connection = auth_db_connection()
-    try:
-        rows = collect_admin_credit_transactions(connection, limit=None)
-    finally:
-        connection.close()
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    rows = iter_admin_export_rows(iter_admin_credit_transactions, limit=None)
     return csv_download_response(
-        f"hirescore-credit-transactions-{timestamp}.csv",
+        export_filename("hirescore-credit-transactions", "csv"),
         rows,
         ["id", "user_id", "email", "action", "delta", "balance_after", "meta", "created_at"],
     )
 
 
-@app.post("/analyze")
-def analyze_resume(data: ResumeRequest, request: Request) -> dict[str, Any]:
+@app.post("/analyze", response_model=None)
+def analyze_resume(data: ResumeRequest, request: Request) -> FastJSONResponse:
     user = require_authenticated_user(request, data.auth_token)
-    require_feedback_completion(int(user["id"]))
+    require_feedback_completion(user)
     debit = debit_credits(
         int(user["id"]),
         "analyze",
@@ -9354,23 +10344,23 @@ def analyze_resume(data: ResumeRequest, request: Request) -> dict[str, Any]:
         )
         analysis["wallet"] = debit["wallet"]
         analysis["credit_transaction_id"] = debit["transaction_id"]
-        analysis["feedback_required"] = feedback_required_for_user(int(user["id"]))
+        analysis["feedback_required"] = debit["feedback_required"]
         report_id = save_analysis_report(
             user_id=int(user["id"]),
             source="manual_input",
             industry=safe_text(data.industry),
             role=safe_text(data.role),
             report_payload=analysis,
+            event=analytics_event_row(
+                "analysis",
+                "analyze_success",
+                user_id=int(user["id"]),
+                meta={"role": safe_text(data.role), "industry": safe_text(data.industry)},
+            ),
         )
         if report_id is not None:
             analysis["report_id"] = report_id
-        log_analytics_event(
-            "analysis",
-            "analyze_success",
-            user_id=int(user["id"]),
-            meta={"role": safe_text(data.role), "industry": safe_text(data.industry)},
-        )
-        return analysis
+        return FastJSONResponse(analysis)
     except HTTPException:
         credit_credits(
             int(user["id"]),
@@ -9389,8 +10379,8 @@ def analyze_resume(data: ResumeRequest, request: Request) -> dict[str, Any]:
         raise HTTPException(status_code=500, detail="Unable to analyze profile right now.") from exc
 
 
-@app.post("/analyze-resume-file")
-async def analyze_resume_file(
+@app.post("/analyze-resume-file", response_model=None)
+def analyze_resume_file(
     request: Request,
     file: UploadFile = File(...),
     industry: str = Form("General"),
@@ -9400,9 +10390,10 @@ async def analyze_resume_file(
     applications_count: int | None = Form(None),
     salary_boost_toggles: str = Form(""),
     auth_token: str | None = Form(None),
-) -> dict[str, Any]:
+) -> FastJSONResponse:
     user = require_authenticated_user(request, auth_token)
-    require_feedback_completion(int(user["id"]))
+    require_feedback_completion(user)
+    ensure_upload_within_limit(file)
     debit = debit_credits(
         int(user["id"]),
         "analyze",
@@ -9411,8 +10402,7 @@ async def analyze_resume_file(
     )
 
     try:
-        contents = await file.read()
-        extracted_text = extract_resume_text_for_analysis(file.filename or "", file.content_type, contents)
+        extracted_text = extract_resume_text_for_analysis(file.filename or "", file.content_type, file.file)
         if not extracted_text:
             raise HTTPException(status_code=400, detail="No readable text found in the uploaded file.")
 
@@ -9430,23 +10420,23 @@ async def analyze_resume_file(
         analysis["wallet"] = debit["wallet"]
         analysis["credit_transaction_id"] = debit["transaction_id"]
         analysis["extracted_chars"] = len(extracted_text)
-        analysis["feedback_required"] = feedback_required_for_user(int(user["id"]))
+        analysis["feedback_required"] = debit["feedback_required"]
         report_id = save_analysis_report(
             user_id=int(user["id"]),
             source="resume_upload",
             industry=safe_text(industry),
             role=safe_text(role),
             report_payload=analysis,
+            event=analytics_event_row(
+                "analysis",
+                "analyze_resume_file_success",
+                user_id=int(user["id"]),
+                meta={"role": safe_text(role), "industry": safe_text(industry)},
+            ),
         )
         if report_id is not None:
             analysis["report_id"] = report_id
-        log_analytics_event(
-            "analysis",
-            "analyze_resume_file_success",
-            user_id=int(user["id"]),
-            meta={"role": safe_text(role), "industry": safe_text(industry)},
-        )
-        return analysis
+        return FastJSONResponse(analysis)
     except HTTPException:
         credit_credits(
             int(user["id"]),
@@ -9465,10 +10455,10 @@ async def analyze_resume_file(
         raise HTTPException(status_code=400, detail="Unable to parse this file. Try a text-based PDF or TXT resume.") from exc
 
 
-@app.post("/suggest")
-def suggest_actions(data: ResumeRequest, request: Request) -> dict[str, Any]:
+@app.post("/suggest", response_model=None)
+def suggest_actions(data: ResumeRequest, request: Request) -> FastJSONResponse:
     user = require_authenticated_user(request, data.auth_token)
-    require_feedback_completion(int(user["id"]))
+    require_feedback_completion(user)
     debit = debit_credits(
         int(user["id"]),
         "analyze",
@@ -9500,11 +10490,11 @@ def suggest_actions(data: ResumeRequest, request: Request) -> dict[str, Any]:
     )
     payload["wallet"] = debit["wallet"]
     payload["credit_transaction_id"] = debit["transaction_id"]
-    return payload
+    return FastJSONResponse(payload)
 
 
-@app.post("/build-resume")
-def build_resume(data: ResumeBuildRequest, request: Request) -> dict[str, Any]:
+@app.post("/build-resume", response_model=None)
+def build_resume(data: ResumeBuildRequest, request: Request) -> FastJSONResponse:
     user = require_authenticated_user(request, data.auth_token)
     debit = debit_credits(
         int(user["id"]),
@@ -9527,17 +10517,16 @@ def build_resume(data: ResumeBuildRequest, request: Request) -> dict[str, Any]:
         if part
     ).lower()
 
-    blueprint_catalog = dedupe_preserve_order(
-        [
-            *critical_skills,
-            *blueprint["core"],
-            *blueprint["adjacent"],
-        ]
+    blueprint_catalog = blueprint_skill_catalog(tuple(critical_skills), tuple(blueprint["core"]), tuple(blueprint["adjacent"]))
+    analysis_input = ", ".join(
+        dedupe_preserve_order(
+            chain(
+                seeded_skills,
+                skill_hits(blueprint_catalog, analysis_source),
+                skill_hits(SPECIFICITY_KEYWORD_LIST, analysis_source),
+            )
+        )
     )
-    blueprint_hits = [skill for skill in blueprint_catalog if re.search(rf"\b{re.escape(skill)}\b", analysis_source)]
-    specificity_hits = [skill for skill in SPECIFICITY_KEYWORDS if re.search(rf"\b{re.escape(skill)}\b", analysis_source)]
-
-    analysis_input = ", ".join(dedupe_preserve_order([*seeded_skills, *blueprint_hits, *specificity_hits]))
     analysis = analyze_profile(data.industry, data.role, analysis_input)
 
     prompt = f"""
@@ -9594,19 +10583,21 @@ Return only the final resume text.
         )
         effective_wallet = refund["wallet"]
 
-    return {
-        "optimized_resume": sanitize_resume_output(content),
-        "wallet": effective_wallet,
-        "credit_transaction_id": debit["transaction_id"],
-        "ai_generated": ai_generated,
-        "ai_warning": "AI service was unavailable for this run. Returned a structured fallback draft."
-        if (not ai_generated and ai_error)
-        else None,
-    }
+    return FastJSONResponse(
+        {
+            "optimized_resume": sanitize_resume_output(content),
+            "wallet": effective_wallet,
+            "credit_transaction_id": debit["transaction_id"],
+            "ai_generated": ai_generated,
+            "ai_warning": "AI service was unavailable for this run. Returned a structured fallback draft."
+            if (not ai_generated and ai_error)
+            else None,
+        }
+    )
 
 
-@app.post("/improvise-resume")
-def improvise_resume(data: ResumeImproviseRequest, request: Request) -> dict[str, Any]:
+@app.post("/improvise-resume", response_model=None)
+def improvise_resume(data: ResumeImproviseRequest, request: Request) -> FastJSONResponse:
     user = require_authenticated_user(request, data.auth_token)
     debit = debit_credits(
         int(user["id"]),
@@ -9628,18 +10619,19 @@ def improvise_resume(data: ResumeImproviseRequest, request: Request) -> dict[str
         payload["ai_warning"] = "AI service was unavailable for this run. Returned a structured fallback draft."
     payload["wallet"] = effective_wallet
     payload["credit_transaction_id"] = debit["transaction_id"]
-    return payload
+    return FastJSONResponse(payload)
 
 
-@app.post("/polish-resume-pdf")
-async def polish_resume_pdf(
+@app.post("/polish-resume-pdf", response_model=None)
+def polish_resume_pdf(
     request: Request,
     file: UploadFile = File(...),
     industry: str = Form("General"),
     role: str = Form("General Role"),
     auth_token: str | None = Form(None),
-) -> dict[str, Any]:
+) -> FastJSONResponse:
     user = require_authenticated_user(request, auth_token)
+    ensure_upload_within_limit(file)
     debit = debit_credits(
         int(user["id"]),
         "ai_resume_generation",
@@ -9648,14 +10640,7 @@ async def polish_resume_pdf(
     )
 
     try:
-        contents = await file.read()
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(contents))
-
-        extracted_pages: list[str] = []
-        for page in pdf_reader.pages:
-            extracted_pages.append(page.extract_text() or "")
-
-        extracted_text = "\n".join(extracted_pages).strip()
+        extracted_text = extract_uploaded_pdf_text(file.file)
         if not extracted_text:
             raise HTTPException(status_code=400, detail="No readable text found in uploaded PDF.")
 
@@ -9678,15 +10663,17 @@ async def polish_resume_pdf(
             )
             effective_wallet = refund["wallet"]
 
-        return {
-            "optimized_resume": safe_text(improved["optimized_resume"]),
-            "wallet": effective_wallet,
-            "credit_transaction_id": debit["transaction_id"],
-            "ai_generated": improved.get("ai_generated", False),
-            "ai_warning": "AI service was unavailable for this run. Returned a structured fallback draft."
-            if (not improved.get("ai_generated") and ai_error)
-            else None,
-        }
+        return FastJSONResponse(
+            {
+                "optimized_resume": safe_text(improved["optimized_resume"]),
+                "wallet": effective_wallet,
+                "credit_transaction_id": debit["transaction_id"],
+                "ai_generated": improved.get("ai_generated", False),
+                "ai_warning": "AI service was unavailable for this run. Returned a structured fallback draft."
+                if (not improved.get("ai_generated") and ai_error)
+                else None,
+            }
+        )
     except HTTPException:
         credit_credits(
             int(user["id"]),
@@ -9706,7 +10693,7 @@ async def polish_resume_pdf(
 
 
 @app.post("/export-resume-pdf")
-def export_resume_pdf(data: ResumeExportRequest, request: Request) -> StreamingResponse:
+def export_resume_pdf(data: ResumeExportRequest, request: Request) -> Response:
     user = require_authenticated_user(request, data.auth_token)
     resume_text = safe_text(data.resume_text)
     if not resume_text:
@@ -9721,7 +10708,7 @@ def export_resume_pdf(data: ResumeExportRequest, request: Request) -> StreamingR
     )
 
     try:
-        pdf_bytes = render_resume_pdf_bytes(data.name or "Candidate", template_name, resume_text)
+        pdf_buffer = run_in_pdf_pool(render_resume_pdf_buffer, data.name or "Candidate", template_name, resume_text)
     except Exception as exc:
         credit_credits(
             int(user["id"]),
@@ -9732,8 +10719,8 @@ def export_resume_pdf(data: ResumeExportRequest, request: Request) -> StreamingR
         raise HTTPException(status_code=500, detail="Unable to generate PDF right now.") from exc
 
     safe_name = sanitize_download_name(data.name)
-    headers = {
-        "Content-Disposition": f'attachment; filename="{safe_name}-{template_name}.pdf"',
-        "X-HireScore-Credits-Remaining": str(debit["wallet"]["credits"]),
-    }
-    return StreamingResponse(io.BytesIO(pdf_bytes), media_type="application/pdf", headers=headers)
+    return pdf_download_response(
+        pdf_buffer,
+        f"{safe_name}-{template_name}.pdf",
+        {"X-HireScore-Credits-Remaining": str(debit["wallet"]["credits"])},
+    )